@@ -1,25 +1,26 @@
+import argparse
 import pandas as pd
 import chardet
 import numpy as np
-import requests
 import dotenv
 import os
 
+# .env ayarları yerel modüller ortam değişkenlerini okumadan önce yüklenir
 dotenv.load_dotenv()
-result = ""
-with open("datas.csv", "rb") as f:
-    result = chardet.detect(f.read(100000))
 
-df = pd.read_csv(
-    "datas.csv", low_memory=False, encoding=result["encoding"], on_bad_lines="skip"
-)
+from ip_enrichment import getIpEnricher  # noqa: E402
+from ip_geolocation import getIpCountryIndex  # noqa: E402
+from spam_scoring import spamScores  # noqa: E402
 
-df = df.shift(periods=1, axis=1)
-df.iloc[:, 0] = range(1, len(df) + 1)
-df = df.loc[:, ~df.columns.str.contains("Guid", case=True)]
-df = df.apply(lambda x: x.where(x.notna(), None))
-df["IsEnabled"] = df["IsDeleted"].apply(lambda x: 1 if x == 0 else 0)
-df["IsDeleted"] = df["IsEnabled"].apply(lambda x: 1 if x == 0 else 0)
+INPUT_CSV = "datas.csv"
+OUTPUT_CSV = "DMARC.csv"
+OUTPUT_PARQUET = "DMARC.parquet"
+# 0 ise dosya tek seferde belleğe okunur; aksi halde bu kadar satırlık
+# parçalar halinde işlenir ve her parça Parquet'e bir row group olarak eklenir
+CHUNK_ROWS = int(os.getenv("DMARC_CHUNK_ROWS", 0))
+# DMARC_IP_COUNTRY_DB tanımlıysa ülkeler yerel tablodan bulunur; ipinfo.io
+# yalnızca bu ayar açıksa ve tabloda olmayan IP'ler için sorgulanır
+IP_COUNTRY_FALLBACK = os.getenv("DMARC_IP_COUNTRY_FALLBACK", "0") != "0"
 
 columns_to_drop = [
     "CreatedBy",
@@ -33,36 +34,21 @@ columns_to_drop = [
     "EnvelopeTo",
     "PolicyPublishedSp",
 ]
-df = df.drop(columns=columns_to_drop, errors="ignore")
-df = df.dropna(axis=1, how="all")
-
-df["Id"] = pd.to_numeric(df["Id"], errors="coerce").astype("Int64")
-df["PolicyDispositionValue"] = pd.to_numeric(
-    df["PolicyDispositionValue"], errors="coerce"
-).astype("Int64")
-df["Volume"] = pd.to_numeric(df["Volume"], errors="coerce").astype("Int64")
-df["SPFAuthentication"] = pd.to_numeric(
-    df["SPFAuthentication"], errors="coerce"
-).astype("Int64")
-df["SPFAlignment"] = pd.to_numeric(df["SPFAlignment"], errors="coerce").astype("Int64")
-df["DKIMAuthentication"] = pd.to_numeric(
-    df["DKIMAuthentication"], errors="coerce"
-).astype("Int64")
-df["DKIMAlignment"] = pd.to_numeric(df["DKIMAlignment"], errors="coerce").astype(
-    "Int64"
-)
-df["IsEnabled"] = pd.to_numeric(df["IsEnabled"], errors="coerce").astype("Int64")
-df["IsDeleted"] = pd.to_numeric(df["IsDeleted"], errors="coerce").astype("Int64")
-
-df["DateRangeBegin"] = pd.to_datetime(df["DateRangeBegin"], errors="coerce")
-df["DateRangeEnd"] = pd.to_datetime(df["DateRangeEnd"], errors="coerce")
-
-df["HeuristicResultType"] = pd.to_numeric(
-    df["HeuristicResultType"], errors="coerce"
-).astype("Int64")
-df["DMARCValidation"] = pd.to_numeric(df["DMARCValidation"], errors="coerce").astype(
-    "Int64"
-)
+int_columns = [
+    "Id",
+    "PolicyDispositionValue",
+    "Volume",
+    "SPFAuthentication",
+    "SPFAlignment",
+    "DKIMAuthentication",
+    "DKIMAlignment",
+    "IsEnabled",
+    "IsDeleted",
+    "HeuristicResultType",
+    "DMARCValidation",
+]
+
+date_columns = ["DateRangeBegin", "DateRangeEnd"]
 
 string_columns = [
     "OrgName",
@@ -79,81 +65,233 @@ string_columns = [
     "HeuristicComment",
 ]
 
-for col in string_columns:
-    if col in df.columns:
-        df[col] = df[col].astype("string")
 
-isNullCollumNumber = df.isnull().sum()
-isNaCollumNumber = df.isna().sum()
-print(isNaCollumNumber)
-print(isNullCollumNumber)
-df = df.dropna(axis=0, how="any")
+def detectEncoding(path: str) -> str:
+    with open(path, "rb") as f:
+        return chardet.detect(f.read(100000))["encoding"]
 
-print(df.dtypes)
 
-SPAM_THRESHOLD = 0.6
+def shiftFrame(df: pd.DataFrame, first_id: int = 1) -> pd.DataFrame:
+    # Dışa aktarımda değerler başlıklara göre bir sütun kaymış durumda
+    df = df.shift(periods=1, axis=1)
+    df.isetitem(0, np.arange(first_id, first_id + len(df)))
+    return df
 
 
-def spamScore(row: pd) -> int:
-    spamS = 0
+def numericColumn(values: pd.Series) -> pd.Series:
+    """``pd.to_numeric`` that also reads "True"/"False" text as 1/0.
 
-    if row["DMARCValidation"] == 0:
-        spamS += 0.2
-    if row["SPFAuthentication"] == 0:
-        spamS += 0.2
-    if row["SPFAlignment"] == 0:
-        spamS += 0.2
-    if row["DKIMAuthentication"] == 0:
-        spamS += 0.2
-    if row["DKIMAlignment"] == 0:
-        spamS += 0.2
-    if row["HeuristicResultTypeText"] in ["HalfCompliant", "NonCompliant"]:
-        spamS += 0.2
+    With ``dtype=str`` (streaming, ingest) booleans stay text, while the
+    in-memory read infers them; both must give the same numbers.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_numeric(values, errors="coerce")
+    text = values.astype(str).str.strip().str.lower()
+    text = text.mask(text == "true", "1").mask(text == "false", "0")
+    return pd.to_numeric(text, errors="coerce")
 
-    return 1 if spamS > SPAM_THRESHOLD else 0
 
+def cleanFrame(df: pd.DataFrame, empty_columns=None) -> pd.DataFrame:
+    """Apply the cleaning steps to an already shifted frame.
 
-ip_cache = {}
+    ``empty_columns`` are the columns without a single value in the whole
+    file; when None they are computed from ``df`` itself.
+    """
+    df = df.loc[:, ~df.columns.str.contains("Guid", case=True)]
+    df = df.apply(lambda x: x.where(x.notna(), None))
+    is_deleted = numericColumn(df["IsDeleted"])
+    df["IsEnabled"] = np.where(is_deleted == 0, 1, 0)
+    df["IsDeleted"] = np.where(df["IsEnabled"] == 0, 1, 0)
 
+    df = df.drop(columns=columns_to_drop, errors="ignore")
+    if empty_columns is None:
+        df = df.dropna(axis=1, how="all")
+    else:
+        df = df.drop(columns=list(empty_columns), errors="ignore")
 
-def getCountryFromIP(ip_address: str) -> str:
+    for col in int_columns:
+        df[col] = numericColumn(df[col]).astype("Int64")
 
-    if ip_address in ip_cache:
-        print(f"Cache hit: {ip_address} -> {ip_cache[ip_address]}")
-        return ip_cache[ip_address]
+    for col in date_columns:
+        df[col] = pd.to_datetime(df[col], errors="coerce")
 
-    try:
-        print(f"Fetching country for IP: {ip_address}")
-        headers = {"Accept-Encoding": "identity"}
-        response = requests.get(
-            f"http://ipinfo.io/{ip_address}?{os.getenv("token")}",
-            timeout=5,
-            headers=headers,
+    for col in string_columns:
+        if col in df.columns:
+            df[col] = df[col].astype("string")
+
+    return df
+
+
+def enrichFrame(df: pd.DataFrame) -> pd.DataFrame:
+    ip_index = getIpCountryIndex()
+    if ip_index is not None:
+        fallback = getIpEnricher().countries if IP_COUNTRY_FALLBACK else None
+        df["IpLoc"] = ip_index.lookup(df["SourceIP"], fallback=fallback)
+    else:
+        df["IpLoc"] = getIpEnricher().lookup(df["SourceIP"])
+    df["IsSpam"] = spamScores(df)
+    return df
+
+
+def runInMemory(path: str):
+    if path.endswith(".parquet"):
+        # ingest.py çıktısı zaten temizlenmiş ve türlendirilmiştir
+        df = pd.read_parquet(path, engine="pyarrow").dropna(axis=1, how="all")
+    else:
+        df = pd.read_csv(
+            path, low_memory=False, encoding=detectEncoding(path), on_bad_lines="skip"
         )
+        df = cleanFrame(shiftFrame(df))
+
+    isNullCollumNumber = df.isnull().sum()
+    isNaCollumNumber = df.isna().sum()
+    print(isNaCollumNumber)
+    print(isNullCollumNumber)
+    df = df.dropna(axis=0, how="any")
+
+    print(df.dtypes)
+
+    df = enrichFrame(df)
+
+    print(df["IsSpam"].value_counts())
+    print(df.head())
+
+    df.to_csv(OUTPUT_CSV, index=False)
+    df.to_parquet(OUTPUT_PARQUET, engine="pyarrow", index=False)
+
+
+def readChunks(path: str, encoding: str, chunk_rows: int):
+    # Tüm sütunlar metin okunur: parça başına tür tahmini farklı çıkıp
+    # row group şemaları ayrışmasın; sayısal/tarih sütunları cleanFrame'de çevrilir
+    return pd.read_csv(
+        path,
+        encoding=encoding,
+        on_bad_lines="skip",
+        dtype=str,
+        chunksize=chunk_rows,
+    )
 
-        if response.status_code == 200:
-            data = response.json()
-            country = data.get("country", "Unknown")
 
-            ip_cache[ip_address] = country
-            print(f"API Response: {ip_address} -> {country}")
-            return country
-        else:
-            print(
-                f"Failed to fetch data for {ip_address}, Status: {response.status_code}"
+def emptyColumns(path: str, encoding: str, chunk_rows: int) -> set:
+    """First pass: columns without a single value anywhere in the file.
+
+    ``dropna(axis=1, how="all")`` needs the whole file; deciding it per
+    chunk would give every row group a different set of columns.
+    """
+    seen = None
+    for chunk in readChunks(path, encoding, chunk_rows):
+        has_value = shiftFrame(chunk).notna().any()
+        seen = has_value if seen is None else seen | has_value
+    return set() if seen is None else set(seen[~seen].index)
+
+
+def parquetEmptyColumns(parquet) -> set:
+    """Columns that hold only nulls, read from the row group statistics."""
+    metadata = parquet.metadata
+    empty = set()
+    for index, name in enumerate(parquet.schema_arrow.names):
+        nulls = 0
+        for group in range(metadata.num_row_groups):
+            statistics = metadata.row_group(group).column(index).statistics
+            if statistics is None or not statistics.has_null_count:
+                nulls = None
+                break
+            nulls += statistics.null_count
+        if nulls is None:
+            # İstatistik yoksa yalnızca bu sütun okunur
+            nulls = parquet.read(columns=[name]).column(0).null_count
+        if nulls == metadata.num_rows:
+            empty.add(name)
+    return empty
+
+
+def cleanedChunks(path: str, chunk_rows: int):
+    """Yield ``(rows_read, cleaned_frame)`` with the file-wide empty columns dropped."""
+    if path.endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        empty_columns = parquetEmptyColumns(parquet)
+        types = {pa.int64(): pd.Int64Dtype(), pa.string(): pd.StringDtype()}
+        for batch in parquet.iter_batches(batch_size=chunk_rows):
+            df = batch.to_pandas(types_mapper=types.get)
+            yield len(df), df.drop(columns=list(empty_columns))
+        return
+
+    encoding = detectEncoding(path)
+    empty_columns = emptyColumns(path, encoding, chunk_rows)
+    next_id = 1
+    for chunk in readChunks(path, encoding, chunk_rows):
+        yield len(chunk), cleanFrame(shiftFrame(chunk, next_id), empty_columns)
+        next_id += len(chunk)
+
+
+def runStreaming(path: str, chunk_rows: int):
+    """Clean ``path`` chunk by chunk; memory use is bounded by ``chunk_rows``.
+
+    ``path`` is the raw CSV or the Parquet file written by ingest.py.
+    Produces the same rows as the in-memory run. Columns that are not
+    converted explicitly are written as strings.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    null_counts = None
+    spam_counts = None
+    writer = None
+    schema = None
+    rows_read = 0
+    rows = 0
+    try:
+        for chunk_rows_read, df in cleanedChunks(path, chunk_rows):
+            rows_read += chunk_rows_read
+
+            counts = df.isna().sum()
+            null_counts = counts if null_counts is None else null_counts + counts
+            df = df.dropna(axis=0, how="any")
+            if df.empty:
+                continue
+
+            df = enrichFrame(df)
+            counts = df["IsSpam"].value_counts()
+            spam_counts = (
+                counts if spam_counts is None else spam_counts.add(counts, fill_value=0)
             )
-            return "Unknown"
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching IP info for {ip_address}: {e}")
-        return "Error"
+            table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pq.ParquetWriter(OUTPUT_PARQUET, schema)
+            # Her parça ayrı bir row group olarak eklenir
+            writer.write_table(table)
+            df.to_csv(
+                OUTPUT_CSV, mode="w" if rows == 0 else "a", header=rows == 0, index=False
+            )
+            rows += len(df)
+    finally:
+        if writer is not None:
+            writer.close()
 
+    print(null_counts)
+    print(spam_counts)
+    if writer is None:
+        print("Temizlik sonrası satır kalmadı, çıktı yazılmadı")
+    print(f"{rows_read} satır okundu, {rows} satır yazıldı")
 
-df["IpLoc"] = df["SourceIP"].apply(lambda ip: getCountryFromIP(ip))
-df["IsSpam"] = df.apply(spamScore, axis=1)
 
-print(df["IsSpam"].value_counts())
-print(df.head())
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("input", nargs="?", default=INPUT_CSV)
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=CHUNK_ROWS,
+        help="parça başına satır sayısı; 0 tüm dosyayı belleğe okur",
+    )
+    args = parser.parse_args()
 
-df.to_csv("DMARC.csv", index=False)
-df.to_parquet("DMARC.parquet", engine="pyarrow", index=False)
+    if args.chunk_rows > 0:
+        runStreaming(args.input, args.chunk_rows)
+    else:
+        runInMemory(args.input)
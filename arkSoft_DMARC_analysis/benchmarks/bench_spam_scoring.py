@@ -0,0 +1,83 @@
+"""Row-wise df.apply(spamScore, axis=1) vs. the column-wise spamScores.
+
+Only timings are reported; tests/test_spam_scoring.py checks that the
+results are equal.
+
+Usage: python benchmarks/bench_spam_scoring.py [--rows N] [--seed N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from spam_scoring import SPAM_SIGNALS, spamScore, spamScores  # noqa: E402
+
+HEURISTIC_TEXTS = ("Compliant", "HalfCompliant", "NonCompliant")
+
+
+def legacySpamScore(row) -> int:
+    # DMARC_fixing.py'deki eski satır satır puanlama, olduğu gibi
+    spamS = 0
+
+    if row["DMARCValidation"] == 0:
+        spamS += 0.2
+    if row["SPFAuthentication"] == 0:
+        spamS += 0.2
+    if row["SPFAlignment"] == 0:
+        spamS += 0.2
+    if row["DKIMAuthentication"] == 0:
+        spamS += 0.2
+    if row["DKIMAlignment"] == 0:
+        spamS += 0.2
+    if row["HeuristicResultTypeText"] in ["HalfCompliant", "NonCompliant"]:
+        spamS += 0.2
+
+    return 1 if spamS > 0.6 else 0
+
+
+def synthetic_frame(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            column: pd.array(rng.integers(0, 2, rows), dtype="Int64")
+            for column, _ in SPAM_SIGNALS[:-1]
+        }
+    )
+    df["HeuristicResultTypeText"] = pd.array(
+        rng.choice(HEURISTIC_TEXTS, rows), dtype="string"
+    )
+    return df
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows, args.seed)
+
+    _, legacy_time = timed(lambda: df.apply(legacySpamScore, axis=1))
+    _, row_time = timed(lambda: df.apply(spamScore, axis=1))
+    vectorized, vector_time = timed(lambda: spamScores(df))
+
+    print(f"rows: {len(df)}  spam: {int(vectorized.sum())}")
+    print(f"legacy apply:   {legacy_time:8.3f}s")
+    print(f"spamScore apply: {row_time:7.3f}s")
+    print(f"spamScores:     {vector_time:8.3f}s  ({legacy_time / vector_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Local stand-in for the ipinfo.io API, for exercising ip_enrichment offline.
+
+Answers ``GET /<ip>`` with a country derived from the address, a bogon
+response for private addresses, and a 503 for every Nth request. ``GET
+/stats`` returns the number of requests per IP.
+
+Usage: python benchmarks/ipinfo_stand_in.py [--port 8765] [--latency 0.05]
+           [--fail-every 10]
+Then: DMARC_IPINFO_URL=http://127.0.0.1:8765 python DMARC_fixing.py
+"""
+
+import argparse
+import ipaddress
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COUNTRIES = ("TR", "US", "DE", "NL", "FR", "GB", "RU", "CN")
+
+
+def country_for(ip: str):
+    address = ipaddress.ip_address(ip)
+    if address.is_private or address.is_loopback or address.is_reserved:
+        return None
+    return COUNTRIES[zlib.crc32(address.packed) % len(COUNTRIES)]
+
+
+def make_handler(latency: float, fail_every: int):
+    lock = threading.Lock()
+    requests_per_ip = {}
+    total = [0]
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Başlık ve gövde ayrı yazılır; Nagle gecikmesi ölçümü bozmasın
+        disable_nagle_algorithm = True
+
+        def _reply(self, status: int, body: dict):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            path = self.path.partition("?")[0].strip("/")
+            if path == "stats":
+                with lock:
+                    self._reply(200, {"total": total[0], "per_ip": dict(requests_per_ip)})
+                return
+
+            with lock:
+                total[0] += 1
+                requests_per_ip[path] = requests_per_ip.get(path, 0) + 1
+                failing = fail_every and total[0] % fail_every == 0
+            time.sleep(latency)
+            if failing:
+                self._reply(503, {"error": "unavailable"})
+                return
+            try:
+                country = country_for(path)
+            except ValueError:
+                self._reply(404, {"error": "Wrong ip"})
+                return
+            if country is None:
+                self._reply(200, {"ip": path, "bogon": True})
+            else:
+                self._reply(200, {"ip": path, "country": country})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(port: int = 0, latency: float = 0.0, fail_every: int = 0) -> ThreadingHTTPServer:
+    """Start the stand-in on a daemon thread; ``server.server_port`` is the bound port."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(latency, fail_every))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--fail-every", type=int, default=0)
+    args = parser.parse_args()
+
+    server = serve(args.port, args.latency, args.fail_every)
+    print(f"ipinfo stand-in: http://127.0.0.1:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Turn a raw DMARC export (UTF-16 or any other encoding) into typed Parquet.
+
+Replaces running cleaning.py before DMARC_fixing.py. The file is decoded,
+rows with the wrong number of columns are rejected, values are stripped
+and the same cleaning and type conversions as DMARC_fixing.py are applied,
+in one streaming pass. Each block becomes one Parquet row group.
+Rejected rows go to a side CSV file.
+
+Usage: python ingest.py [datas.csv] [-o datas.parquet] [--rejected datas.rejected.csv]
+Then:  python DMARC_fixing.py datas.parquet --chunk-rows 200000
+"""
+
+import argparse
+import codecs
+import csv
+import io
+import os
+from collections import Counter
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from DMARC_fixing import INPUT_CSV, cleanFrame, detectEncoding, shiftFrame
+
+INGEST_OUTPUT = os.getenv("DMARC_INGEST_OUTPUT", "datas.parquet")
+# Bir seferde çözülüp dönüştürülen CSV bloğu; bellek kullanımını bu belirler
+BLOCK_BYTES = int(os.getenv("DMARC_INGEST_BLOCK_BYTES", 16 * 1024 * 1024))
+
+# pandas.read_csv gibi, kırpıldıktan sonra bu değerler boş sayılır
+NULL_VALUES = pa.array(pacsv.ConvertOptions().null_values, pa.string())
+
+
+class TranscodingReader(io.RawIOBase):
+    """Byte stream that decodes ``raw`` with ``errors="replace"`` and yields UTF-8.
+
+    pyarrow's own transcoding is strict; cleaning.py replaced undecodable
+    bytes instead of failing, and so does this.
+    """
+
+    def __init__(self, raw, encoding: str, read_bytes: int = 1024 * 1024):
+        self._raw = raw
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._read_bytes = read_bytes
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            data = self._raw.read(self._read_bytes)
+            self._pending = memoryview(self._decoder.decode(data, final=not data).encode("utf-8"))
+            if not data:
+                break
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self):
+        self._raw.close()
+        super().close()
+
+
+class RejectedRows:
+    """Collects rows with the wrong column count into a side CSV file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.counts = Counter()
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(["line", "expected_columns", "actual_columns", "text"])
+
+    def __call__(self, row) -> str:
+        self.counts[row.actual_columns] += 1
+        self._writer.writerow([row.number, row.expected_columns, row.actual_columns, row.text])
+        return "skip"
+
+    def close(self):
+        self._file.close()
+
+
+def readHeader(path: str, encoding: str) -> list:
+    with open(path, encoding=encoding, errors="replace", newline="") as f:
+        return next(csv.reader(f))
+
+
+def stripBatch(batch: pa.RecordBatch) -> pa.Table:
+    columns = []
+    for column in batch.columns:
+        column = pc.utf8_trim_whitespace(column)
+        columns.append(pc.if_else(pc.is_in(column, value_set=NULL_VALUES), None, column))
+    return pa.Table.from_arrays(columns, names=batch.schema.names)
+
+
+def fixedSchema(schema: pa.Schema) -> pa.Schema:
+    # İlk blokta tamamen boş bir sütun null türünde çıkabilir; tüm row
+    # group'lar aynı şemayı kullansın diye türler sabitlenir
+    fields = [
+        field.with_type(pa.string())
+        if pa.types.is_null(field.type) or pa.types.is_large_string(field.type)
+        else field
+        for field in schema
+    ]
+    # pandas meta verisi korunur; okuyunca Int64/string türleri geri gelir
+    return pa.schema(fields, metadata=schema.metadata)
+
+
+def ingest(path: str, output: str, rejected_path: str, encoding: str = None, block_bytes: int = BLOCK_BYTES) -> dict:
+    encoding = codecs.lookup(encoding or detectEncoding(path)).name
+    header = readHeader(path, encoding)
+    if encoding in ("utf-8", "ascii"):
+        source = path
+    else:
+        source = TranscodingReader(open(path, "rb"), encoding)
+
+    rejected = RejectedRows(rejected_path)
+    reader = pacsv.open_csv(
+        source,
+        read_options=pacsv.ReadOptions(block_size=block_bytes, use_threads=False),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True, invalid_row_handler=rejected),
+        convert_options=pacsv.ConvertOptions(
+            column_types={name: pa.string() for name in header},
+            strings_can_be_null=False,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+
+    writer = None
+    schema = None
+    next_id = 1
+    try:
+        for batch in reader:
+            if batch.num_rows == 0:
+                continue
+            df = stripBatch(batch).to_pandas()
+            # Boş sütunlar burada atılmaz; DMARC_fixing.py dosyanın
+            # tamamına göre Parquet istatistiklerinden karar verir
+            df = cleanFrame(shiftFrame(df, next_id), empty_columns=())
+            next_id += len(df)
+
+            if writer is None:
+                schema = fixedSchema(pa.Schema.from_pandas(df, preserve_index=False))
+                writer = pq.ParquetWriter(output, schema)
+            writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+    finally:
+        reader.close()
+        rejected.close()
+        if writer is not None:
+            writer.close()
+
+    return {
+        "encoding": encoding,
+        "rows": next_id - 1,
+        "rejected": sum(rejected.counts.values()),
+        "rejected_by_columns": dict(rejected.counts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", nargs="?", default=INPUT_CSV)
+    parser.add_argument("-o", "--output", default=INGEST_OUTPUT)
+    parser.add_argument("--rejected", help="reddedilen satırlar; varsayılan <çıktı>.rejected.csv")
+    parser.add_argument("--encoding", help="varsayılan: chardet ile tespit")
+    parser.add_argument("--block-bytes", type=int, default=BLOCK_BYTES)
+    args = parser.parse_args()
+
+    rejected_path = args.rejected or os.path.splitext(args.output)[0] + ".rejected.csv"
+    summary = ingest(args.input, args.output, rejected_path, args.encoding, args.block_bytes)
+    print(summary)
+    if summary["rejected"]:
+        print(f"Reddedilen satırlar: {rejected_path}")
+
+
+if __name__ == "__main__":
+    main()
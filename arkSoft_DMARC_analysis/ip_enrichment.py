@@ -0,0 +1,230 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+IPINFO_URL = os.getenv("DMARC_IPINFO_URL", "http://ipinfo.io")
+IPINFO_TOKEN = os.getenv("token", "")
+CACHE_PATH = os.getenv("DMARC_IP_CACHE", "ip_cache.sqlite3")
+# Ülkesi olmayan IP'ler de saklanır, daha kısa süreliğine; geçici hatalar saklanmaz
+POSITIVE_TTL = float(os.getenv("DMARC_IP_CACHE_TTL", 30 * 24 * 3600))
+NEGATIVE_TTL = float(os.getenv("DMARC_IP_NEGATIVE_TTL", 24 * 3600))
+MAX_WORKERS = int(os.getenv("DMARC_IPINFO_WORKERS", 8))
+# Saniyedeki en fazla istek; 0 sınırsız
+RATE_LIMIT = float(os.getenv("DMARC_IPINFO_RATE", 10))
+RETRIES = int(os.getenv("DMARC_IPINFO_RETRIES", 3))
+BACKOFF = float(os.getenv("DMARC_IPINFO_BACKOFF", 0.5))
+TIMEOUT = float(os.getenv("DMARC_IPINFO_TIMEOUT", 5))
+
+UNKNOWN_COUNTRY = "Unknown"
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Bağlantı hatası ya da tekrarlardan sonra da süren 5xx; sonraki çalıştırma yeniden sorar
+_FAILED = object()
+# SQLite'ın tek sorgudaki değişken sınırının altında kalınır
+_QUERY_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ips (
+    ip TEXT PRIMARY KEY,
+    country TEXT,
+    expires_at REAL
+)
+"""
+
+
+class IpCache:
+    """SQLite cache of IP → country results that survives between runs.
+
+    A NULL country is a definitive "no country" answer and expires after
+    the negative TTL.
+    Each thread opens its own connection; WAL mode lets parallel runs read
+    while one writes.
+    """
+
+    def __init__(self, path: str = CACHE_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def getMany(self, ips) -> dict:
+        """``{ip: country}`` for unexpired rows; a stored "no country" maps to None."""
+        ips = list(ips)
+        found = {}
+        now = time.time()
+        for start in range(0, len(ips), _QUERY_BATCH):
+            batch = ips[start : start + _QUERY_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = (
+                self._connect()
+                .execute(
+                    f"SELECT ip, country FROM ips WHERE ip IN ({placeholders}) AND expires_at > ?",
+                    (*batch, now),
+                )
+                .fetchall()
+            )
+            found.update(rows)
+        return found
+
+    def putMany(self, results: dict, ttl: float = POSITIVE_TTL, negative_ttl: float = NEGATIVE_TTL):
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ips (ip, country, expires_at) VALUES (?, ?, ?)",
+                [
+                    (ip, country, now + (ttl if country is not None else negative_ttl))
+                    for ip, country in results.items()
+                ],
+            )
+
+    def purgeExpired(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM ips WHERE expires_at <= ?", (time.time(),)).rowcount
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart across all threads."""
+
+    def __init__(self, rate: float = RATE_LIMIT):
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class IpEnricher:
+    """Resolves the countries of unique IPs through ipinfo, cache first.
+
+    Misses are fetched concurrently on a pooled keep-alive session, under
+    one shared rate limit, with exponential backoff on connection errors,
+    429 and 5xx responses. Definitive answers (a country, a 200 without one,
+    a 4xx) are written to the cache so the next run does not ask again;
+    transient failures are not, so a network blip does not mark IPs as
+    Unknown until the negative TTL passes. ``base_url`` can point at a local
+    stand-in server.
+    """
+
+    def __init__(
+        self,
+        base_url: str = IPINFO_URL,
+        token: str = IPINFO_TOKEN,
+        cache: IpCache = None,
+        max_workers: int = MAX_WORKERS,
+        rate: float = RATE_LIMIT,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+        timeout: float = TIMEOUT,
+        session=None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.cache = cache
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.limiter = RateLimiter(rate)
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        session.headers["Accept-Encoding"] = "identity"
+        self.session = session
+
+    def _retryDelay(self, attempt: int, response=None) -> float:
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.isdigit():
+            # Sunucu ne isterse istesin en uzun geri çekilme süresi aşılmaz
+            return min(float(retry_after), self.backoff * 2**self.retries)
+        return self.backoff * 2**attempt
+
+    def fetchCountry(self, ip: str):
+        """Country code for ``ip``, or None when ipinfo has none or keeps failing."""
+        country = self._fetch(ip)
+        return None if country is _FAILED else country
+
+    def _fetch(self, ip: str):
+        url = f"{self.base_url}/{ip}"
+        params = None
+        if "=" in self.token:
+            # Eski .env biçimi: token değişkeni sorgu dizesinin tamamıdır
+            url = f"{url}?{self.token}"
+        elif self.token:
+            params = {"token": self.token}
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            response = None
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code == 200:
+                    # Özel ağ (bogon) adreslerinde ülke alanı yoktur
+                    return response.json().get("country") or None
+                if response.status_code not in _RETRY_STATUSES:
+                    print(f"Failed to fetch data for {ip}, Status: {response.status_code}")
+                    # 4xx kesin yanıttır (ör. geçersiz IP), diğerleri geçici
+                    return None if 400 <= response.status_code < 500 else _FAILED
+            except Exception as e:
+                print(f"Error fetching IP info for {ip}: {e}")
+            if attempt < self.retries:
+                time.sleep(self._retryDelay(attempt, response))
+        return _FAILED
+
+    def countries(self, ips) -> dict:
+        """``{ip: country or None}`` for the distinct, non-empty values of ``ips``."""
+        ips = list(dict.fromkeys(ip for ip in ips if isinstance(ip, str) and ip))
+        results = self.cache.getMany(ips) if self.cache is not None else {}
+        missing = [ip for ip in ips if ip not in results]
+        if not missing:
+            return results
+
+        print(f"{len(results)} IP önbellekten geldi, {len(missing)} IP sorgulanıyor")
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ipinfo") as pool:
+            fetched = dict(zip(missing, pool.map(self._fetch, missing)))
+        answered = {ip: country for ip, country in fetched.items() if country is not _FAILED}
+        if len(answered) < len(fetched):
+            print(f"{len(fetched) - len(answered)} IP geçici hata nedeniyle önbelleğe yazılmadı")
+        if self.cache is not None:
+            self.cache.putMany(answered)
+        results.update((ip, None if country is _FAILED else country) for ip, country in fetched.items())
+        return results
+
+    def lookup(self, ips: pd.Series) -> pd.Series:
+        """Country code per row of ``ips``; each distinct IP is resolved once."""
+        countries = self.countries(ips.dropna().unique())
+        return ips.map(countries).fillna(UNKNOWN_COUNTRY).astype(object)
+
+
+_enricher = None
+
+
+def getIpEnricher() -> IpEnricher:
+    global _enricher
+    if _enricher is None:
+        _enricher = IpEnricher(cache=IpCache() if CACHE_PATH else None)
+    return _enricher
@@ -0,0 +1,184 @@
+import ipaddress
+import os
+
+import numpy as np
+import pandas as pd
+
+# start_ip,end_ip,country sütunlu CSV (ör. ipinfo country CSV) ya da .mmdb
+IP_COUNTRY_DB = os.getenv("DMARC_IP_COUNTRY_DB", "")
+UNKNOWN_COUNTRY = "Unknown"
+
+_MISS = -1
+# .mmdb dosyalarında IPv4 uzayını yeniden gösteren IPv6 önekleri
+_IPV4_ALIASES = (ipaddress.ip_network("::ffff:0:0/96"), ipaddress.ip_network("2002::/16"))
+
+
+def _parseAddress(value):
+    """IPv4, or IPv6 with IPv4-mapped addresses folded back to IPv4; None if invalid."""
+    try:
+        address = ipaddress.ip_address(str(value).strip())
+    except ValueError:
+        return None
+    if address.version == 6 and address.ipv4_mapped is not None:
+        return address.ipv4_mapped
+    return address
+
+
+def _search(starts: np.ndarray, ends: np.ndarray, codes: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    if len(starts) == 0:
+        return np.full(len(keys), _MISS, dtype=np.int32)
+    position = np.searchsorted(starts, keys, side="right") - 1
+    hit = position >= 0
+    hit[hit] = keys[hit] <= ends[position[hit]]
+    return np.where(hit, codes[np.maximum(position, 0)], _MISS)
+
+
+class IpCountryIndex:
+    """IP range → country table held in sorted arrays.
+
+    IPv4 bounds are ``uint32``; IPv6 bounds are big-endian ``S16`` bytes,
+    whose byte order is the numeric order, so both families are resolved
+    with ``np.searchsorted``. Ranges must not overlap.
+    """
+
+    def __init__(self, ranges):
+        countries = {}
+        families = {4: ([], [], []), 6: ([], [], [])}
+        for first, last, country in ranges:
+            if first.version != last.version:
+                raise ValueError(f"IP aralığı iki aileyi karıştırıyor: {first} - {last}")
+            starts, ends, codes = families[first.version]
+            starts.append(first.packed if first.version == 6 else int(first))
+            ends.append(last.packed if last.version == 6 else int(last))
+            codes.append(countries.setdefault(country, len(countries)))
+
+        self.countries = np.array(list(countries), dtype=object)
+        self._v4 = self._sorted(*families[4], dtype=np.uint32)
+        self._v6 = self._sorted(*families[6], dtype="S16")
+
+    @staticmethod
+    def _sorted(starts, ends, codes, dtype) -> tuple:
+        starts = np.array(starts, dtype=dtype)
+        ends = np.array(ends, dtype=dtype)
+        codes = np.array(codes, dtype=np.int32)
+        order = np.argsort(starts, kind="stable")
+        starts, ends, codes = starts[order], ends[order], codes[order]
+        if len(starts) > 1 and np.any(starts[1:] <= ends[:-1]):
+            raise ValueError("IP aralıkları çakışıyor")
+        return starts, ends, codes
+
+    def __len__(self) -> int:
+        return len(self._v4[0]) + len(self._v6[0])
+
+    def _resolveUnique(self, values) -> np.ndarray:
+        """Country code index per value, ``_MISS`` for unknown or invalid addresses."""
+        codes = np.full(len(values), _MISS, dtype=np.int32)
+        v4_rows, v4_keys, v6_rows, v6_keys = [], [], [], []
+        for row, value in enumerate(values):
+            address = _parseAddress(value)
+            if address is None:
+                continue
+            if address.version == 4:
+                v4_rows.append(row)
+                v4_keys.append(int(address))
+            else:
+                v6_rows.append(row)
+                v6_keys.append(address.packed)
+
+        if v4_rows:
+            codes[v4_rows] = _search(*self._v4, np.array(v4_keys, dtype=np.uint32))
+        if v6_rows:
+            codes[v6_rows] = _search(*self._v6, np.array(v6_keys, dtype="S16"))
+        return codes
+
+    def lookup(self, ips: pd.Series, fallback=None) -> pd.Series:
+        """Country code for every address in ``ips``.
+
+        Every distinct address is parsed once and all of them are resolved
+        in one ``searchsorted`` pass per family. The distinct misses are
+        passed to ``fallback`` in one call (such as ``IpEnricher.countries``,
+        returning ``{ip: country}``); what it cannot resolve, or every miss
+        without one, becomes ``UNKNOWN_COUNTRY``.
+        """
+        row_codes, uniques = pd.factorize(ips, use_na_sentinel=True)
+        codes = self._resolveUnique(uniques)
+        # Son eleman eksik IP'ler (NaN) içindir; factorize onlara -1 verir
+        found = np.full(len(codes) + 1, UNKNOWN_COUNTRY, dtype=object)
+        hits = codes != _MISS
+        found[:-1][hits] = self.countries[codes[hits]]
+
+        if fallback is not None:
+            missing = np.flatnonzero(~hits)
+            resolved = fallback([uniques[row] for row in missing])
+            for row in missing:
+                found[row] = resolved.get(uniques[row]) or UNKNOWN_COUNTRY
+
+        return pd.Series(found[row_codes], index=ips.index, dtype=object)
+
+    @classmethod
+    def fromCsv(cls, path: str, start_column="start_ip", end_column="end_ip", country_column="country"):
+        """Load a range table; a ``network`` (CIDR) column may replace start/end."""
+        header = pd.read_csv(path, nrows=0).columns
+        use_network = "network" in header and start_column not in header
+        columns = ["network", country_column] if use_network else [start_column, end_column, country_column]
+        table = pd.read_csv(path, usecols=columns, dtype=str, keep_default_na=False)
+
+        def ranges():
+            if use_network:
+                for network, country in zip(table["network"], table[country_column]):
+                    network = ipaddress.ip_network(network, strict=False)
+                    yield network[0], network[-1], country or UNKNOWN_COUNTRY
+            else:
+                for start, end, country in zip(table[start_column], table[end_column], table[country_column]):
+                    yield ipaddress.ip_address(start), ipaddress.ip_address(end), country or UNKNOWN_COUNTRY
+
+        return cls(ranges())
+
+    @classmethod
+    def fromMmdb(cls, path: str):
+        try:
+            import maxminddb
+        except ImportError as e:
+            raise ImportError(".mmdb dosyaları için maxminddb kurulu olmalı") from e
+
+        native, aliased = [], []
+        with maxminddb.open_database(path) as reader:
+            for network, record in reader:
+                country = (record or {}).get("country")
+                if isinstance(country, dict):
+                    # GeoLite2/GeoIP2 biçimi
+                    country = country.get("iso_code")
+                if not country:
+                    continue
+                if network.version == 6 and any(network.subnet_of(alias) for alias in _IPV4_ALIASES):
+                    aliased.append((network, country))
+                else:
+                    native.append((network[0], network[-1], country))
+
+        # IPv4 ağacı varsa ::ffff:0:0/96 ve 2002::/16 onun takma adı ya da
+        # kopyasıdır; katlanırsa aynı aralıklar iki kez gelir ve çakışır
+        if not any(first.version == 4 for first, _, _ in native):
+            for network, country in aliased:
+                first, last = network[0], network[-1]
+                if first.ipv4_mapped is not None:
+                    first, last = first.ipv4_mapped, last.ipv4_mapped
+                native.append((first, last, country))
+        return cls(native)
+
+
+def loadIpCountryIndex(path: str) -> IpCountryIndex:
+    if path.lower().endswith(".mmdb"):
+        return IpCountryIndex.fromMmdb(path)
+    return IpCountryIndex.fromCsv(path)
+
+
+_index = None
+
+
+def getIpCountryIndex():
+    """The index for ``DMARC_IP_COUNTRY_DB``, loaded once; None when not configured."""
+    global _index
+    if _index is None and IP_COUNTRY_DB:
+        _index = loadIpCountryIndex(IP_COUNTRY_DB)
+        print(f"IP ülke tablosu yüklendi: {len(_index)} aralık")
+    return _index
@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+SPAM_THRESHOLD = float(os.getenv("DMARC_SPAM_THRESHOLD", 0.6))
+
+# (sütun, spam sayılan değerler); puanlar bu sırayla toplanır
+SPAM_SIGNALS = (
+    ("DMARCValidation", (0,)),
+    ("SPFAuthentication", (0,)),
+    ("SPFAlignment", (0,)),
+    ("DKIMAuthentication", (0,)),
+    ("DKIMAlignment", (0,)),
+    ("HeuristicResultTypeText", ("HalfCompliant", "NonCompliant")),
+)
+
+# Her sinyalin ağırlığı ayrı ayarlanır, ör. DMARC_SPAM_WEIGHT_DKIMALIGNMENT=0.3
+SPAM_WEIGHTS = {
+    column: float(os.getenv(f"DMARC_SPAM_WEIGHT_{column.upper()}", 0.2))
+    for column, _ in SPAM_SIGNALS
+}
+
+
+def spamScore(row: pd.Series, weights=SPAM_WEIGHTS, threshold=SPAM_THRESHOLD) -> int:
+    spamS = 0
+
+    for column, values in SPAM_SIGNALS:
+        if row[column] in values:
+            spamS += weights[column]
+
+    return 1 if spamS > threshold else 0
+
+
+def spamScores(df: pd.DataFrame, weights=SPAM_WEIGHTS, threshold=SPAM_THRESHOLD) -> pd.Series:
+    """Column-wise equivalent of ``df.apply(spamScore, axis=1)``.
+
+    Weights are added signal by signal in the same order as the row-wise
+    function, so the float sums (0.2 * 3 > 0.6) and the result match it
+    exactly. Missing values never count as a signal.
+    """
+    score = np.zeros(len(df))
+    for column, values in SPAM_SIGNALS:
+        signal = df[column].isin(values).to_numpy(dtype=bool, na_value=False)
+        np.add(score, weights[column], out=score, where=signal)
+
+    return pd.Series((score > threshold).astype(np.int64), index=df.index)
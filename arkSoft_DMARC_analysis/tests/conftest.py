@@ -0,0 +1,87 @@
+import csv
+import os
+import random
+import sys
+
+import pytest
+
+# Modüller paket değil, klasörden doğrudan içe aktarılır
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Dışa aktarım başlıkları; değerler bir sütun sola kaymış yazılır ve satır
+# sonunda fazladan bir alan bulunur (shiftFrame bunu düzeltir)
+EXPORT_HEADER = [
+    "Id", "Guid", "OrgName", "Email", "Domain", "DomainRoot", "DateRangeBegin",
+    "DateRangeEnd", "PolicyPublishedP", "PolicyPublishedAdkim", "PolicyPublishedAspf",
+    "PolicyPublishedSp", "SourceIP", "Volume", "PolicyDispositionValue", "PolicyDisposition",
+    "SPFAuthentication", "SPFAlignment", "DKIMAuthentication", "DKIMAlignment",
+    "DMARCValidation", "IPOwner", "PTR", "HeaderFrom", "EnvelopeFrom", "EnvelopeTo",
+    "HeuristicResultType", "HeuristicResultTypeText", "HeuristicComment",
+    "OverrideReasonType", "OverrideReasonTypeComment", "IsEnabled", "IsDeleted",
+    "CreatedBy", "CreatedAt", "ModifiedBy", "Unused",
+]
+
+
+def export_row(rng: random.Random, is_deleted) -> list:
+    day = rng.randint(1, 28)
+    domain = rng.choice(["ornek.com.tr", "example.com", "arksoft.com.tr"])
+    values = {
+        "Guid": f"{rng.getrandbits(64):016x}",
+        "OrgName": rng.choice(["google.com", "Yahoo", "Outlook.com"]),
+        "Email": f"dmarc@{domain}",
+        "Domain": domain,
+        "DomainRoot": domain,
+        "DateRangeBegin": f"2024-03-{day:02d} 00:00:00",
+        "DateRangeEnd": f"2024-03-{day:02d} 23:59:59",
+        "PolicyPublishedP": rng.choice(["none", "quarantine", "reject"]),
+        "PolicyPublishedAdkim": "r",
+        "PolicyPublishedAspf": "r",
+        "PolicyPublishedSp": "",
+        "SourceIP": f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+        "Volume": str(rng.randint(1, 500)),
+        "PolicyDispositionValue": str(rng.randint(0, 2)),
+        "PolicyDisposition": "none",
+        "SPFAuthentication": str(rng.randint(0, 1)),
+        "SPFAlignment": str(rng.randint(0, 1)),
+        "DKIMAuthentication": str(rng.randint(0, 1)),
+        "DKIMAlignment": str(rng.randint(0, 1)),
+        "DMARCValidation": str(rng.randint(0, 1)),
+        "IPOwner": rng.choice(["Türk Telekom", "Google LLC", "Amazon, Inc."]),
+        "PTR": rng.choice(["mail.ornek.com.tr", "", "mx.google.com"]),
+        "HeaderFrom": domain,
+        "EnvelopeFrom": domain,
+        "EnvelopeTo": "",
+        "HeuristicResultType": str(rng.randint(0, 2)),
+        "HeuristicResultTypeText": rng.choice(["Compliant", "HalfCompliant", "NonCompliant"]),
+        "HeuristicComment": rng.choice(["  boşluklu  ", "SPF, DKIM geçti", "ş ğ ü ı ö ç"]),
+        "OverrideReasonType": "",
+        "OverrideReasonTypeComment": "",
+        "IsEnabled": "1",
+        "IsDeleted": is_deleted(rng),
+        "CreatedBy": "system",
+        "CreatedAt": f"2024-03-{day:02d} 12:00:00",
+        "ModifiedBy": "",
+        "Unused": "",
+    }
+    return [values[name] for name in EXPORT_HEADER[1:]] + [""]
+
+
+@pytest.fixture
+def write_export(tmp_path):
+    """Writes a synthetic DMARC export: ``write_export(rows, encoding=..., extra_rows=...)``."""
+
+    def write(rows: int, encoding: str = "utf-16", seed: int = 7, is_deleted=None, extra_rows=()):
+        rng = random.Random(seed)
+        is_deleted = is_deleted or (lambda rng: rng.choice(["0", "1"]))
+        path = tmp_path / f"export-{encoding}.csv"
+        with open(path, "w", encoding=encoding, newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_HEADER)
+            for index in range(rows):
+                writer.writerow(export_row(rng, is_deleted))
+                for position, row in extra_rows:
+                    if position == index:
+                        writer.writerow(row)
+        return str(path)
+
+    return write
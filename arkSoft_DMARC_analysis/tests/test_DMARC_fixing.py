@@ -0,0 +1,56 @@
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from DMARC_fixing import cleanedChunks, cleanFrame, detectEncoding, numericColumn, shiftFrame
+
+
+def in_memory(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, low_memory=False, encoding=detectEncoding(path), on_bad_lines="skip")
+    return cleanFrame(shiftFrame(df))
+
+
+def streamed(path: str, chunk_rows: int) -> pd.DataFrame:
+    return pd.concat([df for _, df in cleanedChunks(path, chunk_rows)], ignore_index=True)
+
+
+def assert_same_values(left: pd.DataFrame, right: pd.DataFrame):
+    assert list(left.columns) == list(right.columns)
+    # Açıkça çevrilmeyen sütunların türü okuma yoluna göre değişir; değerler aynı olmalı
+    pdt.assert_frame_equal(
+        left.astype(object).where(left.notna(), None),
+        right.astype(object).where(right.notna(), None),
+        check_dtype=False,
+    )
+
+
+def test_numeric_column_reads_boolean_text():
+    values = pd.Series(["True", "false", " 0 ", "1", None, "x"], dtype=str)
+    assert numericColumn(values).tolist()[:4] == [1, 0, 0, 1]
+    assert numericColumn(values).iloc[4:].isna().all()
+    assert numericColumn(pd.Series([True, False])).astype("Int64").tolist() == [1, 0]
+
+
+@pytest.mark.parametrize(
+    "is_deleted",
+    [
+        lambda rng: rng.choice(["0", "1"]),
+        lambda rng: rng.choice(["True", "False"]),
+        lambda rng: rng.choice(["True", "False", "0"]),
+    ],
+    ids=["digits", "booleans", "mixed"],
+)
+def test_streaming_matches_in_memory(write_export, is_deleted):
+    path = write_export(50, encoding="utf-8", is_deleted=is_deleted)
+    expected = in_memory(path)
+    actual = streamed(path, chunk_rows=7)
+
+    assert_same_values(actual, expected)
+    assert set(actual["IsDeleted"]) <= {0, 1}
+    assert (actual["IsEnabled"] == 1 - actual["IsDeleted"]).all()
+
+
+def test_boolean_is_deleted_is_not_treated_as_deleted(write_export):
+    path = write_export(20, encoding="utf-8", is_deleted=lambda rng: "False")
+    df = streamed(path, chunk_rows=6)
+    assert (df["IsDeleted"] == 0).all() and (df["IsEnabled"] == 1).all()
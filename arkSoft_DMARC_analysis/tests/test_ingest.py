@@ -0,0 +1,65 @@
+import csv
+import os
+import runpy
+
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from DMARC_fixing import cleanedChunks, cleanFrame, shiftFrame
+from ingest import ingest
+
+CLEANING_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cleaning.py")
+
+
+def read_ingested(path: str, chunk_rows: int = 1000) -> pd.DataFrame:
+    return pd.concat([df for _, df in cleanedChunks(path, chunk_rows)], ignore_index=True)
+
+
+def as_values(df: pd.DataFrame) -> pd.DataFrame:
+    # Okuma yoluna göre türler değişebilir; karşılaştırılan değerlerdir
+    return df.astype(object).where(df.notna(), None)
+
+
+def test_rows_with_wrong_column_count_are_rejected(write_export, tmp_path):
+    short_row = ["1", "kısa", "satır"]
+    long_row = ["x"] * 40
+    path = write_export(30, extra_rows=((4, short_row), (20, long_row), (25, short_row)))
+    rejected_path = tmp_path / "rejected.csv"
+
+    summary = ingest(path, str(tmp_path / "out.parquet"), str(rejected_path), block_bytes=4096)
+
+    assert summary["encoding"] == "utf-16"
+    assert summary["rows"] == 30
+    assert summary["rejected"] == 3
+    assert summary["rejected_by_columns"] == {3: 2, 40: 1}
+    with open(rejected_path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [(row["expected_columns"], row["actual_columns"]) for row in rows] == [
+        ("37", "3"), ("37", "40"), ("37", "3")
+    ]
+    assert rows[0]["text"] == ",".join(short_row)
+    assert len(pd.read_parquet(tmp_path / "out.parquet")) == 30
+
+
+@pytest.mark.parametrize("block_bytes", [2048, 1 << 20])
+def test_ingest_matches_cleaning_then_fixing(write_export, tmp_path, monkeypatch, block_bytes):
+    path = write_export(
+        60,
+        is_deleted=lambda rng: rng.choice(["0", "1", "True", "False"]),
+        extra_rows=((10, ["eksik", "satır"]), (45, ["fazla"] * 39)),
+    )
+    os.replace(path, tmp_path / "datas.csv")
+
+    # Eski yol: cleaning.py çalışma dizinindeki datas.csv'den rawdatas.csv yazar
+    monkeypatch.chdir(tmp_path)
+    runpy.run_path(CLEANING_SCRIPT)
+    expected = cleanFrame(shiftFrame(pd.read_csv("rawdatas.csv", low_memory=False)))
+
+    summary = ingest("datas.csv", "datas.parquet", "datas.rejected.csv", block_bytes=block_bytes)
+    actual = read_ingested("datas.parquet", chunk_rows=17)
+
+    assert summary["rows"] == len(expected) == 60
+    assert summary["rejected"] == 2
+    assert list(actual.columns) == list(expected.columns)
+    pdt.assert_frame_equal(as_values(actual), as_values(expected), check_dtype=False)
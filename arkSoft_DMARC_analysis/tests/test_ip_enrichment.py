@@ -0,0 +1,76 @@
+import os
+import socket
+import sys
+
+import pandas as pd
+import pytest
+
+from ip_enrichment import UNKNOWN_COUNTRY, IpCache, IpEnricher
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import ipinfo_stand_in  # noqa: E402
+
+pytest.importorskip("requests")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return IpCache(str(tmp_path / "ip_cache.sqlite3"))
+
+
+@pytest.fixture
+def stand_in():
+    servers = []
+
+    def start(fail_every: int = 0):
+        server = ipinfo_stand_in.serve(fail_every=fail_every)
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def enricher(base_url: str, cache, **kwargs) -> IpEnricher:
+    return IpEnricher(base_url=base_url, token="", cache=cache, rate=0, backoff=0, retries=1, timeout=2, **kwargs)
+
+
+def closed_port_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def test_definitive_answers_are_cached(stand_in, cache):
+    ips = ["8.8.8.8", "10.0.0.1", "yok"]
+    results = enricher(stand_in(), cache).countries(ips)
+
+    assert results["8.8.8.8"] == ipinfo_stand_in.country_for("8.8.8.8")
+    # Özel adres (200, ülke yok) ve 404 kesin yanıttır, saklanır
+    assert results["10.0.0.1"] is None and results["yok"] is None
+    assert cache.getMany(ips) == results
+
+
+def test_server_errors_are_not_cached(stand_in, cache):
+    results = enricher(stand_in(fail_every=1), cache).countries(["8.8.8.8", "1.1.1.1"])
+    assert results == {"8.8.8.8": None, "1.1.1.1": None}
+    assert cache.getMany(["8.8.8.8", "1.1.1.1"]) == {}
+
+    # Ağ düzelince bir sonraki çalıştırma yeniden sorar
+    recovered = enricher(stand_in(), cache).countries(["8.8.8.8"])
+    assert recovered["8.8.8.8"] == ipinfo_stand_in.country_for("8.8.8.8")
+    assert cache.getMany(["8.8.8.8"]) == recovered
+
+
+def test_connection_errors_are_not_cached(cache):
+    series = pd.Series(["8.8.8.8", None, "8.8.8.8"])
+    countries = enricher(closed_port_url(), cache).lookup(series)
+    assert countries.tolist() == [UNKNOWN_COUNTRY] * 3
+    assert cache.getMany(["8.8.8.8"]) == {}
+
+
+def test_fetch_country_keeps_its_contract(stand_in):
+    assert enricher(stand_in(fail_every=1), None).fetchCountry("8.8.8.8") is None
+    assert enricher(stand_in(), None).fetchCountry("10.0.0.1") is None
@@ -0,0 +1,200 @@
+import ipaddress
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ip_geolocation import UNKNOWN_COUNTRY, IpCountryIndex
+
+
+def ip_range(first: str, last: str, country: str):
+    return ipaddress.ip_address(first), ipaddress.ip_address(last), country
+
+
+@pytest.fixture
+def index():
+    return IpCountryIndex(
+        [
+            ip_range("10.0.0.0", "10.0.0.255", "TR"),
+            ip_range("8.8.8.0", "8.8.8.255", "US"),
+            ip_range("8.8.9.0", "8.8.9.0", "DE"),
+            ip_range("2001:db8::", "2001:db8::ffff", "NL"),
+        ]
+    )
+
+
+def test_lookup_resolves_both_families_and_range_bounds(index):
+    ips = pd.Series(["8.8.8.0", "8.8.8.255", "8.8.9.0", "10.0.0.7", "2001:db8::1", "2001:db8::ffff"])
+    assert index.lookup(ips).tolist() == ["US", "US", "DE", "TR", "NL", "NL"]
+
+
+def test_lookup_misses_gaps_invalid_and_missing_values(index):
+    ips = pd.Series(["8.8.7.255", "8.8.9.1", "0.0.0.0", "255.255.255.255", "2001:db9::", "yok", None, np.nan])
+    assert index.lookup(ips).tolist() == [UNKNOWN_COUNTRY] * len(ips)
+
+
+def test_lookup_folds_ipv4_mapped_addresses(index):
+    assert index.lookup(pd.Series(["::ffff:8.8.8.8", " 10.0.0.1 "])).tolist() == ["US", "TR"]
+
+
+def test_lookup_keeps_the_index(index):
+    ips = pd.Series(["8.8.8.8", "10.0.0.1"], index=[7, 3])
+    assert index.lookup(ips).index.tolist() == [7, 3]
+
+
+def test_fallback_is_called_once_with_distinct_misses(index):
+    calls = []
+
+    def fallback(missing):
+        calls.append(list(missing))
+        return {"1.1.1.1": "AU"}
+
+    ips = pd.Series(["1.1.1.1", "8.8.8.8", "1.1.1.1", "9.9.9.9", None])
+    result = index.lookup(ips, fallback=fallback)
+    assert result.tolist() == ["AU", "US", "AU", UNKNOWN_COUNTRY, UNKNOWN_COUNTRY]
+    assert len(calls) == 1 and sorted(calls[0]) == ["1.1.1.1", "9.9.9.9"]
+
+
+def test_overlapping_ranges_are_rejected():
+    with pytest.raises(ValueError):
+        IpCountryIndex([ip_range("1.0.0.0", "1.0.0.10", "TR"), ip_range("1.0.0.10", "1.0.0.20", "US")])
+
+
+def test_mixed_family_range_is_rejected():
+    with pytest.raises(ValueError):
+        IpCountryIndex([ip_range("1.0.0.0", "::1", "TR")])
+
+
+def test_empty_family_misses():
+    index = IpCountryIndex([ip_range("1.0.0.0", "1.0.0.255", "TR")])
+    assert index.lookup(pd.Series(["2001:db8::1", "1.0.0.1"])).tolist() == [UNKNOWN_COUNTRY, "TR"]
+
+
+def test_from_csv_with_ranges_and_networks(tmp_path):
+    ranges = tmp_path / "ranges.csv"
+    ranges.write_text("start_ip,end_ip,country\n8.8.8.0,8.8.8.255,US\n2001:db8::,2001:db8::ff,\n")
+    networks = tmp_path / "networks.csv"
+    networks.write_text("network,country\n8.8.8.0/24,US\n10.0.0.0/8,TR\n")
+
+    by_range = IpCountryIndex.fromCsv(str(ranges))
+    assert by_range.lookup(pd.Series(["8.8.8.8", "2001:db8::1"])).tolist() == ["US", UNKNOWN_COUNTRY]
+    by_network = IpCountryIndex.fromCsv(str(networks))
+    assert by_network.lookup(pd.Series(["10.1.2.3", "8.8.8.8"])).tolist() == ["TR", "US"]
+
+
+# Küçük bir .mmdb yazıcısı: yalnızca testin ihtiyaç duyduğu veri türleri
+_UINT_TYPES = {"uint16": 5, "uint32": 6, "uint64": 9}
+
+
+def _control(type_id: int, size: int) -> bytes:
+    if type_id <= 7:
+        return bytes([(type_id << 5) | size])
+    return bytes([size, type_id - 7])
+
+
+def _encode(value) -> bytes:
+    if isinstance(value, tuple):
+        type_name, number = value
+        payload = number.to_bytes((number.bit_length() + 7) // 8, "big")
+        return _control(_UINT_TYPES[type_name], len(payload)) + payload
+    if isinstance(value, dict):
+        return _control(7, len(value)) + b"".join(_encode(k) + _encode(v) for k, v in value.items())
+    if isinstance(value, list):
+        return _control(11, len(value)) + b"".join(_encode(item) for item in value)
+    payload = value.encode("utf-8")
+    return _control(2, len(payload)) + payload
+
+
+def write_mmdb(path, networks, aliases=()):
+    """IPv6 database (24-bit records); IPv4 networks live under ::/96 and
+    each prefix in ``aliases`` points at that subtree, as MaxMind writes it."""
+    nodes = [[None, None]]
+
+    def walk(bits: int, length: int):
+        node = 0
+        for depth in range(length - 1):
+            bit = bits >> (127 - depth) & 1
+            child = nodes[node][bit]
+            if child is None or child[0] != "node":
+                nodes.append([None, None])
+                child = nodes[node][bit] = ("node", len(nodes) - 1)
+            node = child[1]
+        return node, bits >> (128 - length) & 1
+
+    data = b""
+    for network, record in networks:
+        network = ipaddress.ip_network(network)
+        length = network.prefixlen + (96 if network.version == 4 else 0)
+        node, bit = walk(int(network.network_address), length)
+        nodes[node][bit] = ("data", len(data))
+        data += _encode(record)
+
+    node, bit = walk(0, 96)
+    ipv4_root = nodes[node][bit]
+    for alias in aliases:
+        alias = ipaddress.ip_network(alias)
+        node, bit = walk(int(alias.network_address), alias.prefixlen)
+        nodes[node][bit] = ipv4_root
+
+    node_count = len(nodes)
+
+    def record_value(record) -> int:
+        if record is None:
+            return node_count
+        kind, value = record
+        return value if kind == "node" else node_count + 16 + value
+
+    tree = b"".join(
+        record_value(left).to_bytes(3, "big") + record_value(right).to_bytes(3, "big")
+        for left, right in nodes
+    )
+    metadata = {
+        "binary_format_major_version": ("uint16", 2),
+        "binary_format_minor_version": ("uint16", 0),
+        "build_epoch": ("uint64", 1),
+        "database_type": "Test-Country",
+        "description": {"en": "test"},
+        "ip_version": ("uint16", 6),
+        "languages": ["en"],
+        "node_count": ("uint32", node_count),
+        "record_size": ("uint16", 24),
+    }
+    with open(path, "wb") as f:
+        f.write(tree + b"\0" * 16 + data + b"\xab\xcd\xefMaxMind.com" + _encode(metadata))
+
+
+MMDB_NETWORKS = [
+    ("1.2.3.0/24", {"country": {"iso_code": "TR"}}),
+    ("8.8.8.0/24", {"country": "US"}),
+    ("9.9.9.0/24", {"city": "yok"}),
+    ("2001:db8::/32", {"country": {"iso_code": "DE"}}),
+]
+
+
+@pytest.mark.parametrize(
+    "networks, aliases",
+    [
+        # MaxMind düzeni: eşlenmiş ve 6to4 önekleri IPv4 ağacını gösterir
+        (MMDB_NETWORKS, ("::ffff:0:0/96", "2002::/16")),
+        # Bazı üreticiler IPv4 aralıklarını eşlenmiş önekte yeniden yazar
+        (MMDB_NETWORKS + [("::ffff:1.2.3.0/120", {"country": "TR"})], ()),
+    ],
+)
+def test_from_mmdb_skips_ipv4_aliases(tmp_path, networks, aliases):
+    pytest.importorskip("maxminddb")
+    path = tmp_path / "country.mmdb"
+    write_mmdb(path, networks, aliases)
+
+    index = IpCountryIndex.fromMmdb(str(path))
+    assert len(index) == 3
+    ips = pd.Series(["1.2.3.4", "::ffff:8.8.8.8", "2001:db8::1", "9.9.9.9"])
+    assert index.lookup(ips).tolist() == ["TR", "US", "DE", UNKNOWN_COUNTRY]
+
+
+def test_from_mmdb_folds_mapped_space_without_ipv4_tree(tmp_path):
+    pytest.importorskip("maxminddb")
+    path = tmp_path / "mapped.mmdb"
+    write_mmdb(path, [("::ffff:1.2.3.0/120", {"country": "TR"}), ("2001:db8::/32", {"country": "DE"})])
+
+    index = IpCountryIndex.fromMmdb(str(path))
+    assert index.lookup(pd.Series(["1.2.3.4", "2001:db8::1"])).tolist() == ["TR", "DE"]
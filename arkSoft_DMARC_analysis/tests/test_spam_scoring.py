@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from spam_scoring import SPAM_SIGNALS, SPAM_THRESHOLD, SPAM_WEIGHTS, spamScore, spamScores
+
+HEURISTIC_TEXTS = ("Compliant", "HalfCompliant", "NonCompliant")
+
+
+def legacySpamScore(row) -> int:
+    # DMARC_fixing.py'deki eski satır satır puanlama, olduğu gibi
+    spamS = 0
+
+    if row["DMARCValidation"] == 0:
+        spamS += 0.2
+    if row["SPFAuthentication"] == 0:
+        spamS += 0.2
+    if row["SPFAlignment"] == 0:
+        spamS += 0.2
+    if row["DKIMAuthentication"] == 0:
+        spamS += 0.2
+    if row["DKIMAlignment"] == 0:
+        spamS += 0.2
+    if row["HeuristicResultTypeText"] in ["HalfCompliant", "NonCompliant"]:
+        spamS += 0.2
+
+    return 1 if spamS > 0.6 else 0
+
+
+def synthetic_frame(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            column: pd.array(rng.integers(0, 2, rows), dtype="Int64")
+            for column, _ in SPAM_SIGNALS[:-1]
+        }
+    )
+    df["HeuristicResultTypeText"] = pd.array(rng.choice(HEURISTIC_TEXTS, rows), dtype="string")
+    return df
+
+
+@pytest.mark.parametrize("seed", [0, 42])
+def test_vectorized_matches_legacy(seed):
+    df = synthetic_frame(5000, seed)
+    legacy = df.apply(legacySpamScore, axis=1)
+
+    assert df.apply(spamScore, axis=1).equals(legacy)
+    assert spamScores(df).equals(legacy)
+
+
+def test_three_signals_are_spam_like_legacy():
+    # 0.2 * 3 toplamı 0.6'yı aşar; eski kod da bu satırı spam sayar
+    df = synthetic_frame(1, 0)
+    for column, _ in SPAM_SIGNALS[:-1]:
+        df[column] = pd.array([1], dtype="Int64")
+    df.loc[0, ["DMARCValidation", "SPFAuthentication", "SPFAlignment"]] = 0
+    df["HeuristicResultTypeText"] = pd.array(["Compliant"], dtype="string")
+
+    assert spamScores(df).tolist() == [legacySpamScore(df.iloc[0])] == [1]
+
+
+def test_custom_weights_and_threshold_match_row_wise():
+    df = synthetic_frame(2000, 3)
+    rng = np.random.default_rng(3)
+    weights = {column: float(rng.uniform(0, 1)) for column, _ in SPAM_SIGNALS}
+
+    for threshold in (0.5, 1.0, 1.7):
+        row_wise = df.apply(spamScore, axis=1, weights=weights, threshold=threshold)
+        assert spamScores(df, weights, threshold).equals(row_wise)
+
+
+def test_missing_values_never_count():
+    df = synthetic_frame(4, 1)
+    for column, _ in SPAM_SIGNALS[:-1]:
+        df[column] = pd.array([0, None, None, 0], dtype="Int64")
+    df["HeuristicResultTypeText"] = pd.array(["NonCompliant", None, "NonCompliant", None], dtype="string")
+
+    assert spamScores(df, threshold=0.0).tolist() == [1, 0, 1, 1]
+    assert spamScores(df).tolist() == [1, 0, 0, 1]
+
+
+def test_weights_and_threshold_read_from_environment():
+    env = dict(
+        os.environ,
+        DMARC_SPAM_THRESHOLD="0.5",
+        DMARC_SPAM_WEIGHT_DKIMALIGNMENT="0.75",
+    )
+    code = (
+        "from spam_scoring import SPAM_THRESHOLD, SPAM_WEIGHTS; "
+        "print(SPAM_THRESHOLD, SPAM_WEIGHTS['DKIMAlignment'], SPAM_WEIGHTS['DMARCValidation'])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+    assert output == ["0.5", "0.75", "0.2"]
+
+
+def test_defaults():
+    # Ortam değişkeni verilmezse eski sabitler geçerlidir
+    if any(name.startswith("DMARC_SPAM_") for name in os.environ):
+        pytest.skip("DMARC_SPAM_* ortamda ayarlı")
+    assert SPAM_THRESHOLD == 0.6
+    assert SPAM_WEIGHTS == {column: 0.2 for column, _ in SPAM_SIGNALS}
@@ -1,8 +1,152 @@
-from flask import Flask, jsonify, request
+import json
+import logging
+import math
+import os
+import signal
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from flask import Flask, Response, jsonify, request
 import phishing_analyze
+import deferred
+import metrics
+import startup
+from response_cache import get_response_cache
 
 app = Flask(__name__)
 
+BATCH_WORKERS = int(os.getenv("PHISHING_BATCH_WORKERS", os.cpu_count() or 2))
+BATCH_MAX_IN_FLIGHT = int(os.getenv("PHISHING_BATCH_MAX_IN_FLIGHT", BATCH_WORKERS * 2))
+BATCH_DOC_TIMEOUT = float(os.getenv("PHISHING_BATCH_DOC_TIMEOUT", 60))
+BATCH_MAX_DOCUMENTS = int(os.getenv("PHISHING_BATCH_MAX_DOCUMENTS", 1000))
+RESPONSE_CACHE_ENABLED = os.getenv("PHISHING_RESPONSE_CACHE", "1") != "0"
+
+# Zaman aşımını aşan işçi bu kadar süre sonra hâlâ dönmezse havuz yenilenir
+BATCH_KILL_GRACE = float(os.getenv("PHISHING_BATCH_KILL_GRACE", 5))
+
+_batch_pool = None
+_batch_pool_lock = threading.Lock()
+
+
+class DocumentTimeout(Exception):
+    pass
+
+
+def _expire(signum, frame):
+    raise DocumentTimeout()
+
+
+def analyze_with_deadline(html_content, timeout: float) -> dict:
+    """Run in a batch worker; the document is abandoned after ``timeout`` seconds.
+
+    The deadline is a SIGALRM in the worker itself, so the worker is freed
+    for the next document instead of finishing a result nobody waits for.
+    """
+    if timeout > 0 and hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _expire)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return phishing_analyze.analyze_and_classify(html_content)
+    finally:
+        if timeout > 0 and hasattr(signal, "setitimer"):
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def get_batch_pool() -> ProcessPoolExecutor:
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is None:
+            # Çatallanan işçiler ebeveynin iş parçacığı havuzlarını miras almasın
+            _batch_pool = ProcessPoolExecutor(
+                max_workers=BATCH_WORKERS, initializer=startup.reset_worker_state
+            )
+        return _batch_pool
+
+
+def recycle_batch_pool(pool: ProcessPoolExecutor):
+    """Kill a pool whose worker is stuck past its deadline (e.g. inside C code)."""
+    global _batch_pool
+    with _batch_pool_lock:
+        if _batch_pool is pool:
+            _batch_pool = None
+    for process in list((pool._processes or {}).values()):
+        process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def stream_batch_results(documents):
+    # Sıra korunur; aynı anda en fazla BATCH_MAX_IN_FLIGHT belge kuyrukta bekler
+    in_flight = deque()
+    next_index = 0
+
+    def submit(index: int, retried: bool = False):
+        pool = get_batch_pool()
+        future = pool.submit(analyze_with_deadline, documents[index], BATCH_DOC_TIMEOUT)
+        return index, pool, future, retried
+
+    while next_index < len(documents) or in_flight:
+        while next_index < len(documents) and len(in_flight) < BATCH_MAX_IN_FLIGHT:
+            in_flight.append(submit(next_index))
+            next_index += 1
+
+        index, pool, future, retried = in_flight.popleft()
+        try:
+            line = {"index": index, **future.result(timeout=BATCH_DOC_TIMEOUT + BATCH_KILL_GRACE)}
+        except (TimeoutError, DocumentTimeout):
+            if not future.done():
+                logging.error("Toplu analiz işçisi yanıt vermiyor, havuz yenileniyor")
+                recycle_batch_pool(pool)
+            line = {"index": index, "error": "Analiz zaman aşımına uğradı."}
+        except BrokenProcessPool:
+            # Havuz başka bir belge yüzünden yenilendiyse belge bir kez daha denenir
+            if not retried:
+                in_flight.appendleft(submit(index, retried=True))
+                continue
+            line = {"index": index, "error": "Analiz işçisi beklenmedik şekilde sonlandı."}
+        except Exception as e:
+            line = {"index": index, "error": f"Analiz hatası: {e}"}
+        yield json.dumps(line, ensure_ascii=False, default=str) + "\n"
+
+
+def cache_headers(key: str, status: str) -> dict:
+    return {"X-Cache": status, "X-Cache-Key": key[:16]}
+
+
+def wants_timings(value) -> bool:
+    return str(value).lower() in ("1", "true", "yes")
+
+
+def parse_budget_ms(value):
+    """The latency budget in milliseconds, or None when it is not a valid number."""
+    if value is None or value == "":
+        return 0.0
+    if isinstance(value, bool):
+        return None
+    try:
+        budget_ms = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(budget_ms) or budget_ms < 0:
+        return None
+    return budget_ms
+
+
+def analyze_cached(html_content):
+    """Return the risk details, response headers and per-stage timings in ms."""
+    with metrics.collect_timings() as timings, metrics.timed("request"):
+        # Aynı kampanyanın kopyaları normalize edilmiş HTML özetiyle tek analize iner
+        if not RESPONSE_CACHE_ENABLED:
+            risk_details = phishing_analyze.analyze_turkish_html_phishing(html_content)
+            headers = {"X-Cache": "BYPASS"}
+        else:
+            risk_details, key, status = get_response_cache().get_or_compute(
+                html_content, phishing_analyze.analyze_turkish_html_phishing
+            )
+            headers = cache_headers(key, status)
+    return risk_details, headers, timings
+
 
 @app.route("/phishing", methods=["POST"])
 def phishing_analysis_post():
@@ -16,15 +160,30 @@ def phishing_analysis_post():
     if not html_content:
         return jsonify({"error": "HTML içeriği sağlanmadı."}), 400
 
-    risk_details = phishing_analyze.analyze_turkish_html_phishing(html_content)
-    risk_level = phishing_analyze.classify_phishing_risk(risk_details)
+    # Gecikme bütçesi verilirse ağ kontrolleri arka planda tamamlanır
+    budget_ms = parse_budget_ms(data.get("budget_ms", deferred.LATENCY_BUDGET_MS))
+    if budget_ms is None:
+        return jsonify({"error": "budget_ms negatif olmayan bir sayı olmalı."}), 400
+    if budget_ms > 0:
+        headers = {"X-Cache": "BYPASS"}
+        if RESPONSE_CACHE_ENABLED:
+            risk_details, key = get_response_cache().peek(html_content)
+            if risk_details is not None:
+                response = {**phishing_analyze.build_post_response(risk_details), "status": "complete"}
+                return jsonify(response), 200, cache_headers(key, "HIT")
+            headers = cache_headers(key, "MISS")
+        return (
+            jsonify(deferred.get_deferred_analyzer().analyze(html_content, budget_ms)),
+            200,
+            headers,
+        )
+
+    risk_details, headers, timings = analyze_cached(html_content)
     print(f"these risk details:{risk_details}")
-    return jsonify(
-        {
-            "risk_score": risk_details,
-            "risk_level": risk_level,
-        }
-    )
+    response = phishing_analyze.build_post_response(risk_details)
+    if wants_timings(data.get("timings")):
+        response["timings_ms"] = timings
+    return jsonify(response), 200, headers
 
 
 @app.route("/phishing", methods=["GET"])
@@ -34,16 +193,74 @@ def phishing_analysis_get():
     if not data:
         return jsonify({"error": "HTML içeriği sağlanmadı."}), 400
 
-    risk_details = phishing_analyze.analyze_turkish_html_phishing(data)
+    risk_details, headers, timings = analyze_cached(data)
     risk_level = phishing_analyze.classify_phishing_risk(risk_details)
 
-    return jsonify(
-        {
-            "risk_score": risk_details["total_score"],
-            "risk_details": risk_details, 
-            "risk_level": risk_level,
-        }
-    )
+    response = {
+        "risk_score": risk_details["total_score"],
+        "risk_details": risk_details,
+        "risk_level": risk_level,
+    }
+    if wants_timings(request.args.get("timings")):
+        response["timings_ms"] = timings
+    return jsonify(response), 200, headers
+
+
+@app.before_request
+def ensure_preloaded():
+    # gunicorn ana süreçte ön yükler; flask run ya da geliştirme sunucusunda
+    # ilk istek yükler, sonrakiler yalnızca bayrağa bakar
+    if not startup.is_ready():
+        startup.preload()
+
+
+@app.route("/ready", methods=["GET"])
+def readiness():
+    # Modeller ön yüklenmeden trafik yönlendirilmesin
+    if not startup.is_ready():
+        return jsonify({"status": "starting"}), 503
+    return jsonify({"status": "ready", **startup.report()})
+
+
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    # PHISHING_METRICS_DIR verilirse (gunicorn.conf.py çok işçide verir) tüm
+    # süreçlerin, toplu analiz işçileri dahil, toplamı döner; verilmezse
+    # yalnızca yanıtlayan süreç
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/phishing/jobs/<job_id>", methods=["GET"])
+def phishing_analysis_job(job_id):
+    job = deferred.get_deferred_analyzer().get(job_id)
+    if job is None:
+        return jsonify({"error": "İş bulunamadı veya süresi doldu."}), 404
+    if job["status"] == "pending":
+        return jsonify(job), 202
+    return jsonify(job)
+
+
+@app.route("/phishing/batch", methods=["POST"])
+def phishing_analysis_batch():
+    data = request.get_json(silent=True) or {}
+    documents = data.get("documents")
+
+    if not isinstance(documents, list) or not documents:
+        return jsonify({"error": "Belge listesi sağlanmadı."}), 400
+    if len(documents) > BATCH_MAX_DOCUMENTS:
+        return (
+            jsonify({"error": f"En fazla {BATCH_MAX_DOCUMENTS} belge gönderilebilir."}),
+            413,
+        )
+
+    documents = [
+        document.get("html_content", "") if isinstance(document, dict) else document
+        for document in documents
+    ]
+    if not all(isinstance(document, str) and document for document in documents):
+        return jsonify({"error": "HTML içeriği sağlanmadı."}), 400
+
+    return Response(stream_batch_results(documents), mimetype="application/x-ndjson")
 
 
 if __name__ == "__main__":
@@ -55,4 +272,6 @@ if __name__ == "__main__":
         },
     )
     print(response.get_json())"""
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # Üretimde: gunicorn -c gunicorn.conf.py app:app
+    # Ön yükleme ilk istekte yapılır; yeniden yükleyicinin izleyici süreci yüklemez
+    app.run(host="0.0.0.0", port=5000, debug=True, threaded=True)
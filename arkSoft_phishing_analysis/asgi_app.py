@@ -0,0 +1,143 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from quart import Quart, Response, jsonify, request
+
+import metrics
+import phishing_analyze
+import startup
+from domain_age import DomainAgeResolver
+from domain_store import get_store
+from url_probe import get_probe
+
+app = Quart(__name__)
+
+# HTML ayrıştırma ve çevrimdışı kontroller CPU yoğun, ayrı süreçlerde çalışır
+PARSE_WORKERS = int(os.getenv("PHISHING_PARSE_WORKERS", os.cpu_count() or 2))
+# Bloklayan ağ çağrıları (WHOIS, HEAD, indirme) için iş parçacığı sayısı
+IO_WORKERS = int(os.getenv("PHISHING_IO_WORKERS", 256))
+
+_parse_pool = None
+_resolver = None
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=PARSE_WORKERS, initializer=startup.reset_worker_state
+        )
+    return _parse_pool
+
+
+def get_io_resolver() -> DomainAgeResolver:
+    # WHOIS havuzu G/Ç iş parçacıkları kadar; daha küçük olursa yük altında
+    # sorgular kuyrukta kalır ve yaş kontrolü sessizce atlanır
+    global _resolver
+    if _resolver is None:
+        _resolver = DomainAgeResolver(max_workers=IO_WORKERS, store=get_store())
+        metrics.register_cache("whois", _resolver.cache)
+    return _resolver
+
+
+def run_offline_checks_in_worker(html_content):
+    """Offline checks in a parse worker; its metrics travel back with the result."""
+    with metrics.recorded_changes() as changes:
+        result, pending_links = phishing_analyze.run_offline_checks(html_content)
+    return result, pending_links, changes
+
+
+@app.before_serving
+async def configure_executors():
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="io")
+    )
+    await asyncio.to_thread(startup.preload)
+
+
+@app.route("/ready", methods=["GET"])
+async def readiness():
+    if not startup.is_ready():
+        return jsonify({"status": "starting"}), 503
+    return jsonify({"status": "ready", **startup.report()})
+
+
+async def analyze_turkish_html_phishing_async(html_content) -> dict:
+    loop = asyncio.get_running_loop()
+    result, pending_links, changes = await loop.run_in_executor(
+        get_parse_pool(), run_offline_checks_in_worker, html_content
+    )
+    metrics.apply_changes(changes)
+
+    shortened_urls = list(
+        dict.fromkeys(link.url for link in pending_links if link.shortened)
+    )
+    # WHOIS ve URL yoklamaları aynı anda beklenir
+    creation_dates, *probe_results = await asyncio.gather(
+        asyncio.to_thread(
+            get_io_resolver().resolve_many, [link.domain for link in pending_links]
+        ),
+        *(asyncio.to_thread(get_probe().probe, url) for url in shortened_urls),
+    )
+    probes = dict(zip(shortened_urls, probe_results))
+
+    image_urls = phishing_analyze.image_urls_to_scan(pending_links, probes)
+    texts = await asyncio.gather(
+        *(asyncio.to_thread(phishing_analyze.ocr_image_text, url) for url in image_urls)
+    )
+
+    phishing_analyze.apply_network_results(
+        result, pending_links, creation_dates, dict(zip(image_urls, texts))
+    )
+    return result.to_dict()
+
+
+@app.route("/metrics", methods=["GET"])
+async def prometheus_metrics():
+    # Ayrıştırma süreçlerinin ölçümleri sonuçla birlikte bu sürece taşınır
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/phishing", methods=["POST"])
+async def phishing_analysis_post():
+    data = await request.get_json()
+    if not data:
+        return jsonify({"error": "HTML içeriği sağlanmadı."}), 400
+    html_content = data.get("html_content", "empty")
+
+    if not html_content:
+        return jsonify({"error": "HTML içeriği sağlanmadı."}), 400
+
+    risk_details = await analyze_turkish_html_phishing_async(html_content)
+    risk_level = phishing_analyze.classify_phishing_risk(risk_details)
+    return jsonify(
+        {
+            "risk_score": risk_details,
+            "risk_level": risk_level,
+        }
+    )
+
+
+@app.route("/phishing", methods=["GET"])
+async def phishing_analysis_get():
+    data = request.args.get("html_content", "")
+
+    if not data:
+        return jsonify({"error": "HTML içeriği sağlanmadı."}), 400
+
+    risk_details = await analyze_turkish_html_phishing_async(data)
+    risk_level = phishing_analyze.classify_phishing_risk(risk_details)
+
+    return jsonify(
+        {
+            "risk_score": risk_details["total_score"],
+            "risk_details": risk_details,
+            "risk_level": risk_level,
+        }
+    )
+
+
+if __name__ == "__main__":
+    # Üretimde: hypercorn asgi_app:app --bind 0.0.0.0:5000
+    app.run(host="0.0.0.0", port=5000)
@@ -0,0 +1,106 @@
+import binascii
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from urllib.parse import unquote
+
+# Bir data: URI içinde taranacak en fazla çözülmüş bayt
+SCAN_MAX_BYTES = int(os.getenv("BASE64_SCAN_MAX_BYTES", 1024 * 1024))
+# 4'ün katı olmalı, base64 grupları parçalar arasında bölünmesin
+CHUNK_CHARS = 64 * 1024
+DIGEST_CHARS = 16
+
+# Küçük harfe çevrilmiş içerikte aranır
+MARKERS = (b"script", b"<html", b"<iframe", b"<object", b"onerror=", b"onload=")
+
+_NON_ALPHABET = re.compile(r"[^A-Za-z0-9+/]")
+_HEADER_LIMIT = 256
+
+
+@dataclass(slots=True, frozen=True)
+class DataUriScan:
+    media_type: str
+    is_base64: bool
+    digest: str
+    scanned_bytes: int
+    truncated: bool
+    marker: str = None
+
+    @property
+    def evidence(self) -> str:
+        """Short stand-in for the payload, safe to store in the risk details."""
+        encoding = ";base64" if self.is_base64 else ""
+        return f"data:{self.media_type}{encoding},sha256:{self.digest}"
+
+
+def _find_marker(window: bytes, markers) -> str:
+    for marker in markers:
+        if marker in window:
+            return marker.decode()
+    return None
+
+
+def _scan_base64(src: str, start: int, max_bytes: int, markers, digest) -> tuple:
+    overlap = max(len(marker) for marker in markers) - 1
+    carry = ""
+    tail = b""
+    scanned = 0
+    marker = None
+    for offset in range(start, len(src), CHUNK_CHARS):
+        chunk = src[offset : offset + CHUNK_CHARS]
+        digest.update(chunk.encode("utf-8", "surrogatepass"))
+        # Eşleşme bulunduktan ya da sınıra ulaşıldıktan sonra yalnızca özet sürer
+        if marker is not None or scanned >= max_bytes:
+            continue
+
+        # b64decode gibi alfabe dışı karakterler (boşluk, dolgu) atlanır
+        text = carry + _NON_ALPHABET.sub("", chunk)
+        usable = len(text) - len(text) % 4
+        carry = text[usable:]
+        decoded = binascii.a2b_base64(text[:usable])[: max_bytes - scanned]
+        scanned += len(decoded)
+        window = (tail + decoded).lower()
+        marker = _find_marker(window, markers)
+        tail = window[-overlap:]
+
+    if marker is None and len(carry) > 1 and scanned < max_bytes:
+        decoded = binascii.a2b_base64(carry + "=" * (-len(carry) % 4))
+        scanned += len(decoded)
+        marker = _find_marker((tail + decoded).lower(), markers)
+    return scanned, marker
+
+
+def _scan_plain(src: str, start: int, max_bytes: int, markers, digest) -> tuple:
+    for offset in range(start, len(src), CHUNK_CHARS):
+        digest.update(src[offset : offset + CHUNK_CHARS].encode("utf-8", "surrogatepass"))
+    payload = unquote(src[start : start + max_bytes]).encode("utf-8", "surrogatepass")
+    return len(payload), _find_marker(payload.lower(), markers)
+
+
+def scan_data_uri(src: str, max_bytes: int = SCAN_MAX_BYTES, markers=MARKERS):
+    """Scan a ``data:`` URI for embedded script/HTML markers without decoding it whole.
+
+    Base64 payloads are decoded chunk by chunk and at most ``max_bytes``
+    decoded bytes are searched. Returns None when ``src`` is not a data URI.
+    """
+    if not src or not src.startswith("data:"):
+        return None
+    comma = src.find(",", 0, _HEADER_LIMIT)
+    if comma < 0:
+        return None
+
+    header = src[5:comma]
+    is_base64 = header.lower().endswith(";base64")
+    media_type = header[: -len(";base64")] if is_base64 else header
+    digest = hashlib.sha256()
+    scan = _scan_base64 if is_base64 else _scan_plain
+    scanned, marker = scan(src, comma + 1, max_bytes, markers, digest)
+    return DataUriScan(
+        media_type=media_type,
+        is_base64=is_base64,
+        digest=digest.hexdigest()[:DIGEST_CHARS],
+        scanned_bytes=scanned,
+        truncated=scanned >= max_bytes,
+        marker=marker,
+    )
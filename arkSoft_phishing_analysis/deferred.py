@@ -0,0 +1,168 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import phishing_analyze
+from ttl_cache import TTLCache
+
+LATENCY_BUDGET_MS = float(os.getenv("PHISHING_LATENCY_BUDGET_MS", 0))
+ENRICHMENT_WORKERS = int(os.getenv("PHISHING_ENRICHMENT_WORKERS", 8))
+JOB_TTL = float(os.getenv("PHISHING_JOB_TTL", 600))
+# Birden çok işçi süreçte iş sonuçları bu SQLite dosyasında paylaşılır; boşsa
+# sonuçlar süreç içinde tutulur ve yalnızca tek işçiyle çalışır
+JOB_STORE_PATH = os.getenv("PHISHING_JOB_STORE", "")
+
+_JOB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    response TEXT,
+    expires_at REAL
+)
+"""
+
+
+def _enrich(result, pending_links) -> dict:
+    try:
+        phishing_analyze.run_network_checks(result, pending_links)
+    except Exception as e:
+        logging.error(f"Ağ zenginleştirmesi başarısız: {e}")
+    return phishing_analyze.build_post_response(result.to_dict())
+
+
+class JobStore:
+    """SQLite table of deferred job results shared by all worker processes.
+
+    A job is written as pending (NULL response) when it is handed out and
+    updated by whichever worker finishes it, so any worker can answer the
+    poll. Rows expire ``ttl`` seconds after they were last written.
+    """
+
+    def __init__(self, path: str = JOB_STORE_PATH, ttl: float = JOB_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(_JOB_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def put(self, job_id: str, response: dict = None):
+        value = json.dumps(response, ensure_ascii=False, default=str) if response else None
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, response, expires_at) VALUES (?, ?, ?)",
+                (job_id, value, time.time() + self.ttl),
+            )
+
+    def get(self, job_id: str):
+        """Return ``(found, response or None while pending)``."""
+        row = (
+            self._connect()
+            .execute(
+                "SELECT response FROM jobs WHERE job_id = ? AND expires_at > ?",
+                (job_id, time.time()),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return False, None
+        return True, json.loads(row[0]) if row[0] is not None else None
+
+    def purge_expired(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM jobs WHERE expires_at <= ?", (time.time(),)).rowcount
+
+
+class DeferredAnalyzer:
+    """Answers within a latency budget and finishes network checks later.
+
+    Offline checks always run inline. Network enrichments (WHOIS, URL
+    probes, OCR) run on a background pool; if they finish within the budget
+    the final result is returned, otherwise the provisional one is returned
+    with a job id whose final result can be fetched with :meth:`get`.
+    Responses follow the ``POST /phishing`` contract. Without a ``store``
+    jobs live in this process only.
+    """
+
+    def __init__(
+        self,
+        workers: int = ENRICHMENT_WORKERS,
+        job_ttl: float = JOB_TTL,
+        store: JobStore = None,
+    ):
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="enrichment"
+        )
+        self.jobs = TTLCache(maxsize=100_000, ttl=job_ttl)
+        self.store = store
+
+    def _track(self, job_id: str, future):
+        if self.store is None:
+            self.jobs.set(job_id, future)
+            return
+
+        def finish(done):
+            try:
+                self.store.put(job_id, done.result())
+            except Exception as e:
+                logging.error(f"İş sonucu kaydedilemedi {job_id}: {e}")
+
+        self.store.put(job_id)
+        future.add_done_callback(finish)
+
+    def analyze(self, html_content, budget_ms: float) -> dict:
+        deadline = time.monotonic() + budget_ms / 1000
+        result, pending_links = phishing_analyze.run_offline_checks(html_content)
+        if not pending_links:
+            final = phishing_analyze.build_post_response(result.to_dict())
+            return {**final, "status": "complete"}
+
+        provisional = phishing_analyze.build_post_response(result.to_dict())
+        future = self._executor.submit(_enrich, result, pending_links)
+        try:
+            final = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            return {**final, "status": "complete"}
+        except TimeoutError:
+            job_id = uuid.uuid4().hex
+            self._track(job_id, future)
+            return {**provisional, "status": "provisional", "job_id": job_id}
+
+    def get(self, job_id: str):
+        """Return None for unknown jobs, else the job status and result."""
+        if self.store is not None:
+            found, final = self.store.get(job_id)
+            if not found:
+                return None
+            if final is None:
+                return {"status": "pending", "job_id": job_id}
+            return {**final, "status": "complete", "job_id": job_id}
+
+        future = self.jobs.get(job_id)
+        if future is None:
+            return None
+        if not future.done():
+            return {"status": "pending", "job_id": job_id}
+        return {**future.result(), "status": "complete", "job_id": job_id}
+
+
+_analyzer = None
+
+
+def get_deferred_analyzer() -> DeferredAnalyzer:
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = DeferredAnalyzer(store=JobStore() if JOB_STORE_PATH else None)
+    return _analyzer
@@ -0,0 +1,187 @@
+import datetime
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import metrics
+from domain_store import get_store
+from ttl_cache import TTLCache
+
+# Başarısız sorgular da önbelleğe alınır, ancak daha kısa süreliğine
+POSITIVE_TTL = float(os.getenv("WHOIS_CACHE_TTL", 7 * 24 * 3600))
+NEGATIVE_TTL = float(os.getenv("WHOIS_NEGATIVE_TTL", 3600))
+LOOKUP_TIMEOUT = float(os.getenv("WHOIS_LOOKUP_TIMEOUT", 5))
+MAX_WORKERS = int(os.getenv("WHOIS_MAX_WORKERS", 8))
+# Kuyrukta ve çalışmakta olan en fazla sorgu; aşılırsa yeni alan adları sorgulanmaz
+MAX_QUEUED = int(os.getenv("WHOIS_MAX_QUEUED", 1000))
+
+_NOT_FOUND = "not-found"
+
+
+def fetch_creation_date(domain: str):
+    # whois yalnızca önbellekte olmayan ilk sorguda yüklenir
+    import whois
+
+    domain_info = whois.whois(domain)
+    creation_datetime = domain_info.creation_date
+    if isinstance(creation_datetime, list):
+        creation_datetime = creation_datetime[0]
+    if not isinstance(creation_datetime, datetime.datetime):
+        return None
+    return creation_datetime
+
+
+class DomainAgeResolver:
+    """Resolves WHOIS creation dates concurrently with an LRU+TTL cache.
+
+    Failed lookups are cached too (negative caching), so a domain that
+    cannot be resolved is not queried again until ``negative_ttl`` passes.
+    A call waits at most ``timeout`` seconds in total. A lookup still
+    queued or running then is reported as None without being cached; it is
+    not cancelled, and its result is stored when it arrives. Concurrent
+    calls share the lookup of a domain, and at most ``max_queued`` lookups
+    are in flight; domains beyond that are reported as None and not queried.
+    When a ``store`` is given it is consulted after the in-process cache and
+    shared with the other worker processes.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKERS,
+        timeout: float = LOOKUP_TIMEOUT,
+        cache: TTLCache = None,
+        negative_ttl: float = NEGATIVE_TTL,
+        lookup=fetch_creation_date,
+        store=None,
+        max_queued: int = MAX_QUEUED,
+    ):
+        self.timeout = timeout
+        self.max_queued = max_queued
+        self.negative_ttl = negative_ttl
+        self.cache = cache if cache is not None else TTLCache(ttl=POSITIVE_TTL)
+        self._lookup = lookup
+        self.store = store
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="whois"
+        )
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    def _safe_lookup(self, domain: str):
+        metrics.EXTERNAL_CALLS.inc("whois")
+        try:
+            return self._lookup(domain)
+        except Exception as e:
+            metrics.EXTERNAL_ERRORS.inc("whois")
+            logging.error(f"Error fetching WHOIS data for {domain}: {e}")
+            return None
+
+    def _remember(self, domain: str, creation_datetime):
+        if creation_datetime is None:
+            self.cache.set(domain, _NOT_FOUND, ttl=self.negative_ttl)
+        else:
+            self.cache.set(domain, creation_datetime)
+
+    def _from_store(self, domain: str):
+        try:
+            return self.store.get_creation_date(domain)
+        except Exception as e:
+            logging.error(f"Domain store read failed for {domain}: {e}")
+            return False, None
+
+    def _to_store(self, domain: str, creation_datetime):
+        ttl = None if creation_datetime is not None else self.negative_ttl
+        try:
+            self.store.put_creation_date(domain, creation_datetime, ttl=ttl)
+        except Exception as e:
+            logging.error(f"Domain store write failed for {domain}: {e}")
+
+    def _save(self, domain: str, creation_datetime):
+        self._remember(domain, creation_datetime)
+        if self.store is not None:
+            self._to_store(domain, creation_datetime)
+
+    def _finished(self, domain: str):
+        def callback(future):
+            try:
+                if not future.cancelled():
+                    self._save(domain, future.result())
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(domain, None)
+
+        return callback
+
+    def _submit(self, domain: str):
+        """The in-flight lookup of ``domain``, started if needed; None when the queue is full."""
+        with self._inflight_lock:
+            future = self._inflight.get(domain)
+            if future is not None:
+                return future
+            if len(self._inflight) >= self.max_queued:
+                return None
+            future = self._inflight[domain] = self._executor.submit(self._safe_lookup, domain)
+        future.add_done_callback(self._finished(domain))
+        return future
+
+    def resolve_many(self, domains) -> dict:
+        """Return ``{domain: creation_datetime or None}`` for unique domains."""
+        deadline = time.monotonic() + self.timeout
+        results = {}
+        pending = {}
+
+        for domain in dict.fromkeys(d for d in domains if d):
+            cached = self.cache.get(domain)
+            if cached is not None:
+                results[domain] = None if cached == _NOT_FOUND else cached
+                continue
+
+            if self.store is not None:
+                found, creation_datetime = self._from_store(domain)
+                if found:
+                    results[domain] = creation_datetime
+                    self._remember(domain, creation_datetime)
+                    continue
+
+            future = self._submit(domain)
+            if future is None:
+                logging.error(f"WHOIS queue is full, skipping {domain}")
+                metrics.EXTERNAL_ERRORS.inc("whois")
+                results[domain] = None
+            else:
+                pending[future] = domain
+
+        if not pending:
+            return results
+
+        # Tek bir süre sınırı: kuyrukta bekleyen sorgu süreyi uzatmaz. Sonuçlar
+        # sorgu bitince önbelleğe yazılır, geç gelenler de dahil
+        done, not_done = wait(pending, timeout=max(deadline - time.monotonic(), 0))
+        for future in done:
+            results[pending[future]] = future.result()
+        for future in not_done:
+            logging.error(f"WHOIS lookup timed out for {pending[future]}")
+            results[pending[future]] = None
+
+        return results
+
+    def resolve(self, domain: str):
+        return self.resolve_many([domain]).get(domain)
+
+
+def domain_age_years(creation_datetime) -> float:
+    now = datetime.datetime.now(creation_datetime.tzinfo)
+    return (now - creation_datetime).days / 365
+
+
+_resolver = None
+
+
+def get_resolver() -> DomainAgeResolver:
+    global _resolver
+    if _resolver is None:
+        _resolver = DomainAgeResolver(store=get_store())
+        metrics.register_cache("whois", _resolver.cache)
+    return _resolver
@@ -0,0 +1,228 @@
+import argparse
+import csv
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# Depo isteğe bağlıdır; yalnızca açıkça bir dosya yolu verilince kullanılır
+STORE_PATH = os.getenv("PHISHING_DOMAIN_STORE", "")
+STORE_TTL = float(os.getenv("PHISHING_DOMAIN_STORE_TTL", 30 * 24 * 3600))
+
+# Tek sorgudaki değişken sayısı; eski SQLite sürümlerinin 999 sınırının altında
+_MAX_PARAMS = 900
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS domains (
+    domain TEXT PRIMARY KEY,
+    creation_date TEXT,
+    whois_expires_at REAL,
+    punycode TEXT,
+    lookalike_score REAL,
+    lookalike_version TEXT,
+    expires_at REAL
+)
+"""
+
+
+class DomainStore:
+    """SQLite backed domain reputation store shared by all worker processes.
+
+    The database runs in WAL mode so several gunicorn workers can read while
+    one writes. Each thread (and each forked process) opens its own
+    connection. WHOIS results and punycode/lookalike results expire
+    independently, ``ttl`` seconds after they were last written. A lookalike
+    score is stored with the version of the brand list and threshold it was
+    computed against and is ignored under any other version.
+    """
+
+    def __init__(self, path: str = STORE_PATH, ttl: float = STORE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._counter_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(domains)")}
+            if "lookalike_version" not in columns:
+                # Eski dosyalardaki skorların sürümü bilinmez, yeniden hesaplanır
+                conn.execute("ALTER TABLE domains ADD COLUMN lookalike_version TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, hit: bool):
+        with self._counter_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get_creation_date(self, domain: str):
+        """Return ``(found, creation_datetime)`` for a stored WHOIS result.
+
+        ``found`` is False when the domain was never checked or the row has
+        expired; a stored failure comes back as ``(True, None)``.
+        """
+        row = (
+            self._connect()
+            .execute(
+                "SELECT creation_date FROM domains "
+                "WHERE domain = ? AND whois_expires_at > ?",
+                (domain, time.time()),
+            )
+            .fetchone()
+        )
+        self._count(row is not None)
+        if row is None:
+            return False, None
+        if row[0] is None:
+            return True, None
+        return True, datetime.datetime.fromisoformat(row[0])
+
+    def put_creation_date(self, domain: str, creation_datetime, ttl: float = None):
+        value = creation_datetime.isoformat() if creation_datetime else None
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO domains (domain, creation_date, whois_expires_at) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT(domain) DO UPDATE SET creation_date = excluded.creation_date, "
+                "whois_expires_at = excluded.whois_expires_at",
+                (domain, value, expires_at),
+            )
+
+    def get_reputations(self, domains, version: str = None) -> dict:
+        """Return ``{domain: (punycode, lookalike_score)}`` for stored domains.
+
+        The score is None unless it was stored under ``version``.
+        """
+        domains = list(dict.fromkeys(d for d in domains if d))
+        if not domains:
+            return {}
+        rows = []
+        now = time.time()
+        # Zaman parametresi de sayılır
+        batch_size = _MAX_PARAMS - 1
+        for start in range(0, len(domains), batch_size):
+            batch = domains[start : start + batch_size]
+            placeholders = ",".join("?" * len(batch))
+            rows += (
+                self._connect()
+                .execute(
+                    f"SELECT domain, punycode, lookalike_score, lookalike_version FROM domains "
+                    f"WHERE domain IN ({placeholders}) AND punycode IS NOT NULL "
+                    f"AND expires_at > ?",
+                    (*batch, now),
+                )
+                .fetchall()
+            )
+        reputations = {
+            domain: (punycode, score if stored_version == version else None)
+            for domain, punycode, score, stored_version in rows
+        }
+        for domain in domains:
+            self._count(domain in reputations)
+        return reputations
+
+    def put_reputations(self, rows, version: str = None):
+        """Store ``(domain, punycode, lookalike_score)`` rows in one transaction."""
+        expires_at = time.time() + self.ttl
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO domains (domain, punycode, lookalike_score, lookalike_version, expires_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(domain) DO UPDATE SET punycode = excluded.punycode, "
+                "lookalike_score = COALESCE(excluded.lookalike_score, lookalike_score), "
+                "lookalike_version = CASE WHEN excluded.lookalike_score IS NULL "
+                "THEN lookalike_version ELSE excluded.lookalike_version END, "
+                "expires_at = excluded.expires_at",
+                [
+                    (domain, punycode, score, version if score is not None else None, expires_at)
+                    for domain, punycode, score in rows
+                ],
+            )
+
+    def warm_up(self, seed_path: str) -> int:
+        """Bulk load a CSV seed file.
+
+        Columns: ``domain,creation_date[,punycode,lookalike_score,lookalike_version]``;
+        empty cells are stored as NULL. A score without a version is never used.
+        """
+        expires_at = time.time() + self.ttl
+        with open(seed_path, newline="", encoding="utf-8") as f:
+            rows = [
+                (
+                    row["domain"].strip(),
+                    row.get("creation_date") or None,
+                    expires_at if row.get("creation_date") else None,
+                    row.get("punycode") or None,
+                    float(row["lookalike_score"]) if row.get("lookalike_score") else None,
+                    row.get("lookalike_version") or None,
+                    expires_at if row.get("punycode") else None,
+                )
+                for row in csv.DictReader(f)
+                if row.get("domain")
+            ]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO domains (domain, creation_date, whois_expires_at, "
+                "punycode, lookalike_score, lookalike_version, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        logging.info(f"{len(rows)} domain kaydı yüklendi: {seed_path}")
+        return len(rows)
+
+    def purge_expired(self) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM domains WHERE COALESCE(whois_expires_at, 0) <= ?1 "
+                "AND COALESCE(expires_at, 0) <= ?1",
+                (time.time(),),
+            )
+        return cursor.rowcount
+
+    def stats(self) -> dict:
+        size = self._connect().execute("SELECT COUNT(*) FROM domains").fetchone()[0]
+        return {"size": size, "hits": self.hits, "misses": self.misses}
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None and STORE_PATH:
+        _store = DomainStore()
+    return _store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Domain reputation store")
+    parser.add_argument("command", choices=["warm", "purge", "stats"])
+    parser.add_argument("seed", nargs="?", help="warm komutu için CSV dosyası")
+    parser.add_argument("--path", default=STORE_PATH, help="varsayılan: PHISHING_DOMAIN_STORE")
+    args = parser.parse_args()
+    if not args.path:
+        parser.error("depo dosyası --path ya da PHISHING_DOMAIN_STORE ile verilmeli")
+
+    store = DomainStore(args.path)
+    if args.command == "warm":
+        if not args.seed:
+            parser.error("warm komutu bir seed dosyası gerektirir")
+        print(f"Yüklenen kayıt: {store.warm_up(args.seed)}")
+    elif args.command == "purge":
+        print(f"Silinen kayıt: {store.purge_expired()}")
+    print(store.stats())
@@ -0,0 +1,45 @@
+import multiprocessing
+import os
+import tempfile
+
+import startup
+
+bind = os.getenv("PHISHING_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("PHISHING_WEB_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("PHISHING_WEB_THREADS", 4))
+timeout = int(os.getenv("PHISHING_WEB_TIMEOUT", 60))
+
+# Uygulama ana süreçte bir kez yüklenir, işçiler kopyala-yaz ile paylaşır
+preload_app = True
+# İşçiler belirli sayıda istekten sonra yenilenir; yenileme ucuz, modeller hazır
+max_requests = int(os.getenv("PHISHING_WEB_MAX_REQUESTS", 5000))
+max_requests_jitter = max_requests // 10
+
+# Ertelenen işlerin sonucu hangi işçiye sorulursa sorulsun bulunsun diye
+# birden çok işçide paylaşılan iş deposu zorunludur; verilmezse bu sunucu
+# için geçici dizinde bir dosya kullanılır
+if workers > 1:
+    os.environ.setdefault(
+        "PHISHING_JOB_STORE",
+        os.path.join(tempfile.gettempdir(), f"phishing_jobs_{os.getpid()}.sqlite3"),
+    )
+    # /metrics hangi işçi yanıtlarsa yanıtlasın tüm süreçlerin toplamını
+    # dönsün diye her süreç ölçümlerini ortak dizine yazar
+    os.environ.setdefault(
+        "PHISHING_METRICS_DIR",
+        os.path.join(tempfile.gettempdir(), f"phishing_metrics_{os.getpid()}"),
+    )
+
+
+def on_starting(server):
+    import metrics
+
+    metrics.clear_snapshots()
+    report = startup.preload()
+    server.log.info(f"Ön yükleme raporu: {report}")
+
+
+def post_fork(server, worker):
+    # Ana süreçte oluşmuş havuz/oturum tekilleri işçiye taşınmasın
+    startup.reset_worker_state()
+    server.log.info(f"İşçi {worker.pid} hazır, modeller paylaşılıyor")
@@ -0,0 +1,190 @@
+import os
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+try:
+    from lxml import etree
+except ImportError:  # lxml opsiyonel, yoksa html.parser kullanılır
+    etree = None
+
+HTML_BACKEND = os.getenv("PHISHING_HTML_BACKEND", "html.parser")
+
+# get_text() gibi script/style içeriği düz metne katılmaz
+_NON_TEXT_TAGS = frozenset(("script", "style", "template"))
+
+
+@dataclass(slots=True)
+class HtmlFeatures:
+    links: list = field(default_factory=list)
+    forms: list = field(default_factory=list)
+    table_inputs: list = field(default_factory=list)
+    images: list = field(default_factory=list)
+    iframes: list = field(default_factory=list)
+    scripts: list = field(default_factory=list)
+    text_parts: list = field(default_factory=list)
+    has_body: bool = False
+
+    @property
+    def body_text(self) -> str:
+        return " ".join(self.text_parts)
+
+
+@dataclass(slots=True)
+class FormFeature:
+    action: str = None
+    inputs: list = field(default_factory=list)
+
+
+class FeatureCollector:
+    """Parser target collecting every feature the analyzer needs in one sweep.
+
+    Implements the ``start``/``end``/``data``/``close`` target interface of
+    ``lxml.etree.HTMLParser`` and is driven by :class:`_StdlibFeatureParser`
+    for the standard library backend.
+    """
+
+    def __init__(self):
+        self.features = HtmlFeatures()
+        self._open_forms = []
+        self._body_depth = 0
+        self._non_text_depth = 0
+        self._table_depth = 0
+        self._table_seen = False
+        self._script_parts = None
+        # Ayrıştırıcı bir metin düğümünü parça parça verebilir (ör. besleme
+        # sınırında); parçalar düğüm bitene kadar birleştirilir
+        self._text_node = []
+
+    def _flush_text(self):
+        if self._text_node:
+            self.features.text_parts.append("".join(self._text_node))
+            self._text_node = []
+
+    def start(self, tag, attrs):
+        self._flush_text()
+        tag = tag.lower()
+        features = self.features
+
+        if tag == "a":
+            if "href" in attrs:
+                features.links.append(attrs["href"] or "")
+        elif tag == "input":
+            input_tag = (
+                (attrs.get("type") or "").lower(),
+                (attrs.get("name") or "").lower(),
+            )
+            for form in self._open_forms:
+                form.inputs.append(input_tag)
+            if self._table_depth:
+                features.table_inputs.append(input_tag)
+        elif tag == "form":
+            form = FormFeature(action=attrs.get("action"))
+            features.forms.append(form)
+            self._open_forms.append(form)
+        elif tag == "img":
+            features.images.append((attrs.get("src"), attrs.get("alt") or ""))
+        elif tag == "iframe":
+            features.iframes.append(attrs.get("src"))
+        elif tag == "table":
+            # Eski davranış gibi yalnızca ilk tablo incelenir
+            if self._table_depth or not self._table_seen:
+                self._table_depth += 1
+                self._table_seen = True
+        elif tag == "body":
+            features.has_body = True
+            self._body_depth += 1
+
+        if tag in _NON_TEXT_TAGS:
+            self._non_text_depth += 1
+            if tag == "script":
+                self._script_parts = []
+
+    def end(self, tag):
+        self._flush_text()
+        tag = tag.lower()
+        if tag == "form":
+            if self._open_forms:
+                self._open_forms.pop()
+        elif tag == "table":
+            if self._table_depth:
+                self._table_depth -= 1
+        elif tag == "body":
+            if self._body_depth:
+                self._body_depth -= 1
+
+        if tag in _NON_TEXT_TAGS and self._non_text_depth:
+            self._non_text_depth -= 1
+            if tag == "script" and self._script_parts is not None:
+                self.features.scripts.append("".join(self._script_parts))
+                self._script_parts = None
+
+    def data(self, data):
+        if self._script_parts is not None:
+            self._script_parts.append(data)
+        elif self._body_depth and not self._non_text_depth:
+            self._text_node.append(data)
+
+    def comment(self, text):
+        self._flush_text()
+
+    def close(self):
+        self._flush_text()
+        # Kapatılmamış script etiketi
+        if self._script_parts is not None:
+            self.features.scripts.append("".join(self._script_parts))
+            self._script_parts = None
+        return self.features
+
+
+class _StdlibFeatureParser(HTMLParser):
+    def __init__(self, collector: FeatureCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, {name: value or "" for name, value in attrs})
+
+    def handle_startendtag(self, tag, attrs):
+        self.collector.start(tag, {name: value or "" for name, value in attrs})
+        self.collector.end(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+    def handle_comment(self, data):
+        self.collector.comment(data)
+
+
+def iter_chunks(html_content: str, chunk_size: int = 64 * 1024):
+    for start in range(0, len(html_content), chunk_size):
+        yield html_content[start : start + chunk_size]
+
+
+def extract_features(html_content, backend: str = None) -> HtmlFeatures:
+    """Collect links, forms, inputs, images, iframes, scripts and body text.
+
+    ``html_content`` is either a string or an iterable of string chunks; the
+    document is tokenized once and never materialized as a tree.
+    """
+    backend = backend or HTML_BACKEND
+    chunks = iter_chunks(html_content) if isinstance(html_content, str) else html_content
+    collector = FeatureCollector()
+
+    if backend == "lxml" and etree is not None:
+        parser = etree.HTMLParser(target=collector)
+        try:
+            for chunk in chunks:
+                parser.feed(chunk)
+            return parser.close()
+        except etree.XMLSyntaxError:
+            # Boş ya da bozuk belge, toplananlarla devam et
+            return collector.close()
+
+    parser = _StdlibFeatureParser(collector)
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return collector.close()
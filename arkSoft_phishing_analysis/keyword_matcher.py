@@ -0,0 +1,98 @@
+from collections import deque
+
+# Türkçe büyük/küçük harf dönüşümü: "İ" -> "i", "I" -> "ı"
+TURKISH_CASEFOLD = str.maketrans({"İ": "i", "I": "ı"})
+
+
+def turkish_lower(text: str) -> str:
+    translated = text.translate(TURKISH_CASEFOLD)
+    lowered = translated.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # Bazı karakterler lower() ile uzuyor, indeksleri korumak için tek tek çevir
+    return "".join(
+        char.lower() if len(char.lower()) == 1 else char for char in translated
+    )
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a fixed keyword list.
+
+    Built once, then every scan is a single linear pass over the text.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = [turkish_lower(keyword) for keyword in keywords if keyword]
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [False]
+
+        for keyword in self.keywords:
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(False)
+                state = next_state
+            self._output[state] = True
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                if self._output[self._fail[next_state]]:
+                    self._output[next_state] = True
+
+    def _step(self, state, char):
+        goto = self._goto
+        while state and char not in goto[state]:
+            state = self._fail[state]
+        return goto[state].get(char, 0)
+
+    def contains_any(self, text: str) -> bool:
+        state = 0
+        output = self._output
+        for char in turkish_lower(text):
+            state = self._step(state, char)
+            if output[state]:
+                return True
+        return False
+
+    def matching_words(self, text: str) -> list:
+        """Return the whitespace separated words of ``text`` containing a keyword.
+
+        Words are returned in their original form, once per occurrence.
+        """
+        words = []
+        output = self._output
+        state = 0
+        word_start = None
+        word_hit = False
+
+        for index, char in enumerate(turkish_lower(text)):
+            if char.isspace():
+                if word_hit:
+                    words.append(text[word_start:index])
+                word_start = None
+                word_hit = False
+                state = 0
+                continue
+
+            if word_start is None:
+                word_start = index
+            state = self._step(state, char)
+            if output[state]:
+                word_hit = True
+
+        if word_hit:
+            words.append(text[word_start:])
+        return words
@@ -0,0 +1,122 @@
+import hashlib
+import math
+from collections import Counter, defaultdict
+
+import Levenshtein
+
+LOOKALIKE_THRESHOLD = 0.60
+
+
+def _char_tokens(text: str) -> list:
+    # Çoklu küme kesişimi için her karakter geçiş sırasıyla ayrı bir belirteç
+    seen = Counter()
+    tokens = []
+    for char in text:
+        seen[char] += 1
+        tokens.append((char, seen[char]))
+    return tokens
+
+
+def load_brand_list(path: str) -> list:
+    """Read one brand per line; blank lines and ``#`` comments are skipped."""
+    with open(path, encoding="utf-8") as f:
+        return [
+            line.strip().lower()
+            for line in f
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
+class LookalikeIndex:
+    """Finds every brand whose ``Levenshtein.ratio`` to a domain reaches a threshold.
+
+    ``Levenshtein.ratio`` is ``2 * LCS / (la + lb)``, so a brand of length
+    ``lb`` can only match when ``|la - lb| <= (1 - t) * (la + lb)`` and when
+    it shares at least ``o = ceil(t * (la + lb) / 2)`` characters with the
+    domain. Brands are bucketed by length and indexed by character
+    occurrence; for each eligible length only the brands containing one of
+    the ``la - o + 1`` rarest domain characters are verified (prefix
+    filtering), instead of the whole list.
+    """
+
+    def __init__(self, brands=(), threshold: float = LOOKALIKE_THRESHOLD):
+        self.threshold = threshold
+        self.brands = []
+        self._brand_ids = {}
+        self._by_length = defaultdict(list)
+        self._postings = defaultdict(lambda: defaultdict(list))
+        self._token_counts = Counter()
+        self._version = None
+        self.add_many(brands)
+
+    def __len__(self):
+        return len(self.brands)
+
+    @property
+    def version(self) -> str:
+        """Digest of the brand list and threshold; stored scores are only valid for it."""
+        if self._version is None:
+            digest = hashlib.sha256(repr(self.threshold).encode())
+            for brand in sorted(self.brands):
+                digest.update(b"\0" + brand.encode("utf-8"))
+            self._version = digest.hexdigest()[:16]
+        return self._version
+
+    def add(self, brand: str):
+        if not brand or brand in self._brand_ids:
+            return
+        self._version = None
+        brand_id = len(self.brands)
+        self.brands.append(brand)
+        self._brand_ids[brand] = brand_id
+        self._by_length[len(brand)].append(brand_id)
+        for token in _char_tokens(brand):
+            self._postings[token][len(brand)].append(brand_id)
+            self._token_counts[token] += 1
+
+    def add_many(self, brands):
+        for brand in brands:
+            self.add(brand)
+
+    def _length_range(self, length: int, threshold: float):
+        if threshold <= 0:
+            return 0, math.inf
+        low = math.ceil(length * threshold / (2 - threshold) - 1e-9)
+        high = math.floor(length * (2 - threshold) / threshold + 1e-9)
+        return low, high
+
+    def _candidates(self, domain: str, threshold: float):
+        low, high = self._length_range(len(domain), threshold)
+        tokens = sorted(_char_tokens(domain), key=self._token_counts.__getitem__)
+
+        for length, brand_ids in self._by_length.items():
+            if not low <= length <= high:
+                continue
+            min_shared = math.ceil(threshold * (len(domain) + length) / 2 - 1e-9)
+            prefix_size = len(domain) - min_shared + 1
+            if min_shared <= 0 or prefix_size >= len(tokens):
+                yield from brand_ids
+                continue
+
+            candidates = set()
+            for token in tokens[:prefix_size]:
+                postings = self._postings.get(token)
+                if postings:
+                    candidates.update(postings.get(length, ()))
+            yield from candidates
+
+    def search(self, domain: str, threshold: float = None) -> list:
+        """Return ``[(brand, score), ...]`` at or above ``threshold``, best first."""
+        threshold = self.threshold if threshold is None else threshold
+        matches = []
+        for brand_id in self._candidates(domain, threshold):
+            brand = self.brands[brand_id]
+            score = Levenshtein.ratio(domain, brand)
+            if score >= threshold:
+                matches.append((brand, score))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def best_match(self, domain: str, threshold: float = None):
+        matches = self.search(domain, threshold)
+        return matches[0] if matches else None
@@ -0,0 +1,451 @@
+import atexit
+import bisect
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Saniye cinsinden aşama süreleri için kova sınırları
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Birden çok işçi süreçte her süreç ölçümlerini bu dizine yazar ve /metrics
+# tüm süreçlerin toplamını döner; boşsa yalnızca yanıtlayan süreç raporlanır
+METRICS_DIR = os.getenv("PHISHING_METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.getenv("PHISHING_METRICS_FLUSH_INTERVAL", 5))
+
+# Etkin isteğin aşama süreleri, yalnızca istenirse toplanır
+_request_timings = ContextVar("request_timings", default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        _ensure_flusher()
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def reset(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def add(self, labels: tuple, value):
+        self.inc(*labels, amount=value)
+
+    def _swap(self, values: dict) -> dict:
+        with self._lock:
+            values, self._values = self._values, values
+        return values
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(labels), value] for labels, value in self._values.items()]
+
+    @staticmethod
+    def merge(snapshots) -> dict:
+        totals = {}
+        for snapshot in snapshots:
+            for labels, value in snapshot:
+                labels = tuple(labels)
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def render(self, values: dict = None) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        if values is None:
+            values = self.merge([self.snapshot()])
+        for labels, value in sorted(values.items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # Etiket başına [kova sayıları..., toplam, adet]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        _ensure_flusher()
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return series[-1] if series else 0
+
+    def reset(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def add(self, labels: tuple, series: list):
+        """Add a series recorded elsewhere (see :func:`apply_changes`)."""
+        _ensure_flusher()
+        with self._lock:
+            current = self._series.get(labels)
+            self._series[labels] = (
+                list(series) if current is None else [a + b for a, b in zip(current, series)]
+            )
+
+    def _swap(self, series: dict) -> dict:
+        with self._lock:
+            series, self._series = self._series, series
+        return series
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(labels), list(series)] for labels, series in self._series.items()]
+
+    @staticmethod
+    def merge(snapshots) -> dict:
+        totals = {}
+        for snapshot in snapshots:
+            for labels, series in snapshot:
+                labels = tuple(labels)
+                total = totals.get(labels)
+                totals[labels] = series if total is None else [a + b for a, b in zip(total, series)]
+        return totals
+
+    def render(self, series_by_labels: dict = None) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        if series_by_labels is None:
+            series_by_labels = self.merge([self.snapshot()])
+        items = sorted(series_by_labels.items())
+        bucket_names = self.labelnames + ("le",)
+        for labels, series in items:
+            cumulative = 0
+            for bound, observed in zip(self.buckets, series):
+                cumulative += observed
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(bucket_names, labels + (_format_value(bound),))} {cumulative}"
+                )
+            lines.append(
+                f"{self.name}_bucket{_format_labels(bucket_names, labels + ('+Inf',))} {series[-1]}"
+            )
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{suffix} {series[-1]}")
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    "phishing_stage_seconds", "Time spent in each analysis stage.", ("stage",)
+)
+EXTERNAL_CALLS = Counter(
+    "phishing_external_calls_total", "Calls to external services.", ("service",)
+)
+EXTERNAL_ERRORS = Counter(
+    "phishing_external_errors_total", "Failed calls to external services.", ("service",)
+)
+DOCUMENTS = Counter("phishing_documents_total", "Analyzed documents.")
+DOCUMENT_BYTES = Histogram(
+    "phishing_document_bytes", "Size of analyzed HTML documents.", buckets=SIZE_BUCKETS
+)
+PREFILTER_DOCUMENTS = Counter(
+    "phishing_prefilter_documents_total",
+    "Documents by pre-screen outcome (skipped or analyzed).",
+    ("outcome",),
+)
+PREFILTER_SIGNALS = Counter(
+    "phishing_prefilter_signals_total",
+    "First pre-screen signal that sent a document to full analysis.",
+    ("signal",),
+)
+
+_metrics = [
+    STAGE_SECONDS,
+    EXTERNAL_CALLS,
+    EXTERNAL_ERRORS,
+    DOCUMENTS,
+    DOCUMENT_BYTES,
+    PREFILTER_DOCUMENTS,
+    PREFILTER_SIGNALS,
+]
+_caches = {}
+
+
+def prefilter_skip_ratio(values: dict = None) -> float:
+    values = PREFILTER_DOCUMENTS._values if values is None else values
+    skipped = values.get(("skipped",), 0)
+    total = skipped + values.get(("analyzed",), 0)
+    return skipped / total if total else 0.0
+
+
+def register_cache(name: str, cache):
+    """Report the hit/miss counters of a TTLCache under ``name``."""
+    _caches[name] = cache
+
+
+def observe_document(html_content):
+    DOCUMENTS.inc()
+    DOCUMENT_BYTES.observe(len(html_content.encode("utf-8", "replace")))
+
+
+def _record(stage: str, elapsed: float):
+    STAGE_SECONDS.observe(elapsed, stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+class StageTimer:
+    """Times consecutive stages: each :meth:`mark` closes the stage since the last one."""
+
+    __slots__ = ("_last",)
+
+    def __init__(self):
+        self._last = time.perf_counter()
+
+    def mark(self, stage: str):
+        now = time.perf_counter()
+        _record(stage, now - self._last)
+        self._last = now
+
+
+@contextmanager
+def timed(stage: str):
+    """Record the duration of ``stage`` in the histogram and the request breakdown."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(stage, time.perf_counter() - started)
+
+
+@contextmanager
+def recorded_changes():
+    """Move what the block records out of this process into the yielded dict.
+
+    Meant for process pool workers: the dict is returned with the result and
+    :func:`apply_changes` records it in the parent, so the values reach
+    ``/metrics`` once and the request breakdown gets the stage timings.
+    """
+    saved = {metric.name: metric._swap({}) for metric in _metrics}
+    changes = {}
+    try:
+        yield changes
+    finally:
+        for metric in _metrics:
+            snapshot = metric.snapshot()
+            if snapshot:
+                changes[metric.name] = snapshot
+            metric._swap(saved[metric.name])
+
+
+def apply_changes(changes: dict):
+    """Record values collected by :func:`recorded_changes` in another process."""
+    timings = _request_timings.get()
+    for metric in _metrics:
+        for labels, value in changes.get(metric.name, ()):
+            metric.add(tuple(labels), value)
+            if metric is STAGE_SECONDS and timings is not None:
+                stage = labels[0]
+                timings[stage] = timings.get(stage, 0.0) + value[-2]
+
+
+@contextmanager
+def collect_timings():
+    """Collect the stage durations of the current request, in milliseconds."""
+    timings = {}
+    token = _request_timings.set(timings)
+    breakdown = {}
+    try:
+        yield breakdown
+    finally:
+        _request_timings.reset(token)
+        breakdown.update(
+            (stage, round(seconds * 1000, 3)) for stage, seconds in timings.items()
+        )
+
+
+def _snapshot() -> dict:
+    return {
+        "pid": os.getpid(),
+        "metrics": {metric.name: metric.snapshot() for metric in _metrics},
+        "caches": {name: cache.stats() for name, cache in _caches.items()},
+    }
+
+
+def _snapshot_path(pid: int) -> str:
+    return os.path.join(METRICS_DIR, f"metrics_{pid}.json")
+
+
+def flush():
+    """Write this process's values to ``METRICS_DIR`` for the other processes to merge."""
+    if not METRICS_DIR:
+        return
+    path = _snapshot_path(os.getpid())
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(_snapshot(), f)
+        os.replace(f"{path}.tmp", path)
+    except OSError as e:
+        logging.error(f"Ölçümler yazılamadı {path}: {e}")
+
+
+def clear_snapshots():
+    """Create ``METRICS_DIR`` and drop the values left by a previous server run."""
+    if not METRICS_DIR:
+        return
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    for path in glob.glob(os.path.join(METRICS_DIR, "metrics_*.json*")):
+        os.remove(path)
+
+
+_flusher_started = False
+_flusher_lock = threading.Lock()
+
+
+def _flush_loop():
+    while True:
+        time.sleep(METRICS_FLUSH_INTERVAL)
+        flush()
+
+
+def _ensure_flusher():
+    # Her süreç ilk ölçümünde kendi yazıcı iş parçacığını başlatır
+    global _flusher_started
+    if _flusher_started or not METRICS_DIR:
+        return
+    with _flusher_lock:
+        if _flusher_started:
+            return
+        _flusher_started = True
+        threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True).start()
+        atexit.register(flush)
+
+
+def _after_fork_in_child():
+    # Çatallanan süreç ebeveynin değerleriyle başlarsa toplamda iki kez sayılır;
+    # önbellekler de tekilleri yeniden oluşturulunca tekrar kaydedilir
+    global _flusher_started, _flusher_lock
+    _flusher_started = False
+    _flusher_lock = threading.Lock()
+    for metric in _metrics:
+        metric.reset()
+    _caches.clear()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_snapshots() -> list:
+    if not METRICS_DIR:
+        return [_snapshot()]
+    flush()
+    snapshots = []
+    for path in glob.glob(os.path.join(METRICS_DIR, "metrics_*.json")):
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError) as e:
+            logging.error(f"Ölçüm dosyası okunamadı {path}: {e}")
+    return snapshots
+
+
+def _render_caches(snapshots) -> list:
+    lines = []
+    for metric, documentation, field in (
+        ("phishing_cache_hits_total", "Cache hits.", "hits"),
+        ("phishing_cache_misses_total", "Cache misses.", "misses"),
+        ("phishing_cache_entries", "Entries currently cached.", "size"),
+    ):
+        kind = "gauge" if field == "size" else "counter"
+        lines += [f"# HELP {metric} {documentation}", f"# TYPE {metric} {kind}"]
+        totals = {}
+        for snapshot in snapshots:
+            # Sonlanmış süreçlerin sayaçları toplamda kalır, girdileri kalmaz
+            if kind == "gauge" and not _is_alive(snapshot["pid"]):
+                continue
+            for name, stats in snapshot["caches"].items():
+                totals[name] = totals.get(name, 0) + stats[field]
+        for name, value in sorted(totals.items()):
+            lines.append(f"{metric}{_format_labels(('cache',), (name,))} {value}")
+    return lines
+
+
+def render() -> str:
+    """Prometheus text exposition format (version 0.0.4).
+
+    With ``METRICS_DIR`` set, every process (web workers, batch and parse
+    pool workers) writes its values there and a scrape reports their sum,
+    whichever worker answers; counters of exited processes stay in the sum
+    so totals never go backwards. Without it only the answering process is
+    reported, identified by ``phishing_worker_info``.
+    """
+    snapshots = _read_snapshots()
+    lines = [
+        "# HELP phishing_worker_info Process that answered this scrape.",
+        "# TYPE phishing_worker_info gauge",
+        f'phishing_worker_info{_format_labels(("pid",), (os.getpid(),))} 1',
+        "# HELP phishing_metric_processes Processes whose values this scrape sums.",
+        "# TYPE phishing_metric_processes gauge",
+        f"phishing_metric_processes {len(snapshots)}",
+    ]
+    merged = {}
+    for metric in _metrics:
+        merged[metric.name] = metric.merge(
+            snapshot["metrics"].get(metric.name, []) for snapshot in snapshots
+        )
+        lines += metric.render(merged[metric.name])
+    lines += [
+        "# HELP phishing_prefilter_skip_ratio Share of documents answered by the pre-screen.",
+        "# TYPE phishing_prefilter_skip_ratio gauge",
+        f"phishing_prefilter_skip_ratio {_format_value(prefilter_skip_ratio(merged[PREFILTER_DOCUMENTS.name]))}",
+    ]
+    lines += _render_caches(snapshots)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,263 @@
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import metrics
+from ttl_cache import TTLCache
+
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", 2))
+OCR_TIMEOUT = float(os.getenv("OCR_TIMEOUT", 30))
+# Süresini aşan iş bu kadar sonra hâlâ sürüyorsa işçiler öldürülür, havuz yenilenir
+OCR_KILL_GRACE = float(os.getenv("OCR_KILL_GRACE", 5))
+OCR_MAX_PIXELS = int(os.getenv("OCR_MAX_PIXELS", 2_000_000))
+OCR_CACHE_SIZE = int(os.getenv("OCR_CACHE_SIZE", 2048))
+OCR_CACHE_TTL = float(os.getenv("OCR_CACHE_TTL", 24 * 3600))
+# 0 kapalı; >0 ise bu kadar bit farkına kadar benzer görseller aynı sayılır
+OCR_PHASH_DISTANCE = int(os.getenv("OCR_PHASH_DISTANCE", 0))
+OCR_LANG = os.getenv("OCR_LANG", "tur")
+
+
+def normalize_image(image_bytes: bytes, max_pixels: int = OCR_MAX_PIXELS):
+    """Open, grayscale and downscale an image to at most ``max_pixels``."""
+    from PIL import Image
+
+    img = Image.open(BytesIO(image_bytes))
+    img.draft("L", (4096, 4096))
+    img = img.convert("L")
+    pixels = img.width * img.height
+    if pixels > max_pixels:
+        scale = (max_pixels / pixels) ** 0.5
+        size = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+        img = img.resize(size, Image.LANCZOS)
+    return img
+
+
+def difference_hash(img, hash_size: int = 8) -> int:
+    """64 bit dHash of an already normalized grayscale image."""
+    from PIL import Image
+
+    small = img.resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+class _HashIndex:
+    """Finds stored 64 bit hashes within a Hamming distance without a full scan.
+
+    Hashes are split into ``distance + 1`` bands; two hashes that differ in
+    at most ``distance`` bits agree on at least one band (pigeonhole), so
+    only the hashes sharing a band value with the query are compared.
+    """
+
+    def __init__(self, distance: int, bits: int = 64):
+        self.distance = distance
+        bands = min(distance + 1, bits)
+        width, extra = divmod(bits, bands)
+        self._bands = []
+        shift = bits
+        for band in range(bands):
+            size = width + (band < extra)
+            shift -= size
+            self._bands.append((shift, (1 << size) - 1))
+        self._buckets = [{} for _ in self._bands]
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, value: int):
+        added = False
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            bucket = buckets.setdefault((value >> shift) & mask, set())
+            if value not in bucket:
+                bucket.add(value)
+                added = True
+        self._size += added
+
+    def discard(self, value: int):
+        removed = False
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            key = (value >> shift) & mask
+            bucket = buckets.get(key)
+            if bucket is not None and value in bucket:
+                bucket.discard(value)
+                removed = True
+                if not bucket:
+                    del buckets[key]
+        self._size -= removed
+
+    def near(self, value: int) -> list:
+        """Stored hashes within ``distance`` bits of ``value``, closest first."""
+        candidates = set()
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            candidates.update(buckets.get((value >> shift) & mask, ()))
+        matches = [
+            (bin(candidate ^ value).count("1"), candidate) for candidate in candidates
+        ]
+        return [candidate for distance, candidate in sorted(matches) if distance <= self.distance]
+
+
+def _ocr_worker(image_bytes: bytes, max_pixels: int, lang: str, timeout: float = 0) -> str:
+    import pytesseract
+
+    try:
+        img = normalize_image(image_bytes, max_pixels)
+        # tesseract alt süreci süresini aşarsa pytesseract onu sonlandırır
+        return pytesseract.image_to_string(img, lang=lang, timeout=timeout)
+    except Exception as e:
+        # pytesseract hataları her zaman pickle edilemiyor, havuzu bozmasın
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+
+
+class OcrPool:
+    """Bounded pool of tesseract worker processes with a result cache.
+
+    Results are cached by the SHA-256 of the image bytes. With
+    ``phash_distance`` > 0 the dHash of each image is kept as well, and an
+    image within that Hamming distance of a cached one reuses its text;
+    the hashes are indexed by band so a lookup does not scan the cache.
+
+    tesseract is given ``timeout`` seconds inside the worker. A job still
+    running ``kill_grace`` seconds after its caller gave up (e.g. stuck
+    decoding the image) gets its workers killed and the pool replaced, so
+    a slow image cannot hold a worker forever.
+    """
+
+    def __init__(
+        self,
+        workers: int = OCR_WORKERS,
+        timeout: float = OCR_TIMEOUT,
+        max_pixels: int = OCR_MAX_PIXELS,
+        phash_distance: int = OCR_PHASH_DISTANCE,
+        lang: str = OCR_LANG,
+        kill_grace: float = OCR_KILL_GRACE,
+    ):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pixels = max_pixels
+        self.phash_distance = phash_distance
+        self.lang = lang
+        self.kill_grace = kill_grace
+        self.cache = TTLCache(maxsize=OCR_CACHE_SIZE, ttl=OCR_CACHE_TTL)
+        self.phash_cache = TTLCache(maxsize=OCR_CACHE_SIZE, ttl=OCR_CACHE_TTL)
+        self._hash_index = _HashIndex(phash_distance) if phash_distance else None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _recycle(self, executor: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _kill_if_running(self, executor: ProcessPoolExecutor, future):
+        def check():
+            if not future.done():
+                logging.error("OCR işçisi süresini aştı, havuz yenileniyor")
+                self._recycle(executor)
+
+        timer = threading.Timer(self.kill_grace, check)
+        timer.daemon = True
+        timer.start()
+
+    def _remember_hash(self, phash: int, text: str):
+        self.phash_cache.set(phash, text)
+        with self._lock:
+            self._hash_index.add(phash)
+            # Önbellekten düşen özetler dizinde birikmesin
+            if len(self._hash_index) > 2 * self.phash_cache.maxsize:
+                live = set(self.phash_cache.keys())
+                self._hash_index = _HashIndex(self.phash_distance)
+                for value in live:
+                    self._hash_index.add(value)
+
+    def _near_duplicate(self, image_bytes: bytes):
+        try:
+            phash = difference_hash(normalize_image(image_bytes, self.max_pixels))
+        except Exception as e:
+            logging.error(f"Görsel özeti hesaplanamadı: {e}")
+            return None, None
+
+        with self._lock:
+            candidates = self._hash_index.near(phash)
+        for cached_hash in candidates:
+            text = self.phash_cache.get(cached_hash)
+            if text is not None:
+                return phash, text
+            with self._lock:
+                self._hash_index.discard(cached_hash)
+        return phash, None
+
+    def image_to_string(self, image_bytes: bytes):
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        text = self.cache.get(digest)
+        if text is not None:
+            return text
+
+        phash = None
+        if self.phash_distance:
+            phash, text = self._near_duplicate(image_bytes)
+            if text is not None:
+                self.cache.set(digest, text)
+                return text
+
+        metrics.EXTERNAL_CALLS.inc("ocr")
+        executor = self._get_executor()
+        future = executor.submit(
+            _ocr_worker, image_bytes, self.max_pixels, self.lang, self.timeout
+        )
+        try:
+            text = future.result(timeout=self.timeout)
+        except TimeoutError:
+            # Kuyruktaki iş iptal edilir; çalışan iş durdurulamaz, süreyi
+            # aşmaya devam ederse işçiler öldürülür
+            if not future.cancel():
+                self._kill_if_running(executor, future)
+            metrics.EXTERNAL_ERRORS.inc("ocr")
+            logging.error("OCR zaman aşımına uğradı")
+            return None
+        except BrokenProcessPool:
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            metrics.EXTERNAL_ERRORS.inc("ocr")
+            logging.error("OCR işçi havuzu yeniden başlatılıyor")
+            return None
+        except Exception as e:
+            metrics.EXTERNAL_ERRORS.inc("ocr")
+            logging.error(f"Resim işleme hatası: {e}")
+            return None
+
+        self.cache.set(digest, text)
+        if phash is not None:
+            self._remember_hash(phash, text)
+        return text
+
+
+_pool = None
+
+
+def get_ocr_pool() -> OcrPool:
+    global _pool
+    if _pool is None:
+        _pool = OcrPool()
+        metrics.register_cache("ocr", _pool.cache)
+    return _pool
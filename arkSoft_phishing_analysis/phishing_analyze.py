@@ -1,34 +1,63 @@
-import datetime
-import whois
 import re
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
-import Levenshtein
 import logging
+import os
+import threading
 import idna
-import requests
-import pytesseract
-from PIL import Image
 from io import BytesIO
-import base64
+from dataclasses import dataclass, field
+from keyword_matcher import KeywordMatcher
+from domain_age import get_resolver, domain_age_years
+from domain_store import get_store
+from html_features import extract_features
+from url_probe import get_probe
+from ocr_pool import get_ocr_pool
+from lookalike_index import LookalikeIndex, load_brand_list
+from confusables import ConfusableIndex
+from base64_scan import scan_data_uri
+from rules import Rule, RuleEngine
+from prefilter import PREFILTER_ENABLED, Prefilter
+import metrics
 
 
 logging.basicConfig(
     level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+# Satır başına bir marka içeren ek liste, yüklenirken indekse eklenir
+BRAND_LIST_PATH = os.getenv("PHISHING_BRAND_LIST", "")
 
-class TurkishDomains:
 
-    global phishing_score
-    risk_details = {
-        "suspicious_links": [],
-        "suspicious_forms": [],
-        "suspicious_images": [],
-        "threat_keywords": [],
-        "suspicious_script": [],
-        "total_score": 0.0,
-    }
+@dataclass(slots=True)
+class AnalysisResult:
+    """Evidence and score of a single analysis, never shared between requests."""
+
+    suspicious_links: list = field(default_factory=list)
+    suspicious_forms: list = field(default_factory=list)
+    suspicious_images: list = field(default_factory=list)
+    threat_keywords: list = field(default_factory=list)
+    suspicious_script: list = field(default_factory=list)
+    suspicious_iframes: list = field(default_factory=list)
+    suspicious_fetch_requests: list = field(default_factory=list)
+    total_score: float = 0.0
+
+    def to_dict(self) -> dict:
+        # Listeler kopyalanır, arka planda süren zenginleştirme sonucu değiştirmesin
+        return {
+            name: list(value) if isinstance(value, list) else value
+            for name, value in ((name, getattr(self, name)) for name in self.__slots__)
+        }
+
+
+@dataclass(slots=True)
+class PendingLink:
+    url: str
+    domain: str
+    punycode_domain: str
+    shortened: bool
+
+
+class TurkishDomains:
 
     models_config = {
         "turkish": {
@@ -79,33 +108,162 @@ class TurkishDomains:
                 r"jpmorgan",
                 r"tesla",
             ],
+            "shorteners": [
+                "bit.ly",
+                "tinyurl.com",
+                "goo.gl",
+                "ow.ly",
+                "buff.ly",
+                "short.io",
+                "bl.ink",
+                "is.gd",
+                "Replug.io",
+                "Cutt.us",
+                "Rebrandly.com",
+                "Wow.link",
+                "Innkin.com",
+                "Goo.su",
+                "T2M",
+                "kisa.link",
+                "k.url",
+                "ozurl.net",
+                "k.link",
+            ],
+            "sensitive_input_types": [
+                "şifre",
+                "parola",
+                "eposta",
+                "hesap",
+                "kredi",
+                "kart",
+                "güvenlik",
+                "email",
+            ],
+            "suspicious_text_patterns": [
+                r"\b\d{10,}\b",
+                r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}",
+                r"\+\d{10,}",
+                r"\b(IBAN|TR\d{2})\d{16}\b",
+            ],
         }
     }
 
+    # Puanlama kuralları veri olarak tutulur, build() ile bir kez derlenir
+    _config = models_config["turkish"]
+    rules = (
+        Rule(
+            "shortener",
+            target="link",
+            weight=2,
+            terms=tuple(_config["shorteners"]),
+            reason="Kısaltılmış URL",
+            evidence=("suspicious_links", "url"),
+        ),
+        Rule(
+            "external_form_action",
+            target="form_action",
+            weight=1,
+            terms=("http",),
+            reason="Dış kaynaklı form eylemi",
+            evidence=("suspicious_forms", "action"),
+        ),
+        Rule(
+            "sensitive_input",
+            target="input",
+            weight=1.5,
+            terms=tuple(_config["sensitive_input_types"]),
+            reason="Hassas girdi alanı",
+            evidence=("suspicious_forms", "input"),
+        ),
+        *(
+            Rule(f"text_pattern_{index}", target="text", weight=0.5, pattern=pattern, ignore_case=True)
+            for index, pattern in enumerate(_config["suspicious_text_patterns"])
+        ),
+        Rule(
+            "external_iframe",
+            target="iframe",
+            weight=1,
+            terms=("http",),
+            unless=tuple(_config["sensitive_domains"]),
+            reason="Şüpheli iframe kaynağı",
+            evidence=("suspicious_iframes", "src"),
+        ),
+        Rule(
+            "fetch_exfiltration",
+            target="script",
+            weight=1.5,
+            terms=("fetch",),
+            requires=("http",),
+            unless=tuple(_config["sensitive_domains"]),
+            reason="Fetch kullanılarak şüpheli veri gönderimi",
+            evidence=("suspicious_fetch_requests", "script"),
+        ),
+        Rule(
+            "atob_payload",
+            target="script",
+            weight=3,
+            terms=("atob",),
+            reason="Atob kullanarak gömülü bir şey çalıştırılmaya çalışılıyor",
+            evidence=("suspicious_script", "scprit"),
+        ),
+    )
+
+    built = False
+    _build_lock = threading.Lock()
+
+    @classmethod
+    def build(cls):
+        """Build the matchers, indexes and compiled rules once per process.
+
+        Called lazily by the loaders, or up front by the preload hook so
+        prefork workers share the result copy-on-write.
+        """
+        if cls.built:
+            return
+        with cls._build_lock:
+            if cls.built:
+                return
+            config = cls.models_config["turkish"]
+            cls.keyword_matcher = KeywordMatcher(config["threat_keywords"])
+            cls.lookalike_index = LookalikeIndex(config["sensitive_domains"])
+            cls.confusable_index = ConfusableIndex(config["sensitive_domains"])
+            if BRAND_LIST_PATH:
+                brand_list = load_brand_list(BRAND_LIST_PATH)
+                cls.lookalike_index.add_many(brand_list)
+                for brand in brand_list:
+                    cls.confusable_index.add(brand)
+            cls.rule_engine = RuleEngine(cls.rules)
+            cls.prefilter = Prefilter(cls.rule_engine, config["threat_keywords"])
+            cls.built = True
+
 
 def load_turkish_model():
     return TurkishDomains.models_config["turkish"]
 
 
-def is_cdn_photo(url: str):
-    try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.head(url, allow_redirects=True, headers=headers, timeout=5)
-        content_type = response.headers.get("Content-Type", "")
-        return content_type.startswith("image/")
-    except Exception as e:
-        print(f"Error checking URL: {e}")
-        return False
+def load_keyword_matcher():
+    TurkishDomains.build()
+    return TurkishDomains.keyword_matcher
 
 
-def is_image_content(url):
-    try:
-        response = requests.head(url, allow_redirects=True, timeout=5)
-        content_type = response.headers.get("Content-Type", "")
-        return content_type.startswith("image/")
-    except Exception as e:
-        print(f"Error: {e}")
-        return False
+def load_lookalike_index():
+    TurkishDomains.build()
+    return TurkishDomains.lookalike_index
+
+
+def load_confusable_index():
+    TurkishDomains.build()
+    return TurkishDomains.confusable_index
+
+
+def load_rule_engine():
+    TurkishDomains.build()
+    return TurkishDomains.rule_engine
+
+
+def load_prefilter():
+    TurkishDomains.build()
+    return TurkishDomains.prefilter
 
 
 def is_image_url(url: str):
@@ -114,321 +272,304 @@ def is_image_url(url: str):
 
 
 def download_image_to_memory(url):
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-
-        # Image'i belleğe al
-        img_data = BytesIO(response.content)
-        return img_data
-    except requests.exceptions.RequestException as e:
-        print(f"Resim indirme hatası: {e}")
+    content = get_probe().fetch(url)
+    if content is None:
         return None
 
+    # Image'i belleğe al
+    return BytesIO(content)
+
 
 def perform_ocr_from_memory(image_data):
+    # Aynı görsel için OCR önbellekten döner, yenisi işçi havuzunda çalışır
+    return get_ocr_pool().image_to_string(image_data.getvalue())
 
-    try:
-        img = Image.open(image_data)
-        text = pytesseract.image_to_string(img, lang="tur")
-        return text
-    except Exception as e:
-        print(f"Resim işleme hatası: {e}")
-        return None
 
+def link_domain(url: str) -> str:
+    try:
+        return urlparse(url).netloc
+    except ValueError:
+        return ""
 
-def helper(url: str):
 
+def ocr_image_text(url: str):
     image_data = download_image_to_memory(url)
     if image_data:
-        result_text = perform_ocr_from_memory(image_data)
-        if result_text:
-            result_texts = str(result_text).split(" ")
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc
-            punycode_domain = idna.encode(domain).decode()
-
-            for text_part in result_texts:
-                matching_keywords = [
-                    keyword
-                    for keyword in TurkishDomains.models_config["turkish"][
-                        "threat_keywords"
-                    ]
-                    if keyword in text_part
-                ]
-                if matching_keywords:
-                    TurkishDomains.phishing_score += 0.5
-                    TurkishDomains.risk_details["threat_keywords"].append(
-                        {
-                            "url": punycode_domain,
-                            "threat word": text_part,
-                            "reason": "şüpheli kelime",
-                        }
-                    )
+        return perform_ocr_from_memory(image_data)
+    return None
 
 
-def analyze_turkish_html_phishing(html_content):
-    model_config = load_turkish_model()
+def score_image_text(url: str, result_text, result: AnalysisResult) -> float:
+    phishing_score = 0.0
+    if result_text:
+        parsed_url = urlparse(url)
+        domain = parsed_url.netloc
+        punycode_domain = idna.encode(domain).decode()
+
+        for text_part in load_keyword_matcher().matching_words(
+            str(result_text)
+        ):
+            phishing_score += 0.5
+            result.threat_keywords.append(
+                {
+                    "url": punycode_domain,
+                    "threat word": text_part,
+                    "reason": "şüpheli kelime",
+                }
+            )
+    return phishing_score
+
+
+def score_inputs(rule_engine: RuleEngine, inputs, result: AnalysisResult) -> float:
+    phishing_score = 0.0
+    for input_type, input_name in inputs:
+        # Tür ve ad tek metinde taranır; ayırıcı hiçbir kurala uymaz
+        phishing_score += rule_engine.score(
+            "input", f"{input_type}\x00{input_name}", input_name, result
+        )
+    return phishing_score
 
-    soup = BeautifulSoup(html_content, "html.parser")
-    TurkishDomains.phishing_score = 0.0
+
+def run_offline_checks(html_content):
+    """Run every check that needs no network access.
+
+    Returns the provisional result and the links still waiting for the
+    network enrichments in :func:`run_network_checks`.
+    """
+    rule_engine = load_rule_engine()
+    keyword_matcher = load_keyword_matcher()
+    lookalike_index = load_lookalike_index()
+    confusable_index = load_confusable_index()
+
+    metrics.observe_document(html_content)
+    stages = metrics.StageTimer()
+    # Hiçbir sinyal taşımayan belge ayrıştırılmadan temiz sayılır
+    skip = PREFILTER_ENABLED and not load_prefilter().should_analyze(html_content)
+    stages.mark("prefilter")
+    if skip:
+        return AnalysisResult(), []
+    # Tüm özellikler belge üzerinden tek geçişte toplanır
+    features = extract_features(html_content)
+    stages.mark("parse")
+    result = AnalysisResult()
     phishing_score = 0.0
 
-    shorteners = [
-        "bit.ly",
-        "tinyurl.com",
-        "goo.gl",
-        "ow.ly",
-        "buff.ly",
-        "short.io",
-        "bl.ink",
-        "is.gd",
-        "Replug.io",
-        "Cutt.us",
-        "Rebrandly.com",
-        "Wow.link",
-        "Innkin.com",
-        "Goo.su",
-        "T2M",
-        "kisa.link",
-        "k.url",
-        "ozurl.net",
-        "k.link",
-    ]
-
-    links = soup.find_all("a", href=True)
-
-    for link in links:
+    links = features.links
+    link_domains = [link_domain(url) for url in links]
+    pending_links = []
+    punycode_domain = ""
+    store = get_store()
+    new_reputations = {}
+    try:
+        reputations = (
+            store.get_reputations(link_domains, lookalike_index.version) if store else {}
+        )
+    except Exception as e:
+        logging.error(f"Domain store read failed: {e}")
+        reputations = {}
+
+    for url, domain in zip(links, link_domains):
         try:
-            url = link["href"]
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc
-            punycode_domain = idna.encode(domain).decode()
-            # ASCII value regex shortcut
-            new_url = re.sub(r"[^\x00-\x7F]+", "", url)
-
-            if new_url != url or str(punycode_domain).startswith("xn--"):
+            cached = reputations.get(domain) or new_reputations.get(domain)
+            if cached:
+                punycode_domain, lookalike_score = cached
+            else:
+                punycode_domain = idna.encode(domain).decode()
+                lookalike_score = None
+            # Homoglif iskeleti tek sözlük sorgusuyla taklit edilen markayı bulur
+            spoofed_brand = confusable_index.spoofed_brand(domain)
+
+            if not url.isascii() or str(punycode_domain).startswith("xn--"):
                 phishing_score += 3
-                TurkishDomains.risk_details["suspicious_links"].append(
+                result.suspicious_links.append(
                     {"url": punycode_domain, "reason": "PunyCode Sahteciliği"}
                 )
-                scores = [
-                    Levenshtein.ratio(domain, company)
-                    for company in model_config["sensitive_domains"]
-                ]
-
-                if max(scores) >= 0.60 and max(scores) < 100:
+                best_match = None
+                if spoofed_brand is None and lookalike_score is None:
+                    best_match = lookalike_index.best_match(domain)
+                    lookalike_score = best_match[1] if best_match else 0.0
+
+                if spoofed_brand or lookalike_score >= 0.60:
+                    if spoofed_brand is None and best_match is None:
+                        # Önbellekteki skorda marka yok; kanıt için yeniden aranır
+                        best_match = lookalike_index.best_match(domain)
                     phishing_score += 3
-                    TurkishDomains.risk_details["suspicious_links"].append(
-                        {"url": punycode_domain, "reason": "Domain Sahteciliği"}
+                    result.suspicious_links.append(
+                        {
+                            "url": punycode_domain,
+                            "reason": "Domain Sahteciliği",
+                            "brand": spoofed_brand or (best_match[0] if best_match else None),
+                        }
                     )
-        except Exception as e:
-            logging.error(f"Link has a problem")
-
-        try:
-            domain_info = whois.whois(domain)
-            creation_datetime = domain_info.creation_date
-            if isinstance(creation_datetime, list):
-                creation_datetime = creation_datetime[0]
-
-            years_difference = (datetime.datetime.now() - creation_datetime).days / 365
-            if years_difference < 5:
-                phishing_score += 2
-                TurkishDomains.risk_details["suspicious_links"].append(
+            elif spoofed_brand:
+                phishing_score += 3
+                result.suspicious_links.append(
                     {
                         "url": punycode_domain,
-                        "reason": "Domain yaşından Domain Sahteciliği",
+                        "reason": "Domain Sahteciliği",
+                        "brand": spoofed_brand,
                     }
                 )
+            if domain and (not cached or cached[1] != lookalike_score):
+                new_reputations[domain] = (punycode_domain, lookalike_score)
         except Exception as e:
-            logging.error(f"Error fetching WHOIS data:")
+            logging.error(f"Link has a problem")
 
         # Handle short URLs
-        if any(shortener in url for shortener in shorteners):
-            phishing_score += 2
-            TurkishDomains.risk_details["suspicious_links"].append(
-                {"url": url, "reason": "Kısaltılmış URL"}
-            )
-            if is_image_url(url):
-                helper(url)
-
-            if is_cdn_photo(url):
-                helper(url)
+        link_score = rule_engine.score("link", url, url, result)
+        shortened = link_score > 0
+        phishing_score += link_score
+        pending_links.append(PendingLink(url, domain, punycode_domain, shortened))
 
-            if is_image_content(url):
-                helper(url)
+    if store and new_reputations:
+        try:
+            store.put_reputations(
+                [
+                    (domain, punycode, score)
+                    for domain, (punycode, score) in new_reputations.items()
+                ],
+                version=lookalike_index.version,
+            )
+        except Exception as e:
+            logging.error(f"Domain store write failed: {e}")
+    stages.mark("links")
 
-    forms = soup.find_all("form")
+    for form in features.forms:
+        phishing_score += rule_engine.score("form_action", form.action, form.action, result)
+        phishing_score += score_inputs(rule_engine, form.inputs, result)
 
-    if forms:
-        for form in forms:
-            action = form.get("action")
-            if action and "http" in action:
-                phishing_score += 1
+    stages.mark("forms")
 
-                TurkishDomains.risk_details["suspicious_forms"].append(
-                    {"action": action, "reason": "Dış kaynaklı form eylemi"}
-                )
+    images = features.images
 
-            inputs = form.find_all("input")
-            sensitive_input_types = [
-                "şifre",
-                "parola",
-                "eposta",
-                "hesap",
-                "kredi",
-                "kart",
-                "güvenlik",
-                "email",
-            ]
-            for input_tag in inputs:
-                input_type = input_tag.get("type", "").lower()
-                input_name = input_tag.get("name", "").lower()
-
-                if any(
-                    sens_type in input_type or sens_type in input_name
-                    for sens_type in sensitive_input_types
-                ):
-                    phishing_score += 1.5
-
-                    TurkishDomains.risk_details["suspicious_forms"].append(
-                        {"input": input_name, "reason": "Hassas girdi alanı"}
+    if images:
+        for src, alt_text in images:
+            # Satır içi görseller parça parça ve bayt sınırıyla taranır
+            data_uri = scan_data_uri(src)
+            if data_uri and data_uri.media_type.lower().startswith("image/"):
+                if data_uri.is_base64 and len(data_uri.media_type) > len("image/"):
+                    phishing_score += 1
+                    result.suspicious_images.append(
+                        {"src": data_uri.evidence, "reason": "Base64 kodlu görsel"}
                     )
+                # QR maybe
 
-    images = soup.find_all("img")
+                if data_uri.marker:
+                    phishing_score += 3
+                    result.suspicious_images.append(
+                        {
+                            "src": data_uri.evidence,
+                            "marker": data_uri.marker,
+                            "reason": "Görsel içinde gömülü betik/HTML",
+                        }
+                    )
 
-    if images:
-        for img in images:
-            src = img.get("src")
-            if src and (re.match(r"^data:image/.+;base64,", src)):
-                phishing_score += 1
-                TurkishDomains.risk_details["suspicious_images"].append(
-                    {"src": src, "reason": "Base64 kodlu görsel"}
-                )
-            # QR maybe
-
-            if src and src.startswith("data:image/"):
-                try:
-                    # Base64 veriyi virgülden sonra alıyoruz:
-                    base64_data = src.split(",")[1]
-                    decoded_data = base64.b64decode(base64_data).decode("utf-8")
-                    if "script" in decoded_data:
-                        phishing_score += 3
-                except Exception as e:
-                    logging.error(f"Base64 decode hatası: {e}")
-
-            alt_text = img.get("alt", "").lower()
-            if "scan" in alt_text or any(
-                keyword in alt_text for keyword in model_config["threat_keywords"]
-            ):
+            alt_text = alt_text.lower()
+            if "scan" in alt_text or keyword_matcher.contains_any(alt_text):
                 phishing_score += 0.5
-                TurkishDomains.risk_details["suspicious_images"].append(
+                result.suspicious_images.append(
                     {"alt": alt_text, "reason": "Şüpheli görsel açıklaması"}
                 )
 
-    body = soup.find("body")
+    stages.mark("images")
 
-    if body:
-        plain_text = body.get_text(separator=" ").strip()
+    if features.has_body:
+        plain_text = features.body_text
         plain_text = re.sub(r"\s+", " ", plain_text).strip()
-        words = plain_text.split()
-
-        for word in words:
-            matching_keywords = [
-                keyword
-                for keyword in model_config["threat_keywords"]
-                if keyword in word
-            ]
-            if matching_keywords:
-                phishing_score += 0.5
-                TurkishDomains.risk_details["threat_keywords"].append(
-                    {
-                        "url": punycode_domain,
-                        "threat word": word,
-                        "reason": "şüpheli kelime",
-                    }
-                )
 
-        suspicious_text_patterns = [
-            r"\b\d{10,}\b",
-            r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}",
-            r"\+\d{10,}",
-            r"\b(IBAN|TR\d{2})\d{16}\b",
-        ]
-        for pattern in suspicious_text_patterns:
-            if re.search(pattern, plain_text, re.IGNORECASE):
-                phishing_score += 0.5
+        for word in keyword_matcher.matching_words(plain_text):
+            phishing_score += 0.5
+            result.threat_keywords.append(
+                {
+                    "url": punycode_domain,
+                    "threat word": word,
+                    "reason": "şüpheli kelime",
+                }
+            )
 
-    table = soup.find("table")
-
-    if table:
-        inputs = table.find_all("input")
-        sensitive_input_types = [
-            "şifre",
-            "parola",
-            "eposta",
-            "hesap",
-            "kredi",
-            "kart",
-            "güvenlik",
-            "email",
-        ]
-        for input in inputs:
-            input_type = input.get("type", "").lower()
-            input_name = input.get("name", "").lower()
-            if any(
-                sens_type in input_type or sens_type in input_name
-                for sens_type in sensitive_input_types
-            ):
-                phishing_score += 1.5
-
-                TurkishDomains.risk_details["suspicious_forms"].append(
-                    {"input": input_name, "reason": "Hassas girdi alanı"}
-                )
+        phishing_score += rule_engine.score("text", plain_text, plain_text, result)
 
-    iframes = soup.find_all("iframe")
+    stages.mark("body_text")
 
-    if iframes:
-        for iframe in iframes:
-            iframe_src = iframe.get("src")
-            if iframe_src:
-                if "http" in iframe_src and not any(
-                    domain in iframe_src for domain in model_config["sensitive_domains"]
-                ):
-                    phishing_score += 1
-                    TurkishDomains.risk_details["suspicious_iframes"].append(
-                        {"src": iframe_src, "reason": "Şüpheli iframe kaynağı"}
-                    )
+    phishing_score += score_inputs(rule_engine, features.table_inputs, result)
+
+    for iframe_src in features.iframes:
+        phishing_score += rule_engine.score("iframe", iframe_src, iframe_src, result)
+
+    for script_content in features.scripts:
+        phishing_score += rule_engine.score("script", script_content, script_content, result)
+
+    stages.mark("elements")
+
+    result.total_score = phishing_score
+    return result, pending_links
+
+
+def image_urls_to_scan(pending_links: list, probes: dict) -> list:
+    image_urls = []
+    for link in pending_links:
+        probe = probes.get(link.url)
+        if probe is None:
+            continue
+        if is_image_url(link.url) or is_image_url(probe.final_url) or probe.is_image:
+            image_urls.append(probe.final_url)
+    # Aynı görsel bir analizde yalnızca bir kez indirilir
+    return list(dict.fromkeys(image_urls))
+
+
+def apply_network_results(
+    result: AnalysisResult,
+    pending_links: list,
+    creation_dates: dict,
+    image_texts: dict,
+) -> AnalysisResult:
+    phishing_score = 0.0
+
+    for link in pending_links:
+        creation_datetime = creation_dates.get(link.domain)
+        if creation_datetime is not None and domain_age_years(creation_datetime) < 5:
+            phishing_score += 2
+            result.suspicious_links.append(
+                {
+                    "url": link.punycode_domain,
+                    "reason": "Domain yaşından Domain Sahteciliği",
+                }
+            )
+
+    for url, result_text in image_texts.items():
+        phishing_score += score_image_text(url, result_text, result)
+
+    result.total_score += phishing_score
+    return result
+
+
+def run_network_checks(result: AnalysisResult, pending_links: list) -> AnalysisResult:
+    """WHOIS domain age and shortened URL image/OCR checks, added to ``result``."""
+    # Aynı domain için tek WHOIS sorgusu, tüm domainler eşzamanlı çözülür
+    with metrics.timed("whois"):
+        creation_dates = get_resolver().resolve_many(
+            link.domain for link in pending_links
+        )
+    with metrics.timed("url_probe"):
+        probes = {
+            link.url: get_probe().probe(link.url)
+            for link in pending_links
+            if link.shortened
+        }
+    with metrics.timed("ocr"):
+        image_texts = {
+            url: ocr_image_text(url)
+            for url in image_urls_to_scan(pending_links, probes)
+        }
+    return apply_network_results(result, pending_links, creation_dates, image_texts)
 
-    scripts = soup.find_all("script")
-
-    if scripts:
-        for script in scripts:
-            script_content = script.get_text()
-            if "fetch" in script_content and "http" in script_content:
-                if not any(
-                    domain in script_content
-                    for domain in model_config["sensitive_domains"]
-                ):
-                    phishing_score += 1.5
-                    TurkishDomains.risk_details["suspicious_fetch_requests"].append(
-                        {
-                            "script": script_content,
-                            "reason": "Fetch kullanılarak şüpheli veri gönderimi",
-                        }
-                    )
-            if "atob" in script_content:
-                phishing_score += 3
-                TurkishDomains.risk_details["suspicious_script"].append(
-                    {
-                        "scprit": script_content,
-                        "reason": "Atob kullanarak gömülü bir şey çalıştırılmaya çalışılıyor",
-                    }
-                )
 
+def analyze_turkish_html_phishing(html_content):
+    with metrics.timed("total"):
+        result, pending_links = run_offline_checks(html_content)
+        run_network_checks(result, pending_links)
     # Return phishing score and risk details
-    TurkishDomains.risk_details["total_score"] = phishing_score
-    return TurkishDomains.risk_details
+    return result.to_dict()
 
 
 def classify_phishing_risk(risk_details):
@@ -444,6 +585,26 @@ def classify_phishing_risk(risk_details):
         return "Çok Yüksek Risk"
 
 
+def build_response(risk_details) -> dict:
+    return {
+        "risk_score": risk_details["total_score"],
+        "risk_details": risk_details,
+        "risk_level": classify_phishing_risk(risk_details),
+    }
+
+
+def build_post_response(risk_details) -> dict:
+    # POST /phishing sözleşmesi: risk_score alanı ayrıntıların tamamını taşır
+    return {
+        "risk_score": risk_details,
+        "risk_level": classify_phishing_risk(risk_details),
+    }
+
+
+def analyze_and_classify(html_content) -> dict:
+    return build_response(analyze_turkish_html_phishing(html_content))
+
+
 def main():
 
     turkish_sample1 = """
@@ -518,7 +679,9 @@ def main():
 
 
 
-'''import requests
+'''
+# Çalışan sunucuya örnek istek
+import requests
 
 response = requests.post(
     "http://localhost:5000/phishing",
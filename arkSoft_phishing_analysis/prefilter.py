@@ -0,0 +1,99 @@
+import html
+import os
+import re
+
+import metrics
+from keyword_matcher import turkish_lower
+
+PREFILTER_ENABLED = os.getenv("PHISHING_PREFILTER", "1") != "0"
+# Virgülle ayrılmış, kendi alan adlarımız gibi güvenilen bağlantı son ekleri
+TRUSTED_HOSTS = tuple(
+    host.strip().lower()
+    for host in os.getenv("PHISHING_PREFILTER_TRUSTED_HOSTS", "").split(",")
+    if host.strip()
+)
+
+# Ucuz alt dize sinyalleri, küçük harfli metinde aranır
+MARKUP_SIGNALS = (
+    ("form", "<form"),
+    ("input", "<input"),
+    ("iframe", "<iframe"),
+    ("atob", "atob"),
+    ("fetch", "fetch"),
+    ("data_image", "data:image"),
+    ("punycode", "xn--"),
+    ("image_alt_scan", "scan"),
+)
+
+_ABSOLUTE_LINK = re.compile(
+    r"""href\s*=\s*["']?\s*(?:[a-z][a-z0-9+.-]*:)?//([^/\\"'\s>?#]*)""", re.IGNORECASE
+)
+_DOTLESS_I = str.maketrans({"ı": "[ıi]", "i": "[ıi]"})
+_NON_ASCII_LINK = re.compile(r"""href\s*=\s*["']?[^"'\s>]*[^\x00-\x7f]""", re.IGNORECASE)
+
+
+def _host(netloc: str) -> str:
+    host = netloc.rpartition("@")[2]
+    if not host.startswith("["):
+        host = host.partition(":")[0]
+    return host.lower().rstrip(".")
+
+
+def _trusted(host: str, trusted_hosts) -> bool:
+    return any(host == suffix or host.endswith("." + suffix) for suffix in trusted_hosts)
+
+
+class Prefilter:
+    """Byte-level pre-screen that runs before any HTML parsing.
+
+    A document without a single signal cannot score in the full analysis:
+    every check needs one of these constructs to add points. Such documents
+    get the empty result straight away. The screen is deliberately coarse
+    and only errs towards analyzing.
+    """
+
+    def __init__(self, rule_engine, keywords, trusted_hosts=TRUSTED_HOSTS):
+        self.rule_engine = rule_engine
+        self.trusted_hosts = tuple(trusted_hosts)
+        # "i" ve "ı" birbirinin yerine kabul edilir: str.lower() ile Türkçe
+        # küçültme yalnızca bu harflerde ayrışır
+        self._keywords = re.compile(
+            "|".join(
+                re.escape(turkish_lower(keyword)).translate(_DOTLESS_I)
+                for keyword in keywords
+                if keyword
+            )
+        )
+
+    def first_signal(self, html_content: str):
+        """Return the name of the first signal found, or None for a clean document."""
+        # Karakter referansları çözülür; ayrıştırıcı da metni çözülmüş görür
+        if "&" in html_content:
+            html_content = html.unescape(html_content)
+        lowered = html_content.lower()
+        if "\u0307" in lowered:
+            # "İ".lower() noktalı i ve birleşik nokta üretir
+            lowered = lowered.replace("\u0307", "")
+
+        for name, marker in MARKUP_SIGNALS:
+            if marker in lowered:
+                return name
+        if _NON_ASCII_LINK.search(html_content):
+            return "non_ascii_link"
+        for match in _ABSOLUTE_LINK.finditer(html_content):
+            if not _trusted(_host(match.group(1)), self.trusted_hosts):
+                return "external_link"
+        if self.rule_engine.evaluate("link", html_content):
+            return "shortener"
+        if self._keywords.search(lowered):
+            return "threat_keyword"
+        if self.rule_engine.evaluate("text", html_content):
+            return "text_pattern"
+        return None
+
+    def should_analyze(self, html_content: str) -> bool:
+        signal = self.first_signal(html_content)
+        metrics.PREFILTER_DOCUMENTS.inc("analyzed" if signal else "skipped")
+        if signal:
+            metrics.PREFILTER_SIGNALS.inc(signal)
+        return signal is not None
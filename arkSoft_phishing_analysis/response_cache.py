@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import re
+import threading
+
+import metrics
+from ttl_cache import TTLCache
+
+RESPONSE_CACHE_SIZE = int(os.getenv("PHISHING_RESPONSE_CACHE_SIZE", 10_000))
+RESPONSE_CACHE_BYTES = int(os.getenv("PHISHING_RESPONSE_CACHE_BYTES", 64 * 1024 * 1024))
+RESPONSE_CACHE_TTL = float(os.getenv("PHISHING_RESPONSE_CACHE_TTL", 6 * 3600))
+
+# Yalnızca bilinen izleme parametrelerinin değerleri anahtardan çıkarılır;
+# "u", "e" gibi genel adlar hedef adres taşıyabilir, olduğu gibi kalır
+TRACKING_PARAMS = re.compile(
+    r"(?i)([?&])(utm_[a-z]+|fbclid|gclid|mc_eid|mc_cid|_hsenc|_hsmi|"
+    r"trk|token|uid|rid|recipient|email)=([^&#\"'\s<>]*)"
+)
+# Alıcı adresi; "//" ya da "/" sonrasındakiler (http://kullanici@sunucu)
+# bağlantının sunucusunu taşır ve katlanmaz
+EMAIL_ADDRESS = re.compile(r"(?<![/\w.%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+WHITESPACE = re.compile(r"\s+")
+# data: URI içerikleri analiz sonucunu etkiler, olduğu gibi bırakılır
+DATA_URI = re.compile(r"(data:[^\"'\s>]+)")
+
+
+def _normalize_segment(segment: str, removed: set) -> str:
+    def tracking(match):
+        if match.group(3):
+            removed.add(match.group(3))
+        return f"{match.group(1)}{match.group(2)}="
+
+    def email(match):
+        removed.add(match.group(0))
+        return "<email>"
+
+    segment = TRACKING_PARAMS.sub(tracking, segment)
+    return EMAIL_ADDRESS.sub(email, segment)
+
+
+def normalize_html(html_content: str, removed: set = None) -> str:
+    """Reduce per-recipient variation so copies of a campaign compare equal.
+
+    Only the values of known tracking query parameters and recipient
+    addresses are taken out; hostnames, paths and other parameters stay,
+    since they decide what the analysis finds. The values taken out are
+    added to ``removed`` when it is given.
+    """
+    removed = set() if removed is None else removed
+    parts = DATA_URI.split(html_content)
+    # split() yakalanan grupları tek indekslere koyar
+    normalized = "".join(
+        part if index % 2 else _normalize_segment(part, removed)
+        for index, part in enumerate(parts)
+    )
+    return WHITESPACE.sub(" ", normalized).strip()
+
+
+def cache_key(html_content: str) -> str:
+    return _key_and_removed(html_content)[0]
+
+
+def _key_and_removed(html_content: str) -> tuple:
+    removed = set()
+    normalized = normalize_html(html_content, removed)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest(), removed
+
+
+def private_values(value, removed: set) -> list:
+    """The removed values that the result quotes back (e.g. a link in the evidence)."""
+    serialized = json.dumps(value, ensure_ascii=False, default=str)
+    return sorted(item for item in removed if item in serialized)
+
+
+def _json_size(value) -> int:
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+class ResponseCache:
+    """LRU+TTL cache of analysis results keyed on the normalized HTML hash.
+
+    A result that quotes a value removed by normalization (a recipient's
+    address, a tracking link) is only served to requests carrying exactly
+    those values; anyone else gets a fresh analysis, so one recipient's data
+    never appears in another's evidence. Concurrent misses for the same key
+    wait for a single analysis instead of each running their own.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = RESPONSE_CACHE_SIZE,
+        maxbytes: int = RESPONSE_CACHE_BYTES,
+        ttl: float = RESPONSE_CACHE_TTL,
+    ):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl, maxbytes=maxbytes, sizeof=_json_size)
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: str, removed: set):
+        entry = self.cache.get(key)
+        if entry is None or not removed.issuperset(entry["private"]):
+            return None
+        return entry["value"]
+
+    def peek(self, html_content: str):
+        """Return ``(value or None, key)`` without computing anything."""
+        key, removed = _key_and_removed(html_content)
+        return self._get(key, removed), key
+
+    def get_or_compute(self, html_content: str, compute):
+        """Return ``(value, key, status)`` where status is ``HIT`` or ``MISS``."""
+        key, removed = _key_and_removed(html_content)
+        value = self._get(key, removed)
+        if value is not None:
+            return value, key, "HIT"
+
+        with self._lock:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+
+        with key_lock:
+            value = self._get(key, removed)
+            if value is not None:
+                return value, key, "HIT"
+            try:
+                value = compute(html_content)
+                self.cache.set(key, {"value": value, "private": private_values(value, removed)})
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        return value, key, "MISS"
+
+
+_cache = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+        metrics.register_cache("response", _cache.cache)
+    return _cache
@@ -0,0 +1,159 @@
+import re
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    """A scoring rule expressed as data.
+
+    ``terms`` are literal substrings, ``pattern`` a regular expression; the
+    rule fires when any of them occurs in the element text, every one of
+    ``requires`` is present and none of ``unless`` is. ``evidence`` names
+    the result list and the key under which the element is recorded.
+    """
+
+    name: str
+    target: str
+    weight: float
+    terms: tuple = ()
+    pattern: str = None
+    ignore_case: bool = False
+    requires: tuple = ()
+    unless: tuple = ()
+    reason: str = ""
+    evidence: tuple = None
+
+
+def _alternation(rule: Rule) -> str:
+    parts = [re.escape(term) for term in rule.terms]
+    if rule.pattern:
+        parts.append(rule.pattern)
+    expression = "|".join(parts)
+    return f"(?i:{expression})" if rule.ignore_case else f"(?:{expression})"
+
+
+def _combine(alternatives) -> re.Pattern:
+    if len(alternatives) == 1:
+        group, expression = alternatives[0]
+        return re.compile(f"(?P<{group}>{expression})")
+    # Bakış ileri gruplar aynı konumda başlayan diğer kuralların eşleşmesini engellemez
+    return re.compile(
+        "|".join(f"(?=(?P<{group}>{expression}))" for group, expression in alternatives)
+    )
+
+
+class _CompiledTarget:
+    __slots__ = ("literal", "literal_count", "alternatives", "order", "patterns")
+
+    def __init__(self, literal, alternatives, patterns):
+        self.literal = literal
+        self.literal_count = len(alternatives)
+        # Birleşik ifadedeki sırasıyla her grubun tek başına derlenmiş hali
+        self.alternatives = alternatives
+        self.order = {group: position for position, (group, _) in enumerate(alternatives)}
+        self.patterns = patterns
+
+
+class RuleEngine:
+    """Compiles the rules of each target once, at construction.
+
+    Literal rules of a target share one regular expression, each rule a
+    named group, so an element is scanned once however many term lists the
+    target has. Regex rules are compiled individually: CPython's engine
+    cannot share the prefix scan of unrelated patterns, and a combined
+    alternation measured slower than separate searches. A rule fires at most
+    once per element.
+    """
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        self._by_group = {}
+        self._unless = {}
+        literals = {}
+        patterns = {}
+        for index, rule in enumerate(self.rules):
+            group = f"r{index}"
+            self._by_group[group] = (index, rule)
+            if rule.pattern:
+                patterns.setdefault(rule.target, []).append(
+                    (index, rule, group, re.compile(_alternation(rule)))
+                )
+            else:
+                literals.setdefault(rule.target, []).append((group, _alternation(rule)))
+            if rule.unless:
+                self._unless[group] = re.compile(
+                    "|".join(re.escape(term) for term in rule.unless)
+                )
+        self._targets = {
+            target: _CompiledTarget(
+                _combine(literals[target]) if target in literals else None,
+                tuple(
+                    (group, re.compile(expression))
+                    for group, expression in literals.get(target, ())
+                ),
+                tuple(patterns.get(target, ())),
+            )
+            for target in {*literals, *patterns}
+        }
+
+    def targets(self) -> frozenset:
+        return frozenset(self._targets)
+
+    def evaluate(self, target: str, text: str) -> list:
+        """Return the rules of ``target`` that fire on ``text``, in table order."""
+        compiled = self._targets.get(target)
+        if compiled is None or not text:
+            return []
+
+        fired = []
+        if compiled.literal is not None:
+            # Çoğu öğe hiçbir kurala uymaz, tek arama yeterli
+            match = compiled.literal.search(text)
+            if match is not None:
+                fired = self._literal_matches(compiled, text, match)
+        for index, rule, group, pattern in compiled.patterns:
+            if pattern.search(text) is not None and self._accepts(group, rule, text):
+                fired.append((index, rule))
+
+        if len(fired) > 1:
+            fired.sort()
+        return [rule for _, rule in fired]
+
+    def _literal_matches(self, compiled: _CompiledTarget, text: str, first) -> list:
+        seen = set()
+        fired = []
+        for match in compiled.literal.finditer(text, first.start()):
+            # Seçeneklerden yalnızca ilki raporlanır; aynı konumda başlayan
+            # sonraki kurallar ayrıca denenir
+            start = match.start()
+            groups = [match.lastgroup] + [
+                group
+                for group, expression in compiled.alternatives[compiled.order[match.lastgroup] + 1 :]
+                if group not in seen and expression.match(text, start) is not None
+            ]
+            for group in groups:
+                if group in seen:
+                    continue
+                seen.add(group)
+                index, rule = self._by_group[group]
+                if self._accepts(group, rule, text):
+                    fired.append((index, rule))
+            if len(seen) == compiled.literal_count:
+                break
+        return fired
+
+    def _accepts(self, group: str, rule: Rule, text: str) -> bool:
+        if rule.requires and not all(term in text for term in rule.requires):
+            return False
+        unless = self._unless.get(group)
+        return unless is None or unless.search(text) is None
+
+    def score(self, target: str, text: str, value, result) -> float:
+        """Add the evidence of every fired rule to ``result`` and return the score."""
+        phishing_score = 0.0
+        for rule in self.evaluate(target, text):
+            phishing_score += rule.weight
+            if rule.evidence:
+                attribute, key = rule.evidence
+                getattr(result, attribute).append({key: value, "reason": rule.reason})
+        return phishing_score
@@ -0,0 +1,272 @@
+"""Rescan mail archives (.eml files, maildir folders, mbox files) for phishing.
+
+Usage:
+    python scan_mailbox.py INPUT [INPUT ...] -o results.jsonl [--resume]
+    python scan_mailbox.py archive.mbox -o results/ --format parquet --offline
+"""
+
+import argparse
+import glob
+import json
+import logging
+import mailbox
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from email import policy
+from email.parser import BytesParser
+
+SCAN_WORKERS = int(os.getenv("MAILBOX_SCAN_WORKERS", os.cpu_count() or 2))
+# Parquet çıktısında her parça dosyasındaki satır sayısı
+PARQUET_ROWS_PER_FILE = int(os.getenv("MAILBOX_PARQUET_ROWS", 5000))
+
+_parser = BytesParser(policy=policy.default)
+
+
+def iter_messages(path: str):
+    """Yield ``(source, raw_bytes)`` for every message under ``path``.
+
+    ``source`` identifies the message across runs and is what resume keys on.
+    """
+    if os.path.isdir(path):
+        if all(os.path.isdir(os.path.join(path, sub)) for sub in ("cur", "new", "tmp")):
+            box = mailbox.Maildir(path, factory=None, create=False)
+            for key in box.iterkeys():
+                yield f"{path}#{key}", box.get_bytes(key)
+            return
+        for file_path in sorted(glob.iglob(os.path.join(path, "**", "*"), recursive=True)):
+            if os.path.isfile(file_path):
+                yield from iter_messages(file_path)
+        return
+
+    if path.lower().endswith(".eml"):
+        with open(path, "rb") as file:
+            yield path, file.read()
+        return
+
+    with open(path, "rb") as file:
+        is_mbox = file.read(5) == b"From "
+    if is_mbox:
+        box = mailbox.mbox(path, factory=None, create=False)
+        for key in box.iterkeys():
+            yield f"{path}#{key}", box.get_bytes(key)
+
+
+def html_parts(message) -> list:
+    """Decoded ``text/html`` parts; transfer encoding and charset are undone."""
+    parts = []
+    for part in message.walk():
+        if part.get_content_type() != "text/html" or part.is_attachment():
+            continue
+        try:
+            parts.append(part.get_content())
+        except (LookupError, UnicodeError, AssertionError):
+            # Bilinmeyen karakter kümeleri için kayıplı çözüm
+            payload = part.get_payload(decode=True) or b""
+            parts.append(payload.decode("utf-8", "replace"))
+    return parts
+
+
+def analyze_message(source: str, raw: bytes, offline: bool) -> dict:
+    import phishing_analyze
+
+    row = {
+        "source": source,
+        "message_id": None,
+        "subject": None,
+        "sender": None,
+        "html_parts": 0,
+        "risk_score": None,
+        "risk_level": None,
+        "risk_details": None,
+        "error": None,
+    }
+    try:
+        message = _parser.parsebytes(raw)
+        row["message_id"] = str(message.get("Message-ID", "") or "") or None
+        row["subject"] = str(message.get("Subject", "") or "") or None
+        row["sender"] = str(message.get("From", "") or "") or None
+
+        responses = []
+        for html_content in html_parts(message):
+            if offline:
+                result, _ = phishing_analyze.run_offline_checks(html_content)
+                responses.append(phishing_analyze.build_response(result.to_dict()))
+            else:
+                responses.append(phishing_analyze.analyze_and_classify(html_content))
+
+        row["html_parts"] = len(responses)
+        if responses:
+            # Mesajın riski en yüksek puanlı HTML parçasıdır
+            worst = max(responses, key=lambda response: response["risk_score"])
+            row["risk_score"] = worst["risk_score"]
+            row["risk_level"] = worst["risk_level"]
+            row["risk_details"] = json.dumps(worst["risk_details"], ensure_ascii=False, default=str)
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+class JsonlWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a+", encoding="utf-8")
+        # Kesilen bir çalışmanın yarım satırı yeni satırla birleşmesin
+        if self._file.tell() > 0:
+            self._file.seek(self._file.tell() - 1)
+            if self._file.read(1) != "\n":
+                self._file.write("\n")
+
+    def completed_sources(self) -> set:
+        with open(self.path, encoding="utf-8") as file:
+            sources = set()
+            for line in file:
+                try:
+                    sources.add(json.loads(line)["source"])
+                except (ValueError, KeyError):
+                    # Yarıda kalmış son satır yeniden taranır
+                    continue
+        return sources
+
+    def write(self, row: dict):
+        self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def sync(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _parquet_schema():
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("source", pa.string()),
+            ("message_id", pa.string()),
+            ("subject", pa.string()),
+            ("sender", pa.string()),
+            ("html_parts", pa.int32()),
+            ("risk_score", pa.float64()),
+            ("risk_level", pa.string()),
+            ("risk_details", pa.string()),
+            ("error", pa.string()),
+        ]
+    )
+
+
+class ParquetWriter:
+    """Writes rows as numbered part files so a run can be resumed safely."""
+
+    def __init__(self, directory: str, rows_per_file: int = PARQUET_ROWS_PER_FILE):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            sys.exit("Parquet çıktısı için pyarrow kurulu olmalı.")
+        self.directory = directory
+        self.rows_per_file = rows_per_file
+        self._rows = []
+        os.makedirs(directory, exist_ok=True)
+        self._next_part = len(self._parts())
+
+    def _parts(self) -> list:
+        return sorted(glob.glob(os.path.join(self.directory, "part-*.parquet")))
+
+    def completed_sources(self) -> set:
+        import pyarrow.parquet as pq
+
+        sources = set()
+        for part in self._parts():
+            sources.update(pq.read_table(part, columns=["source"]).column("source").to_pylist())
+        return sources
+
+    def write(self, row: dict):
+        self._rows.append(row)
+        if len(self._rows) >= self.rows_per_file:
+            self.flush()
+
+    def sync(self):
+        # Parça dosyaları dolduğunda yazılır
+        pass
+
+    def flush(self):
+        if not self._rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = os.path.join(self.directory, f"part-{self._next_part:06d}.parquet")
+        # Önce geçici dosyaya yazılır, yarım parça dosyası kalmasın
+        pq.write_table(pa.Table.from_pylist(self._rows, schema=_parquet_schema()), path + ".tmp")
+        os.replace(path + ".tmp", path)
+        self._next_part += 1
+        self._rows = []
+
+    def close(self):
+        self.flush()
+
+
+def scan(inputs, writer, workers: int, offline: bool, resume: bool, max_in_flight: int = None):
+    done = writer.completed_sources() if resume else set()
+    if done:
+        print(f"{len(done)} mesaj önceki çalışmadan atlanıyor")
+    max_in_flight = max_in_flight or workers * 4
+
+    scanned = skipped = flagged = 0
+    in_flight = set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+
+        def drain(block_until: int):
+            nonlocal scanned, flagged
+            while len(in_flight) > block_until:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    in_flight.discard(future)
+                    row = future.result()
+                    writer.write(row)
+                    scanned += 1
+                    if row["risk_score"] is not None and row["risk_score"] > 3.5:
+                        flagged += 1
+                    if scanned % 1000 == 0:
+                        writer.sync()
+                        print(f"{scanned} mesaj tarandı, {flagged} yüksek riskli")
+
+        for path in inputs:
+            for source, raw in iter_messages(path):
+                if source in done:
+                    skipped += 1
+                    continue
+                in_flight.add(pool.submit(analyze_message, source, raw, offline))
+                # Bellekte en fazla max_in_flight ham mesaj bekler
+                drain(max_in_flight - 1)
+        drain(0)
+
+    writer.close()
+    return {"scanned": scanned, "skipped": skipped, "flagged": flagged}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help=".eml dosyası, maildir/eml klasörü veya mbox")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--format", choices=["jsonl", "parquet"])
+    parser.add_argument("--workers", type=int, default=SCAN_WORKERS)
+    parser.add_argument("--resume", action="store_true", help="çıktıdaki mesajları atla")
+    parser.add_argument("--offline", action="store_true", help="WHOIS/HTTP/OCR kontrollerini atla")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    output_format = args.format or (
+        "jsonl" if args.output.endswith(".jsonl") else "parquet"
+    )
+    if not args.resume and os.path.exists(args.output):
+        parser.error(f"{args.output} zaten var; devam etmek için --resume kullanın")
+    writer = JsonlWriter(args.output) if output_format == "jsonl" else ParquetWriter(args.output)
+
+    summary = scan(args.inputs, writer, args.workers, args.offline, args.resume)
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
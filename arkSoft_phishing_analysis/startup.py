@@ -0,0 +1,121 @@
+import gc
+import importlib
+import logging
+import os
+import resource
+import threading
+import time
+
+# Ana süreçte yüklenip çatallanan işçilerle paylaşılan modüller; OCR
+# (PIL, pytesseract) bilerek dışarıda, ilk görselde yüklenir
+PRELOAD_MODULES = tuple(
+    name.strip()
+    for name in os.getenv("PHISHING_PRELOAD_MODULES", "requests,whois,Levenshtein").split(",")
+    if name.strip()
+)
+# Ön yüklenen nesneler GC tarafından dokunulup kopyalanmasın
+FREEZE_GC = os.getenv("PHISHING_PRELOAD_FREEZE_GC", "1") != "0"
+
+_WARM_UP_HTML = (
+    "<html><body><a href='http://bit.ly/x'>Hesap doğrula</a>"
+    "<form action='http://example.com'><input type='password' name='şifre'></form>"
+    "<p>+905551234567</p></body></html>"
+)
+
+_ready = threading.Event()
+_lock = threading.Lock()
+_report = {}
+
+
+def _step(name: str, func):
+    started = time.perf_counter()
+    func()
+    _report[name] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def _import_modules():
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logging.warning(f"Ön yükleme modülü yüklenemedi: {name}: {e}")
+
+
+def _build_models():
+    import phishing_analyze
+
+    phishing_analyze.TurkishDomains.build()
+
+
+def _warm_up():
+    import phishing_analyze
+    from html_features import extract_features
+
+    # Ölçümlere ve ağ havuzlarına dokunmadan derlenmiş yapılar bir kez çalıştırılır
+    features = extract_features(_WARM_UP_HTML)
+    phishing_analyze.load_prefilter().first_signal(_WARM_UP_HTML)
+    rule_engine = phishing_analyze.load_rule_engine()
+    for target in rule_engine.targets():
+        rule_engine.evaluate(target, features.body_text)
+    phishing_analyze.load_keyword_matcher().matching_words(features.body_text)
+    phishing_analyze.load_confusable_index().spoofed_brand("example.com")
+    phishing_analyze.load_lookalike_index().best_match("example.com")
+
+
+def preload() -> dict:
+    """Import shared modules and build the models once, before workers fork.
+
+    Only pure data is built here. Thread pools, sessions and database
+    connections stay lazy so every worker opens its own after the fork.
+    Returns the startup report (milliseconds per step).
+    """
+    with _lock:
+        if _ready.is_set():
+            return report()
+        started = time.perf_counter()
+        _step("imports", _import_modules)
+        _step("models", _build_models)
+        _step("warm_up", _warm_up)
+        if FREEZE_GC:
+            gc.collect()
+            gc.freeze()
+        _report["total"] = round((time.perf_counter() - started) * 1000, 1)
+        _ready.set()
+
+    logging.info(f"Ön yükleme tamamlandı: {report()}")
+    return report()
+
+
+def reset_worker_state():
+    """Drop singletons inherited through fork so the child builds its own.
+
+    Their thread pools, sessions and connections do not survive a fork:
+    tasks submitted to a copied thread pool never run. Pass this as the
+    ``initializer`` of forked process pools.
+    """
+    import deferred
+    import domain_age
+    import domain_store
+    import ocr_pool
+    import response_cache
+    import url_probe
+
+    domain_age._resolver = None
+    domain_store._store = None
+    url_probe._probe = None
+    ocr_pool._pool = None
+    deferred._analyzer = None
+    response_cache._cache = None
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def report() -> dict:
+    # Linux'ta ru_maxrss KB cinsinden
+    return {
+        "pid": os.getpid(),
+        "steps_ms": dict(_report),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
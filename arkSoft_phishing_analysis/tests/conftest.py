@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modüller paket değil, klasörden doğrudan içe aktarılır
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("quart")
+
+import asgi_app  # noqa: E402
+import metrics  # noqa: E402
+import phishing_analyze  # noqa: E402
+
+HTML = (
+    "<html><body><a href='http://ornek-banka.example/giris'>Hesabınızı doğrulayın</a>"
+    "<form action='http://ornek-banka.example'><input type='password' name='şifre'></form>"
+    "</body></html>"
+)
+
+
+def test_recorded_changes_move_out_and_apply(monkeypatch):
+    monkeypatch.setattr(metrics.STAGE_SECONDS, "_series", {})
+    monkeypatch.setattr(metrics.DOCUMENTS, "_values", {(): 5})
+
+    with metrics.recorded_changes() as changes:
+        metrics.DOCUMENTS.inc()
+        metrics.STAGE_SECONDS.observe(0.02, "parse")
+    # Bu süreçte kalmaz, yalnızca taşınır
+    assert metrics.DOCUMENTS.value() == 5
+    assert metrics.STAGE_SECONDS.count("parse") == 0
+
+    with metrics.collect_timings() as timings:
+        metrics.apply_changes(changes)
+    assert metrics.DOCUMENTS.value() == 6
+    assert metrics.STAGE_SECONDS.count("parse") == 1
+    assert timings == {"parse": 20.0}
+
+
+def test_worker_metrics_reach_the_parent(monkeypatch):
+    monkeypatch.setattr(metrics.STAGE_SECONDS, "_series", {})
+    monkeypatch.setattr(metrics.DOCUMENTS, "_values", {})
+    result, pending_links, changes = asgi_app.run_offline_checks_in_worker(HTML)
+    assert pending_links
+    assert metrics.DOCUMENTS.value() == 0
+
+    metrics.apply_changes(changes)
+    assert metrics.DOCUMENTS.value() == 1
+    assert metrics.STAGE_SECONDS.count("parse") == 1
+
+
+def test_resolver_matches_io_concurrency(monkeypatch):
+    monkeypatch.setattr(asgi_app, "_resolver", None)
+    monkeypatch.setattr(asgi_app, "get_store", lambda: None)
+    resolver = asgi_app.get_io_resolver()
+    assert resolver._executor._max_workers == asgi_app.IO_WORKERS
+    assert asgi_app.get_io_resolver() is resolver
+    resolver._executor.shutdown()
+
+
+def test_parse_pool_round_trip(monkeypatch):
+    monkeypatch.setattr(metrics.DOCUMENTS, "_values", {})
+    monkeypatch.setattr(asgi_app, "_resolver", None)
+    monkeypatch.setattr(asgi_app, "get_store", lambda: None)
+    monkeypatch.setattr(asgi_app, "PARSE_WORKERS", 1)
+    monkeypatch.setattr(asgi_app, "_parse_pool", None)
+    monkeypatch.setattr(asgi_app.DomainAgeResolver, "resolve_many", lambda self, domains: {})
+    monkeypatch.setattr(phishing_analyze, "image_urls_to_scan", lambda pending_links, probes: [])
+
+    try:
+        risk_details = asyncio.run(asgi_app.analyze_turkish_html_phishing_async(HTML))
+    finally:
+        asgi_app._parse_pool.shutdown()
+    assert risk_details["total_score"] > 0
+    assert metrics.DOCUMENTS.value() == 1
@@ -0,0 +1,71 @@
+import base64
+import hashlib
+import textwrap
+
+import pytest
+
+from base64_scan import CHUNK_CHARS, DIGEST_CHARS, scan_data_uri
+
+CHUNK_BYTES = CHUNK_CHARS // 4 * 3
+
+
+def data_uri(payload: bytes, media_type: str = "text/html", wrap: int = None) -> str:
+    encoded = base64.b64encode(payload).decode("ascii")
+    if wrap:
+        # MIME gibi satırlara bölünmüş base64
+        encoded = "\r\n".join(textwrap.wrap(encoded, wrap))
+    return f"data:{media_type};base64,{encoded}"
+
+
+@pytest.mark.parametrize("split", [1, 3, 6])
+@pytest.mark.parametrize("wrap", [None, 76])
+def test_marker_split_across_chunk_boundary(split, wrap):
+    # "<script" ilk çözülen parçanın sonunda başlar, ikincisinde biter
+    payload = b"A" * (CHUNK_BYTES - split) + b"<SCRIPT>alert(1)</script>" + b"B" * 1000
+    scan = scan_data_uri(data_uri(payload, wrap=wrap))
+    assert scan.marker == "script"
+    assert scan.scanned_bytes <= len(payload)
+
+
+def test_clean_payload_over_several_chunks():
+    payload = bytes(range(256)).replace(b"<", b"") * 1000
+    scan = scan_data_uri(data_uri(payload, "image/png", wrap=64))
+    assert scan.marker is None
+    assert scan.scanned_bytes == len(payload)
+    assert not scan.truncated
+
+
+def test_marker_past_the_scan_limit_is_not_found():
+    payload = b"A" * 5000 + b"<iframe src=x>"
+    scan = scan_data_uri(data_uri(payload), max_bytes=4096)
+    assert scan.truncated and scan.marker is None
+    assert scan_data_uri(data_uri(payload)).marker == "<iframe"
+
+
+def test_unpadded_tail_is_decoded():
+    uri = data_uri(b"xx<html>").rstrip("=")
+    assert scan_data_uri(uri).marker == "<html"
+
+
+def test_digest_evidence_identifies_the_payload():
+    payload = b"<html><body>" + b"x" * 200_000
+    uri = data_uri(payload)
+    scan = scan_data_uri(uri)
+    expected = hashlib.sha256(uri.split(",", 1)[1].encode()).hexdigest()[:DIGEST_CHARS]
+
+    assert scan.digest == expected
+    assert scan.evidence == f"data:text/html;base64,sha256:{expected}"
+    # Kanıt içeriği taşımaz ve kısa kalır
+    assert "PGh0bWw" not in scan.evidence and len(scan.evidence) < 64
+    assert scan_data_uri(data_uri(payload + b"y")).digest != scan.digest
+
+
+def test_plain_data_uri():
+    scan = scan_data_uri("data:text/html,%3Cscript%3Ealert(1)%3C/script%3E")
+    assert not scan.is_base64 and scan.marker == "script"
+    assert scan.evidence.startswith("data:text/html,sha256:")
+
+
+@pytest.mark.parametrize("src", [None, "", "http://example.com/a.png", "data:" + "x" * 300])
+def test_not_a_data_uri(src):
+    assert scan_data_uri(src) is None
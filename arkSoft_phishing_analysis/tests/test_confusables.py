@@ -0,0 +1,40 @@
+import pytest
+
+from confusables import ConfusableIndex, skeleton
+
+
+@pytest.mark.parametrize("left, right", [("nil", "n11"), ("tesia", "tesla"), ("appie", "apple"), ("straße", "strabe")])
+def test_distinct_strings_keep_distinct_skeletons(left, right):
+    assert skeleton(left) != skeleton(right)
+
+
+@pytest.mark.parametrize("text", ["paypa1", "paypaI", "paypa|", "pаypal", "раураl", "paypal"])
+def test_lookalikes_share_the_brand_skeleton(text):
+    assert skeleton(text) == skeleton("paypal")
+
+
+def test_accents_and_multi_char_sequences_fold():
+    assert skeleton("gârânti") == skeleton("garanti")
+    assert skeleton("rnicrosoft") == skeleton("microsoft")
+
+
+@pytest.fixture
+def index():
+    return ConfusableIndex(["apple", "paypal", "akbank"])
+
+
+def test_spoofed_brand_detects_cyrillic_label(index):
+    assert index.spoofed_brand("login.аpple.com") == "apple"
+    assert index.spoofed_brand("AKBANK.com.tr") is None
+
+
+def test_literal_brand_is_not_a_spoof(index):
+    assert index.spoofed_brand("www.apple.com") is None
+    assert index.spoofed_brand("example.com") is None
+
+
+def test_punycode_label_is_decoded(index):
+    punycode = "аpple".encode("idna").decode("ascii")
+    assert punycode.startswith("xn--")
+    assert index.spoofed_brand(f"{punycode}.com") == "apple"
+    assert index.spoofed_brand("xn--invalid-.com") is None
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+import app as phishing_app
+import deferred
+import phishing_analyze
+import response_cache
+import startup
+
+HTML = (
+    "<html><body><a href='http://ornek-banka.example/giris'>Hesabınızı doğrulayın</a>"
+    "<form action='http://ornek-banka.example'><input type='password' name='şifre'></form>"
+    "</body></html>"
+)
+
+
+@pytest.fixture
+def network_gate(monkeypatch):
+    """Holds the network checks until the test opens the gate."""
+    gate = threading.Event()
+
+    def slow_network_checks(result, pending_links):
+        gate.wait(5)
+        result.total_score += 1.0
+        return result
+
+    monkeypatch.setattr(phishing_analyze, "run_network_checks", slow_network_checks)
+    monkeypatch.setattr(startup, "is_ready", lambda: True)
+    monkeypatch.setattr(response_cache, "_cache", None)
+    yield gate
+    gate.set()
+
+
+@pytest.fixture(params=["memory", "store"])
+def client(request, tmp_path, monkeypatch, network_gate):
+    store = deferred.JobStore(str(tmp_path / "jobs.sqlite3")) if request.param == "store" else None
+    monkeypatch.setattr(deferred, "_analyzer", deferred.DeferredAnalyzer(store=store))
+    return phishing_app.app.test_client()
+
+
+def poll(client, job_id: str, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get(f"/phishing/jobs/{job_id}")
+        if response.status_code != 202 or time.monotonic() > deadline:
+            return response
+        time.sleep(0.01)
+
+
+def test_provisional_response_then_job_result(client, network_gate):
+    response = client.post("/phishing", json={"html_content": HTML, "budget_ms": 1})
+    assert response.status_code == 200
+    provisional = response.get_json()
+    assert provisional["status"] == "provisional"
+    assert set(provisional) == {"risk_score", "risk_level", "status", "job_id"}
+
+    pending = client.get(f"/phishing/jobs/{provisional['job_id']}")
+    assert pending.status_code == 202
+    assert pending.get_json() == {"status": "pending", "job_id": provisional["job_id"]}
+
+    network_gate.set()
+    final = poll(client, provisional["job_id"])
+    assert final.status_code == 200
+    body = final.get_json()
+    assert body["status"] == "complete"
+    assert body["risk_score"]["total_score"] == provisional["risk_score"]["total_score"] + 1.0
+    assert set(body) == {"risk_score", "risk_level", "status", "job_id"}
+
+
+def test_unknown_job_is_not_found(client):
+    assert client.get("/phishing/jobs/yok").status_code == 404
+
+
+@pytest.mark.parametrize("budget_ms", [-1, "abc", "nan", True])
+def test_invalid_budget_is_rejected(client, budget_ms):
+    response = client.post("/phishing", json={"html_content": HTML, "budget_ms": budget_ms})
+    assert response.status_code == 400
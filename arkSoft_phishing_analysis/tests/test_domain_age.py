@@ -0,0 +1,147 @@
+import datetime
+import threading
+import time
+
+import pytest
+
+from domain_age import DomainAgeResolver, domain_age_years
+from ttl_cache import TTLCache
+
+CREATED = datetime.datetime(2001, 5, 17)
+
+
+class StubWhois:
+    """WHOIS stand-in: per-domain delay, result or exception, and a call log."""
+
+    def __init__(self, delays=None, results=None):
+        self.delays = delays or {}
+        self.results = results or {}
+        self.calls = []
+        self.release = threading.Event()
+
+    def __call__(self, domain):
+        self.calls.append(domain)
+        delay = self.delays.get(domain, 0)
+        if delay:
+            self.release.wait(delay)
+        result = self.results.get(domain, CREATED)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def wait_until_cached(resolver, domain: str, timeout: float = 2):
+    deadline = time.monotonic() + timeout
+    while domain not in resolver.cache and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def make_resolver():
+    resolvers = []
+
+    def make(lookup, timeout=0.3, max_workers=4, negative_ttl=60):
+        resolver = DomainAgeResolver(
+            max_workers=max_workers, timeout=timeout, cache=TTLCache(ttl=60),
+            negative_ttl=negative_ttl, lookup=lookup,
+        )
+        resolvers.append((resolver, lookup))
+        return resolver
+
+    yield make
+    for resolver, lookup in resolvers:
+        lookup.release.set()
+        resolver._executor.shutdown(wait=True)
+
+
+def test_results_are_cached(make_resolver):
+    lookup = StubWhois()
+    resolver = make_resolver(lookup)
+    assert resolver.resolve_many(["a.com", "b.com", "a.com", ""]) == {"a.com": CREATED, "b.com": CREATED}
+    assert resolver.resolve("a.com") == CREATED
+    assert sorted(lookup.calls) == ["a.com", "b.com"]
+
+
+def test_failures_are_negatively_cached(make_resolver):
+    lookup = StubWhois(results={"yok.com": None, "hata.com": RuntimeError("whois down")})
+    resolver = make_resolver(lookup)
+    assert resolver.resolve_many(["yok.com", "hata.com"]) == {"yok.com": None, "hata.com": None}
+    assert resolver.resolve_many(["yok.com", "hata.com"]) == {"yok.com": None, "hata.com": None}
+    assert sorted(lookup.calls) == ["hata.com", "yok.com"]
+
+
+def test_negative_entries_expire(make_resolver):
+    lookup = StubWhois(results={"yok.com": None})
+    resolver = make_resolver(lookup, negative_ttl=0.05)
+    resolver.resolve("yok.com")
+    time.sleep(0.1)
+    resolver.resolve("yok.com")
+    assert lookup.calls == ["yok.com", "yok.com"]
+
+
+def test_one_deadline_for_the_whole_call(make_resolver):
+    # Tek işçi: ikinci sorgu ilkinin ardından başlasa da toplam süre aşılmaz
+    lookup = StubWhois(delays={"yavas.com": 0.25, "yavas2.com": 0.25})
+    resolver = make_resolver(lookup, timeout=0.3, max_workers=1)
+    started = time.monotonic()
+    results = resolver.resolve_many(["yavas.com", "yavas2.com"])
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.45
+    assert results == {"yavas.com": CREATED, "yavas2.com": None}
+
+
+def test_timed_out_lookup_is_not_cached_but_late_result_is(make_resolver):
+    lookup = StubWhois(delays={"yavas.com": 5})
+    resolver = make_resolver(lookup, timeout=0.1)
+    assert resolver.resolve("yavas.com") is None
+    assert "yavas.com" not in resolver.cache
+
+    lookup.release.set()
+    wait_until_cached(resolver, "yavas.com")
+    assert resolver.resolve("yavas.com") == CREATED
+    assert lookup.calls == ["yavas.com"]
+
+
+def test_queued_lookups_are_not_cancelled(make_resolver):
+    lookup = StubWhois(delays={"takili.com": 5})
+    resolver = make_resolver(lookup, timeout=0.1, max_workers=1)
+    assert resolver.resolve_many(["takili.com", "sirada.com"]) == {"takili.com": None, "sirada.com": None}
+    assert "sirada.com" not in resolver.cache
+
+    lookup.release.set()
+    wait_until_cached(resolver, "sirada.com")
+    assert resolver.resolve_many(["takili.com", "sirada.com"]) == {"takili.com": CREATED, "sirada.com": CREATED}
+    assert lookup.calls == ["takili.com", "sirada.com"]
+
+
+def test_concurrent_calls_share_one_lookup(make_resolver):
+    lookup = StubWhois(delays={"ortak.com": 0.1})
+    resolver = make_resolver(lookup, timeout=2)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(resolver.resolve("ortak.com")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [CREATED] * 8
+    assert lookup.calls == ["ortak.com"]
+
+
+def test_full_queue_skips_new_domains(make_resolver):
+    lookup = StubWhois(delays={"a.com": 5, "b.com": 5})
+    resolver = make_resolver(lookup, timeout=0.05, max_workers=1)
+    resolver.max_queued = 2
+    assert resolver.resolve_many(["a.com", "b.com", "c.com"]) == {"a.com": None, "b.com": None, "c.com": None}
+    lookup.release.set()
+    wait_until_cached(resolver, "b.com")
+    assert "c.com" not in lookup.calls
+    assert resolver.resolve("c.com") == CREATED
+
+
+def test_domain_age_years():
+    created = datetime.datetime.now() - datetime.timedelta(days=730)
+    assert domain_age_years(created) == pytest.approx(2, abs=0.01)
@@ -0,0 +1,97 @@
+import datetime
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+import domain_store
+from domain_store import DomainStore
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DomainStore(str(tmp_path / "domains.sqlite3"))
+
+
+def test_creation_dates_and_stored_failures(store):
+    created = datetime.datetime(2010, 1, 2, 3, 4, 5)
+    store.put_creation_date("a.com", created)
+    store.put_creation_date("yok.com", None)
+    store.put_creation_date("eski.com", created, ttl=-1)
+
+    assert store.get_creation_date("a.com") == (True, created)
+    assert store.get_creation_date("yok.com") == (True, None)
+    assert store.get_creation_date("eski.com") == (False, None)
+    assert store.get_creation_date("hic.com") == (False, None)
+
+
+def test_scores_are_only_used_under_their_version(store):
+    store.put_reputations([("garantii.com", "garantii.com", 0.93)], version="v1")
+    assert store.get_reputations(["garantii.com"], "v1") == {"garantii.com": ("garantii.com", 0.93)}
+    # Marka listesi değişince skor yeniden hesaplanır, punycode kalır
+    assert store.get_reputations(["garantii.com"], "v2") == {"garantii.com": ("garantii.com", None)}
+
+
+def test_row_without_score_keeps_the_stored_score_and_version(store):
+    store.put_reputations([("a.com", "a.com", 0.7)], version="v1")
+    store.put_reputations([("a.com", "a.com", None)], version="v2")
+    assert store.get_reputations(["a.com"], "v1") == {"a.com": ("a.com", 0.7)}
+
+
+def test_large_batches_are_queried_in_chunks(store):
+    domains = [f"alan{index}.com" for index in range(2500)]
+    store.put_reputations([(domain, domain, 0.5) for domain in domains], version="v1")
+    # Eski SQLite sürümlerinin sınırı
+    store._connect().setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+    reputations = store.get_reputations(domains + ["", "yok.com"], "v1")
+    assert len(reputations) == 2500
+    assert reputations["alan2499.com"] == ("alan2499.com", 0.5)
+
+
+def test_old_files_gain_the_version_column(tmp_path):
+    path = str(tmp_path / "eski.sqlite3")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE domains (domain TEXT PRIMARY KEY, creation_date TEXT, "
+            "whois_expires_at REAL, punycode TEXT, lookalike_score REAL, expires_at REAL)"
+        )
+        conn.execute("INSERT INTO domains VALUES ('a.com', NULL, NULL, 'a.com', 0.9, 1e12)")
+
+    store = DomainStore(path)
+    # Sürümü bilinmeyen eski skor kullanılmaz
+    assert store.get_reputations(["a.com"], "v1") == {"a.com": ("a.com", None)}
+
+
+def test_warm_up_reads_versions(store, tmp_path):
+    seed = tmp_path / "seed.csv"
+    seed.write_text(
+        "domain,creation_date,punycode,lookalike_score,lookalike_version\n"
+        "a.com,2010-01-02T00:00:00,a.com,0.8,v1\n"
+        "b.com,,b.com,0.6,\n",
+        encoding="utf-8",
+    )
+    assert store.warm_up(str(seed)) == 2
+    assert store.get_reputations(["a.com", "b.com"], "v1") == {"a.com": ("a.com", 0.8), "b.com": ("b.com", None)}
+    assert store.get_creation_date("b.com") == (False, None)
+
+
+@pytest.mark.parametrize("path", ["", "domains.sqlite3"])
+def test_store_is_opt_in(tmp_path, path):
+    env = {**os.environ, "PHISHING_DOMAIN_STORE": str(tmp_path / path) if path else ""}
+    code = "import domain_store; print(type(domain_store.get_store()).__name__)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_DIR, env=env, check=True, capture_output=True, text=True
+    ).stdout.strip()
+    assert output == ("DomainStore" if path else "NoneType")
+    assert (tmp_path / "domains.sqlite3").exists() == bool(path)
+    assert not os.path.exists(os.path.join(PROJECT_DIR, "domain_store.sqlite3"))
+
+
+def test_get_store_without_path(monkeypatch):
+    monkeypatch.setattr(domain_store, "STORE_PATH", "")
+    monkeypatch.setattr(domain_store, "_store", None)
+    assert domain_store.get_store() is None
@@ -0,0 +1,59 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from html_features import etree, extract_features, iter_chunks
+
+BACKENDS = ["html.parser", pytest.param("lxml", marks=pytest.mark.skipif(etree is None, reason="lxml yok"))]
+
+
+def chunk_boundary_document(word: str, split_at: int = 2) -> str:
+    # Kelime 64 KB'lık besleme sınırının tam üstüne düşer
+    prefix = "<html><body><p>"
+    padding = "x" * (64 * 1024 - len(prefix) - split_at - 1)
+    return f"{prefix}{padding} {word} son</p><p>ikinci</p></body></html>"
+
+
+def bs4_words(html: str) -> list:
+    return BeautifulSoup(html, "html.parser").body.get_text(" ").split()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_word_across_chunk_boundary_stays_whole(backend):
+    html = chunk_boundary_document("hesabınızı")
+    chunks = list(iter_chunks(html))
+    assert chunks[0].endswith("he") and chunks[1].startswith("sabınızı")
+
+    words = extract_features(html, backend=backend).body_text.split()
+    assert "hesabınızı" in words
+    assert words == bs4_words(html)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_separate_nodes_are_space_separated(backend):
+    html = "<html><body><b>Hesap</b>doğrula<!-- not -->la <script>var x;</script>son</body></html>"
+    features = extract_features(html, backend=backend)
+    assert features.body_text.split() == bs4_words(html)
+    assert features.scripts == ["var x;"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_iterable_chunks_join_text(backend):
+    chunks = ["<html><body><p>şif", "re", "niz</p></body></html>"]
+    assert extract_features(iter(chunks), backend=backend).body_text == "şifreniz"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_collects_links_forms_and_inputs(backend):
+    html = (
+        "<html><body><a href='http://a.example'>a</a><form action='/giris'>"
+        "<table><tr><td><input type='Password' name='Sifre'></td></tr></table></form>"
+        "<img src='x.png' alt='logo'><iframe src='http://f.example'></iframe></body></html>"
+    )
+    features = extract_features(html, backend=backend)
+    assert features.links == ["http://a.example"]
+    assert features.forms[0].action == "/giris"
+    assert features.forms[0].inputs == [("password", "sifre")]
+    assert features.table_inputs == [("password", "sifre")]
+    assert features.images == [("x.png", "logo")]
+    assert features.iframes == ["http://f.example"]
+    assert features.has_body
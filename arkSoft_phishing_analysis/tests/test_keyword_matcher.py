@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from keyword_matcher import KeywordMatcher, turkish_lower
+
+
+def naive_matching_words(keywords, text):
+    keywords = [turkish_lower(keyword) for keyword in keywords if keyword]
+    return [word for word in text.split() if any(keyword in turkish_lower(word) for keyword in keywords)]
+
+
+def test_returns_original_words_once_per_occurrence():
+    matcher = KeywordMatcher(["şifre", "hesap"])
+    text = "Lütfen Hesabınızı değil HESAP bilgilerinizi ve Şifrenizi girin, hesap"
+    assert matcher.matching_words(text) == ["HESAP", "Şifrenizi", "hesap"]
+
+
+def test_turkish_dotted_capital_i():
+    matcher = KeywordMatcher(["giriş"])
+    assert matcher.matching_words("GİRİŞ yapın") == ["GİRİŞ"]
+    # "I" Türkçede "ı" olur, "i" değil
+    assert matcher.matching_words("GIRIŞ") == []
+
+
+def test_overlapping_keywords_follow_failure_links():
+    matcher = KeywordMatcher(["he", "she", "his", "hers"])
+    assert matcher.matching_words("ushers ahis x") == ["ushers", "ahis"]
+    assert KeywordMatcher(["abcd", "bc"]).matching_words("abce") == ["abce"]
+
+
+def test_contains_any():
+    matcher = KeywordMatcher(["acil", "doğrula"])
+    assert matcher.contains_any("Hesabınızı DOĞRULAyın")
+    assert not matcher.contains_any("merhaba dünya")
+    assert not KeywordMatcher([]).contains_any("acil")
+
+
+def test_match_does_not_span_words():
+    assert KeywordMatcher(["hesap"]).matching_words("hes ap\thesap\nhe sap") == ["hesap"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_naive_scan(seed):
+    rng = random.Random(seed)
+    alphabet = "abışğİI "
+    keywords = ["".join(rng.choice(alphabet[:-1]) for _ in range(rng.randint(1, 4))) for _ in range(8)]
+    text = "".join(rng.choice(alphabet) for _ in range(400))
+    matcher = KeywordMatcher(keywords)
+    assert matcher.matching_words(text) == naive_matching_words(keywords, text)
+    assert matcher.contains_any(text) == bool(naive_matching_words(keywords, text))
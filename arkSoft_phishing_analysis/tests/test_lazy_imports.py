@@ -0,0 +1,14 @@
+import os
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_the_analyzer_does_not_load_network_modules():
+    # requests ve whois ilk ağ kontrolünde ya da ön yüklemede yüklenir
+    code = "import sys, phishing_analyze; print(sorted({'requests', 'whois'} & set(sys.modules)))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_DIR, check=True, capture_output=True, text=True
+    ).stdout
+    assert output.strip() == "[]"
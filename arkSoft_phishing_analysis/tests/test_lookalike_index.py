@@ -0,0 +1,63 @@
+import random
+
+import Levenshtein
+import pytest
+
+from lookalike_index import LookalikeIndex, load_brand_list
+
+BRANDS = ["garanti", "akbank", "isbank", "ziraat", "yapikredi", "paypal", "apple", "google", "turkcell", "ptt"]
+
+
+def brute_force(brands, domain, threshold):
+    scores = {brand: Levenshtein.ratio(domain, brand) for brand in brands}
+    return {brand: score for brand, score in scores.items() if score >= threshold}
+
+
+@pytest.mark.parametrize("threshold", [0.3, 0.6, 0.8, 1.0])
+def test_search_matches_brute_force(threshold):
+    rng = random.Random(3)
+    brands = list(dict.fromkeys(
+        "".join(rng.choice("abcdeilnor") for _ in range(rng.randint(2, 12))) for _ in range(300)
+    ))
+    index = LookalikeIndex(brands)
+    for _ in range(200):
+        domain = "".join(rng.choice("abcdeilnor") for _ in range(rng.randint(1, 14)))
+        assert dict(index.search(domain, threshold)) == brute_force(brands, domain, threshold)
+
+
+def test_search_orders_best_first_and_uses_default_threshold():
+    index = LookalikeIndex(BRANDS, threshold=0.6)
+    matches = index.search("garantii")
+    assert matches[0][0] == "garanti"
+    assert [score for _, score in matches] == sorted((score for _, score in matches), reverse=True)
+    assert all(score >= 0.6 for _, score in matches)
+    assert index.best_match("garantii") == matches[0]
+
+
+def test_length_filter_skips_far_lengths():
+    index = LookalikeIndex(["ab", "abcdefghijklmnop"], threshold=0.6)
+    assert index.search("abc") == [("ab", Levenshtein.ratio("abc", "ab"))]
+    assert [brand for brand, _ in index.search("abc", 0.3)] == ["ab", "abcdefghijklmnop"]
+
+
+def test_duplicate_and_empty_brands_are_ignored():
+    index = LookalikeIndex(["apple", "apple", ""])
+    assert len(index) == 1
+    assert index.search("apple", 1.0) == [("apple", 1.0)]
+
+
+def test_version_follows_brands_and_threshold():
+    index = LookalikeIndex(BRANDS)
+    version = index.version
+    assert LookalikeIndex(reversed(BRANDS)).version == version
+    index.add("apple")
+    assert index.version == version
+    index.add("vakifbank")
+    assert index.version != version
+    assert LookalikeIndex(BRANDS, threshold=0.7).version != version
+
+
+def test_load_brand_list_skips_comments(tmp_path):
+    path = tmp_path / "brands.txt"
+    path.write_text("# bankalar\nGaranti\n\n  akbank  \n", encoding="utf-8")
+    assert load_brand_list(str(path)) == ["garanti", "akbank"]
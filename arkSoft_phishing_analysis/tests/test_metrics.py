@@ -0,0 +1,118 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+
+import metrics
+from ttl_cache import TTLCache
+
+
+def series(text: str, name: str) -> dict:
+    values = {}
+    for line in text.splitlines():
+        if line.startswith(name) and not line.startswith("#"):
+            key, value = line.rsplit(" ", 1)
+            values[key] = float(value)
+    return values
+
+
+@pytest.fixture
+def fresh_metrics(monkeypatch):
+    for metric in metrics._metrics:
+        monkeypatch.setattr(metric, "_values" if isinstance(metric, metrics.Counter) else "_series", {})
+    monkeypatch.setattr(metrics, "_caches", {})
+
+
+@pytest.fixture
+def metrics_dir(tmp_path, monkeypatch, fresh_metrics):
+    monkeypatch.setattr(metrics, "METRICS_DIR", str(tmp_path))
+    # Testte arka plan yazıcısı başlatılmaz, flush() açıkça çağrılır
+    monkeypatch.setattr(metrics, "_flusher_started", True)
+    return tmp_path
+
+
+def test_render_reports_the_current_process(fresh_metrics):
+    metrics.EXTERNAL_CALLS.inc("whois")
+    metrics.STAGE_SECONDS.observe(0.02, "parse")
+    text = metrics.render()
+    assert series(text, "phishing_external_calls_total") == {'phishing_external_calls_total{service="whois"}': 1}
+    assert series(text, "phishing_stage_seconds_count") == {'phishing_stage_seconds_count{stage="parse"}': 1}
+    assert f'phishing_worker_info{{pid="{os.getpid()}"}} 1' in text
+
+
+def _child_work(queue):
+    metrics.EXTERNAL_CALLS.inc("whois", amount=2)
+    metrics.PREFILTER_DOCUMENTS.inc("skipped")
+    metrics.STAGE_SECONDS.observe(0.5, "parse")
+    metrics.flush()
+    queue.put(os.getpid())
+
+
+def _child_cache_work(queue):
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("b", 1)
+    cache.get("b")
+    metrics.register_cache("whois", cache)
+    _child_work(queue)
+
+
+def run_child(target) -> int:
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    child = context.Process(target=target, args=(queue,))
+    child.start()
+    pid = queue.get(timeout=10)
+    child.join(10)
+    return pid
+
+
+def test_render_sums_every_process(metrics_dir):
+    metrics.EXTERNAL_CALLS.inc("whois")
+    metrics.PREFILTER_DOCUMENTS.inc("analyzed")
+    metrics.STAGE_SECONDS.observe(0.02, "parse")
+
+    child_pid = run_child(_child_work)
+
+    text = metrics.render()
+    assert series(text, "phishing_external_calls_total") == {'phishing_external_calls_total{service="whois"}': 3}
+    assert series(text, "phishing_stage_seconds_count") == {'phishing_stage_seconds_count{stage="parse"}': 2}
+    assert 'phishing_stage_seconds_bucket{stage="parse",le="0.025"} 1' in text
+    assert "phishing_prefilter_skip_ratio 0.5" in text
+    assert "phishing_metric_processes 2" in text
+    assert {path.name for path in metrics_dir.iterdir()} == {
+        f"metrics_{os.getpid()}.json",
+        f"metrics_{child_pid}.json",
+    }
+
+
+def test_forked_child_starts_from_zero(metrics_dir):
+    metrics.EXTERNAL_CALLS.inc("whois", amount=5)
+    child_pid = run_child(_child_work)
+    with open(metrics_dir / f"metrics_{child_pid}.json", encoding="utf-8") as f:
+        assert json.load(f)["metrics"]["phishing_external_calls_total"] == [[["whois"], 2]]
+
+
+def test_exited_process_keeps_counters_but_not_cache_entries(metrics_dir):
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.get("a")
+    metrics.register_cache("whois", cache)
+
+    child_pid = run_child(_child_cache_work)
+
+    text = metrics.render()
+    with open(metrics_dir / f"metrics_{child_pid}.json", encoding="utf-8") as f:
+        assert json.load(f)["caches"]["whois"]["size"] == 1
+    assert series(text, "phishing_cache_hits_total") == {'phishing_cache_hits_total{cache="whois"}': 2}
+    # Çocuk sürecin girdisi artık yok, yalnızca canlı sürecinki sayılır
+    assert series(text, "phishing_cache_entries") == {'phishing_cache_entries{cache="whois"}': 1}
+    assert series(text, "phishing_external_calls_total") == {'phishing_external_calls_total{service="whois"}': 2}
+
+
+def test_clear_snapshots_and_unreadable_files(metrics_dir):
+    (metrics_dir / "metrics_1.json").write_text("{bozuk")
+    text = metrics.render()
+    assert "phishing_metric_processes 1" in text
+    metrics.clear_snapshots()
+    assert list(metrics_dir.iterdir()) == []
@@ -0,0 +1,124 @@
+import random
+import time
+from io import BytesIO
+
+import pytest
+
+import ocr_pool
+from ocr_pool import OcrPool, _HashIndex
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def png(seed: int = 0, spot: int = None) -> bytes:
+    rng = random.Random(seed)
+    img = Image.new("L", (64, 64))
+    img.putdata([rng.randrange(256) for _ in range(64 * 64)])
+    if spot is not None:
+        img.putpixel((spot, spot), 255 - img.getpixel((spot, spot)))
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def echo_worker(image_bytes, max_pixels, lang, timeout=0):
+    return f"metin {len(image_bytes)}"
+
+
+def failing_worker(image_bytes, max_pixels, lang, timeout=0):
+    raise RuntimeError("OCR çağrılmamalıydı")
+
+
+def slow_worker(image_bytes, max_pixels, lang, timeout=0):
+    time.sleep(30)
+    return "geç"
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**kwargs):
+        pool = OcrPool(**{"workers": 1, "timeout": 5, **kwargs})
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        if pool._executor is not None:
+            pool._recycle(pool._executor)
+
+
+@pytest.mark.parametrize("distance", [1, 4, 10])
+def test_hash_index_matches_brute_force(distance):
+    rng = random.Random(distance)
+    stored = [rng.getrandbits(64) for _ in range(500)]
+    # Bir kısmı saklananlara yakın sorgular
+    queries = [value ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for value in stored[:50]]
+    queries += [rng.getrandbits(64) for _ in range(50)]
+    index = _HashIndex(distance)
+    for value in stored:
+        index.add(value)
+
+    for query in queries:
+        expected = sorted(
+            (bin(value ^ query).count("1"), value) for value in set(stored)
+            if bin(value ^ query).count("1") <= distance
+        )
+        assert index.near(query) == [value for _, value in expected]
+
+
+def test_hash_index_discard():
+    index = _HashIndex(2)
+    index.add(0b1011)
+    index.add(0b1011)
+    assert len(index) == 1
+    index.discard(0b1011)
+    assert len(index) == 0 and index.near(0b1011) == []
+
+
+def test_exact_and_near_duplicates_reuse_text(make_pool, monkeypatch):
+    monkeypatch.setattr(ocr_pool, "_ocr_worker", echo_worker)
+    pool = make_pool(phash_distance=4)
+    original = png(1)
+    text = pool.image_to_string(original)
+    assert text == f"metin {len(original)}"
+
+    monkeypatch.setattr(ocr_pool, "_ocr_worker", failing_worker)
+    assert pool.image_to_string(original) == text
+    assert pool.image_to_string(png(1, spot=10)) == text
+    # Farklı görsel yeniden OCR'a gider
+    assert pool.image_to_string(png(2)) is None
+
+
+def test_overrunning_worker_is_killed(make_pool, monkeypatch):
+    monkeypatch.setattr(ocr_pool, "_ocr_worker", slow_worker)
+    pool = make_pool(timeout=0.2, kill_grace=0.2)
+
+    started = time.monotonic()
+    assert pool.image_to_string(png(3)) is None
+    assert time.monotonic() - started < 1
+    executor = pool._executor
+    processes = list(executor._processes.values())
+
+    deadline = time.monotonic() + 5
+    while any(process.is_alive() for process in processes) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not any(process.is_alive() for process in processes)
+    assert pool._executor is None
+
+    monkeypatch.setattr(ocr_pool, "_ocr_worker", echo_worker)
+    assert pool.image_to_string(png(4)) == f"metin {len(png(4))}"
+
+
+def test_worker_passes_the_timeout_to_tesseract(monkeypatch):
+    pytesseract = pytest.importorskip("pytesseract")
+    calls = []
+
+    def image_to_string(img, lang=None, timeout=0):
+        calls.append((img.mode, lang, timeout))
+        return "metin"
+
+    monkeypatch.setattr(pytesseract, "image_to_string", image_to_string)
+    assert ocr_pool._ocr_worker(png(5), 1000, "tur", 7) == "metin"
+    assert calls == [("L", "tur", 7)]
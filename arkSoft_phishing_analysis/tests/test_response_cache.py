@@ -0,0 +1,120 @@
+import pytest
+
+import app as phishing_app
+import deferred
+import phishing_analyze
+import response_cache
+import startup
+from response_cache import ResponseCache, cache_key, normalize_html
+
+TEMPLATE = (
+    '<html><body><p>Sayın {email},</p>'
+    '<a href="https://kampanya.example/giris?utm_source=mail&uid={uid}&sayfa=2">Giriş</a>'
+    '<img src="https://t.example/p.gif?token={token}"></body></html>'
+)
+
+
+def campaign(email: str, uid: str, token: str) -> str:
+    return TEMPLATE.format(email=email, uid=uid, token=token)
+
+
+def test_recipient_values_share_a_key():
+    first = campaign("ali@example.com", "123", "a1b2c3d4e5f60718293a")
+    second = campaign("ayse@example.org", "987", "ffeeddccbbaa99887766")
+    assert cache_key(first) == cache_key(second)
+    assert cache_key(first) != cache_key(first.replace("sayfa=2", "sayfa=3"))
+
+
+def test_normalize_reports_removed_values():
+    removed = set()
+    normalized = normalize_html(campaign("ali@example.com", "123", "a1b2c3d4e5f60718293a"), removed)
+    assert "ali@example.com" not in normalized and "a1b2c3d4e5f60718293a" not in normalized
+    assert "uid=&" in normalized
+    assert {"ali@example.com", "123", "mail", "a1b2c3d4e5f60718293a"} <= removed
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        # Genel parametreler hedef adres taşıyabilir
+        ("https://r.example/?u=bit.ly/aaaa", "https://r.example/?u=bit.ly/bbbb"),
+        ("https://r.example/?e=a", "https://r.example/?e=b"),
+        # Sunucu adları ve yollar olduğu gibi kalır
+        ("https://a1b2c3d4e5f60718293a.example/", "https://ffeeddccbbaa99887766.example/"),
+        ("https://bit.ly/AbCdEfGhIjKlMnOpQrStUvWx1", "https://bit.ly/ZyXwVuTsRqPoNmLkJiHgFeDc2"),
+        ("https://t.example/p/a1b2c3d4e5f60718293a.gif", "https://t.example/p/ffeeddccbbaa99887766.gif"),
+        ("http://paypal.com@good.example/", "http://paypal.com@evil.example/"),
+    ],
+)
+def test_links_that_differ_get_different_keys(first, second):
+    template = '<html><body><a href="{}">Giriş</a></body></html>'
+    assert cache_key(template.format(first)) != cache_key(template.format(second))
+
+
+def test_decimal_numbers_are_not_folded():
+    assert cache_key("<p>Tutar: 12345678901234567890 TL</p>") != cache_key("<p>Tutar: 98765432109876543210 TL</p>")
+    assert cache_key("<p>05321234567</p>") != cache_key("<p>05329876543</p>")
+
+
+def test_data_uris_are_kept():
+    first = '<img src="data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAAB">'
+    second = '<img src="data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAIAAAAC">'
+    assert cache_key(first) != cache_key(second)
+    assert "iVBORw0KGgoAAAANSUhEUgAAAAEAAAAB" in normalize_html(first)
+
+
+def test_whitespace_is_collapsed():
+    assert cache_key("<p>a   b</p>\n") == cache_key("<p>a b</p>")
+
+
+def test_statuses_and_single_computation():
+    cache = ResponseCache()
+    calls = []
+
+    def compute(html):
+        calls.append(html)
+        return {"total_score": 1.0}
+
+    html = campaign("ali@example.com", "48213", "a1b2c3d4e5f60718293a")
+    assert cache.peek(html) == (None, cache_key(html))
+    assert cache.get_or_compute(html, compute)[2] == "MISS"
+    other = campaign("ayse@example.org", "90377", "ffeeddccbbaa99887766")
+    value, key, status = cache.get_or_compute(other, compute)
+    assert (value, key, status) == ({"total_score": 1.0}, cache_key(html), "HIT")
+    assert len(calls) == 1
+    assert cache.peek(other)[0] == {"total_score": 1.0}
+
+
+def test_evidence_quoting_a_recipient_is_not_shared():
+    cache = ResponseCache()
+
+    def compute(html):
+        email = "ali@example.com" if "ali@" in html else "ayse@example.org"
+        return {"total_score": 1.0, "links": [{"link": f"mailto:{email}"}]}
+
+    first = campaign("ali@example.com", "48213", "a1b2c3d4e5f60718293a")
+    second = campaign("ayse@example.org", "48213", "a1b2c3d4e5f60718293a")
+    assert cache.get_or_compute(first, compute)[2] == "MISS"
+    assert cache.get_or_compute(first, compute)[2] == "HIT"
+    value, _, status = cache.get_or_compute(second, compute)
+    assert status == "MISS" and "ali@example.com" not in str(value)
+    assert cache.peek(first)[0] is None
+
+
+@pytest.mark.parametrize("budget_ms", [0, 50])
+def test_disabled_cache_is_bypassed(monkeypatch, budget_ms):
+    monkeypatch.setattr(phishing_app, "RESPONSE_CACHE_ENABLED", False)
+    monkeypatch.setattr(startup, "is_ready", lambda: True)
+    monkeypatch.setattr(phishing_analyze, "run_network_checks", lambda result, pending_links: result)
+    monkeypatch.setattr(deferred, "_analyzer", None)
+
+    def no_cache():
+        raise AssertionError("önbellek kapalıyken kullanılmamalı")
+
+    monkeypatch.setattr(phishing_app, "get_response_cache", no_cache)
+    monkeypatch.setattr(response_cache, "get_response_cache", no_cache)
+
+    html = campaign("ali@example.com", "1", "a1b2")
+    response = phishing_app.app.test_client().post("/phishing", json={"html_content": html, "budget_ms": budget_ms})
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "BYPASS"
@@ -0,0 +1,93 @@
+import random
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from rules import Rule, RuleEngine
+
+
+def naive_evaluate(rules, target, text):
+    fired = []
+    for rule in rules:
+        if rule.target != target or not text:
+            continue
+        flags = re.IGNORECASE if rule.ignore_case else 0
+        hit = any(re.search(re.escape(term), text, flags) for term in rule.terms)
+        hit = hit or bool(rule.pattern and re.search(rule.pattern, text, flags))
+        if hit and all(term in text for term in rule.requires) and not any(term in text for term in rule.unless):
+            fired.append(rule)
+    return fired
+
+
+RULES = [
+    Rule("password", "input", 2.0, terms=("password", "şifre"), evidence=("inputs", "input"), reason="parola"),
+    Rule("pass", "input", 0.5, terms=("pass",)),
+    Rule("card", "input", 1.0, pattern=r"\bkart\s*no\b", ignore_case=True),
+    Rule("login", "form", 1.0, terms=("login",), requires=("action",), unless=("captcha",)),
+    Rule("urgent", "text", 0.5, terms=("ACİL",), ignore_case=True),
+    Rule("digits", "text", 0.5, pattern=r"\d{4}"),
+]
+
+
+@pytest.fixture
+def engine():
+    return RuleEngine(RULES)
+
+
+def test_rules_sharing_a_start_position_all_fire(engine):
+    assert [rule.name for rule in engine.evaluate("input", "password")] == ["password", "pass"]
+
+
+def test_fired_rules_are_in_table_order(engine):
+    text = "Kart No pass şifre"
+    assert [rule.name for rule in engine.evaluate("input", text)] == ["password", "pass", "card"]
+
+
+def test_rule_fires_once_per_element(engine):
+    assert [rule.name for rule in engine.evaluate("input", "şifre şifre şifre")] == ["password"]
+
+
+def test_requires_and_unless(engine):
+    assert engine.evaluate("form", "login") == []
+    assert [rule.name for rule in engine.evaluate("form", "login action")] == ["login"]
+    assert engine.evaluate("form", "login action captcha") == []
+
+
+def test_ignore_case(engine):
+    assert [rule.name for rule in engine.evaluate("text", "acil 2024")] == ["urgent", "digits"]
+    assert engine.evaluate("input", "PASSWORD") == []
+
+
+def test_unknown_target_and_empty_text(engine):
+    assert engine.targets() == frozenset({"input", "form", "text"})
+    assert engine.evaluate("link", "password") == []
+    assert engine.evaluate("input", "") == []
+
+
+def test_score_appends_evidence(engine):
+    result = SimpleNamespace(inputs=[])
+    assert engine.score("input", "password", "<input>", result) == 2.5
+    assert result.inputs == [{"input": "<input>", "reason": "parola"}]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_naive_evaluation(seed):
+    rng = random.Random(seed)
+    words = ["ab", "abc", "bc", "c", "AB", "x"]
+    rules = [
+        Rule(
+            f"rule_{index}",
+            "text",
+            1.0,
+            terms=tuple(rng.sample(words, rng.randint(1, 2))),
+            ignore_case=rng.random() < 0.3,
+            requires=tuple(rng.sample(words, rng.randint(0, 1))),
+            unless=tuple(rng.sample(words, rng.randint(0, 1))),
+        )
+        for index in range(8)
+    ] + [Rule("pattern", "text", 1.0, pattern=r"b+c")]
+    engine = RuleEngine(rules)
+    for _ in range(200):
+        text = "".join(rng.choice("abcABx ") for _ in range(rng.randint(0, 12)))
+        assert engine.evaluate("text", text) == naive_evaluate(rules, "text", text)
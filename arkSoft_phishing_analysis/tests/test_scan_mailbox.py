@@ -0,0 +1,161 @@
+import json
+import mailbox
+import os
+from email.message import EmailMessage
+
+import pytest
+
+import scan_mailbox
+from scan_mailbox import JsonlWriter, ParquetWriter, iter_messages, scan
+
+PHISHING_HTML = (
+    "<html><body><p>Hesabınız askıya alındı, şifrenizi hemen doğrulayın.</p>"
+    '<form action="http://203.0.113.7/login"><input type="password" name="p"></form>'
+    "</body></html>"
+)
+
+
+def make_message(number: int, html: str = None) -> bytes:
+    message = EmailMessage()
+    message["From"] = f"gonderen{number}@example.com"
+    message["To"] = "alici@example.com"
+    message["Subject"] = f"Mesaj {number}"
+    message["Message-ID"] = f"<{number}@example.com>"
+    message.set_content(f"Düz metin {number}")
+    message.add_alternative(html or f"<html><body><p>Merhaba {number}</p></body></html>", subtype="html")
+    return message.as_bytes()
+
+
+@pytest.fixture
+def eml_dir(tmp_path):
+    directory = tmp_path / "eml"
+    (directory / "alt").mkdir(parents=True)
+    (directory / "1.eml").write_bytes(make_message(1, PHISHING_HTML))
+    (directory / "alt" / "2.eml").write_bytes(make_message(2))
+    # .eml olmayan ve mbox olmayan dosyalar atlanır
+    (directory / "notlar.txt").write_text("mesaj değil")
+    return str(directory)
+
+
+@pytest.fixture
+def maildir_path(tmp_path):
+    box = mailbox.Maildir(str(tmp_path / "Maildir"), create=True)
+    for number in range(3):
+        box.add(make_message(number))
+    box.close()
+    return str(tmp_path / "Maildir")
+
+
+@pytest.fixture
+def mbox_path(tmp_path):
+    path = str(tmp_path / "arsiv.mbox")
+    box = mailbox.mbox(path, create=True)
+    for number in range(4):
+        box.add(make_message(number, PHISHING_HTML if number == 0 else None))
+    box.close()
+    return path
+
+
+def read_jsonl(path: str) -> list:
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def read_parquet(directory: str) -> list:
+    pq = pytest.importorskip("pyarrow.parquet")
+    return pq.read_table(directory).to_pylist()
+
+
+def test_eml_directory(eml_dir):
+    messages = list(iter_messages(eml_dir))
+    assert [os.path.relpath(source, eml_dir) for source, _ in messages] == ["1.eml", os.path.join("alt", "2.eml")]
+    assert b"Subject: Mesaj 1" in messages[0][1]
+
+
+def test_maildir(maildir_path):
+    messages = list(iter_messages(maildir_path))
+    assert len(messages) == 3
+    assert all(source.startswith(maildir_path + "#") for source, _ in messages)
+    subjects = sorted(scan_mailbox._parser.parsebytes(raw)["Subject"] for _, raw in messages)
+    assert subjects == ["Mesaj 0", "Mesaj 1", "Mesaj 2"]
+
+
+def test_mbox(mbox_path):
+    messages = list(iter_messages(mbox_path))
+    assert [source for source, _ in messages] == [f"{mbox_path}#{key}" for key in range(4)]
+    # Kaynak anahtarları çalışmalar arasında aynı kalır
+    assert [source for source, _ in iter_messages(mbox_path)] == [source for source, _ in messages]
+
+
+def test_analyze_message_reads_html_part():
+    row = scan_mailbox.analyze_message("kaynak", make_message(7, PHISHING_HTML), offline=True)
+    assert row["error"] is None
+    assert row["subject"] == "Mesaj 7"
+    assert row["message_id"] == "<7@example.com>"
+    assert row["html_parts"] == 1
+    assert row["risk_score"] is not None
+    assert json.loads(row["risk_details"])
+
+
+def test_jsonl_output(tmp_path, eml_dir, maildir_path, mbox_path):
+    output = str(tmp_path / "sonuc.jsonl")
+    summary = scan([eml_dir, maildir_path, mbox_path], JsonlWriter(output), workers=2, offline=True, resume=False)
+
+    rows = read_jsonl(output)
+    assert summary["scanned"] == len(rows) == 2 + 3 + 4
+    assert summary["skipped"] == 0
+    assert len({row["source"] for row in rows}) == len(rows)
+    assert all(row["error"] is None and row["html_parts"] == 1 for row in rows)
+
+
+def test_parquet_parts(tmp_path, mbox_path, maildir_path):
+    output = str(tmp_path / "sonuc")
+    writer = ParquetWriter(output, rows_per_file=2)
+    summary = scan([mbox_path, maildir_path], writer, workers=2, offline=True, resume=False)
+
+    parts = sorted(os.listdir(output))
+    # 7 satır, parça başına 2 satır: 4 parça, geçici dosya kalmaz
+    assert parts == [f"part-{number:06d}.parquet" for number in range(4)]
+    rows = read_parquet(output)
+    assert summary["scanned"] == len(rows) == 7
+    assert {row["source"] for row in rows} == {source for path in (mbox_path, maildir_path) for source, _ in iter_messages(path)}
+
+
+def test_jsonl_resume_after_partial_run(tmp_path, mbox_path):
+    output = str(tmp_path / "sonuc.jsonl")
+    sources = [source for source, _ in iter_messages(mbox_path)]
+    first = scan_mailbox.analyze_message(sources[0], dict(iter_messages(mbox_path))[sources[0]], offline=True)
+    # Önceki çalışma bir satırı yazmış, ikincisinin ortasında kesilmiş
+    with open(output, "w", encoding="utf-8") as file:
+        file.write(json.dumps(first, ensure_ascii=False) + "\n")
+        file.write(json.dumps({"source": sources[1], "risk_score": 1.0})[:20])
+
+    summary = scan([mbox_path], JsonlWriter(output), workers=2, offline=True, resume=True)
+
+    assert summary == {"scanned": 3, "skipped": 1, "flagged": summary["flagged"]}
+    with open(output, encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    # Yarım satır tek başına kalır, yeni satırlarla birleşmez
+    assert len(lines) == 5
+    completed = JsonlWriter(output).completed_sources()
+    assert completed == set(sources)
+
+
+def test_parquet_resume_after_partial_run(tmp_path, mbox_path):
+    output = str(tmp_path / "sonuc")
+    sources = [source for source, _ in iter_messages(mbox_path)]
+    writer = ParquetWriter(output, rows_per_file=2)
+    scan([mbox_path], writer, workers=1, offline=True, resume=False, max_in_flight=1)
+    # Son parça ve yarım kalan geçici dosya kesilen çalışmayı taklit eder
+    os.remove(os.path.join(output, "part-000001.parquet"))
+    with open(os.path.join(output, "part-000001.parquet.tmp"), "wb") as file:
+        file.write(b"PAR1")
+
+    writer = ParquetWriter(output, rows_per_file=2)
+    assert len(writer.completed_sources()) == 2
+    summary = scan([mbox_path], writer, workers=2, offline=True, resume=True)
+
+    assert summary["skipped"] == 2
+    assert summary["scanned"] == 2
+    rows = read_parquet(output)
+    assert sorted(row["source"] for row in rows) == sorted(sources)
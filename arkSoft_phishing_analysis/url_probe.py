@@ -0,0 +1,109 @@
+import logging
+import os
+from dataclasses import dataclass
+
+import metrics
+from ttl_cache import TTLCache
+
+PROBE_TIMEOUT = float(os.getenv("URL_PROBE_TIMEOUT", 5))
+PROBE_CACHE_TTL = float(os.getenv("URL_PROBE_CACHE_TTL", 3600))
+PROBE_NEGATIVE_TTL = float(os.getenv("URL_PROBE_NEGATIVE_TTL", 300))
+MAX_IMAGE_BYTES = int(os.getenv("URL_PROBE_MAX_IMAGE_BYTES", 10 * 1024 * 1024))
+POOL_SIZE = int(os.getenv("URL_PROBE_POOL_SIZE", 20))
+
+
+@dataclass(slots=True, frozen=True)
+class ProbeResult:
+    url: str
+    final_url: str
+    content_type: str = ""
+    ok: bool = False
+
+    @property
+    def is_image(self) -> bool:
+        return self.content_type.startswith("image/")
+
+
+class UrlProbe:
+    """Resolves URLs with one pooled keep-alive session.
+
+    Each URL is probed with a single HEAD request that follows redirects;
+    the final URL and content type are cached for ``ttl`` seconds (failures
+    for ``negative_ttl``).
+    """
+
+    def __init__(
+        self,
+        timeout: float = PROBE_TIMEOUT,
+        ttl: float = PROBE_CACHE_TTL,
+        negative_ttl: float = PROBE_NEGATIVE_TTL,
+        pool_size: int = POOL_SIZE,
+        session=None,
+    ):
+        self.timeout = timeout
+        self.negative_ttl = negative_ttl
+        self.cache = TTLCache(ttl=ttl)
+        if session is None:
+            # requests yalnızca ilk yoklamada yüklenir
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        session.headers["User-Agent"] = "Mozilla/5.0"
+        self.session = session
+
+    def probe(self, url: str) -> ProbeResult:
+        cached = self.cache.get(url)
+        if cached is not None:
+            return cached
+
+        metrics.EXTERNAL_CALLS.inc("http_head")
+        try:
+            response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+            result = ProbeResult(
+                url=url,
+                final_url=response.url or url,
+                content_type=response.headers.get("Content-Type", ""),
+                ok=response.ok,
+            )
+            self.cache.set(url, result)
+        except Exception as e:
+            metrics.EXTERNAL_ERRORS.inc("http_head")
+            logging.error(f"Error checking URL {url}: {e}")
+            result = ProbeResult(url=url, final_url=url)
+            self.cache.set(url, result, ttl=self.negative_ttl)
+        return result
+
+    def fetch(self, url: str, max_bytes: int = MAX_IMAGE_BYTES):
+        """Download ``url`` into memory, giving up beyond ``max_bytes``."""
+        import requests
+
+        metrics.EXTERNAL_CALLS.inc("http_get")
+        try:
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                content = bytearray()
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    content.extend(chunk)
+                    if len(content) > max_bytes:
+                        logging.error(f"Resim boyutu sınırı aşıldı: {url}")
+                        return None
+                return bytes(content)
+        except requests.exceptions.RequestException as e:
+            metrics.EXTERNAL_ERRORS.inc("http_get")
+            logging.error(f"Resim indirme hatası: {e}")
+            return None
+
+
+_probe = None
+
+
+def get_probe() -> UrlProbe:
+    global _probe
+    if _probe is None:
+        _probe = UrlProbe()
+        metrics.register_cache("url_probe", _probe.cache)
+    return _probe